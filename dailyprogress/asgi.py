@@ -2,6 +2,9 @@
 ASGI config for dailyprogress project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Dipakai gunicorn dengan GUNICORN_ASGI=true (worker uvicorn), terutama untuk
+stream server-sent events di /live/events (tracker.live) dan API baca async
+di /api/ (tracker.api).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
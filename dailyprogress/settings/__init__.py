@@ -0,0 +1,18 @@
+"""
+Pemilih profil settings. DJANGO_ENV=production|development; tanpa DJANGO_ENV,
+deploy Railway (RAILWAY_ENVIRONMENT) dan gunicorn (gunicorn.conf.py) memakai
+production, selain itu development. Lihat base.py untuk bagian bersama.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+_environment = os.getenv('DJANGO_ENV') or ('production' if os.getenv('RAILWAY_ENVIRONMENT') else 'development')
+
+if _environment == 'production':
+	from .production import *  # noqa: F401,F403
+elif _environment == 'development':
+	from .development import *  # noqa: F401,F403
+else:
+	raise ImproperlyConfigured(f'DJANGO_ENV tidak dikenal: {_environment!r} (pilihan: development, production)')
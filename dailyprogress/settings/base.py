@@ -0,0 +1,239 @@
+"""
+Django settings for dailyprogress project: bagian yang sama untuk semua profil.
+
+Profil development/production ada di modul sebelahnya; pemilihannya di
+dailyprogress/settings/__init__.py (env DJANGO_ENV).
+
+Generated by 'django-admin startproject' using Django 5.2.6.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+
+from pathlib import Path
+import os
+import tempfile
+import dj_database_url
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-)k5d5&o^qm(*eyky8tk=ot4i5^*s4y*zle3u*zpq*3vg1vu-gp')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+# Default DEBUG ditentukan profil (development: true, production: false)
+DEBUG = False
+
+ALLOWED_HOSTS = [
+	host.strip() for host in os.getenv(
+		'ALLOWED_HOSTS',
+		'localhost,127.0.0.1,0.0.0.0,.up.railway.app,progresharian.up.railway.app'
+	).split(',') if host.strip()
+]
+CSRF_TRUSTED_ORIGINS = [
+	origin.strip() for origin in os.getenv('CSRF_TRUSTED_ORIGINS', 'http://localhost:8000,https://*.up.railway.app').split(',') if origin.strip()
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+	'django.contrib.admin',
+	'django.contrib.auth',
+	'django.contrib.contenttypes',
+	'django.contrib.sessions',
+	'django.contrib.messages',
+	'django.contrib.staticfiles',
+	'tracker',
+]
+
+MIDDLEWARE = [
+	'django.middleware.security.SecurityMiddleware',
+	# WhiteNoise yang juga async-capable (lihat tracker/middleware.py)
+	'tracker.middleware.StaticFilesMiddleware',
+	'django.contrib.sessions.middleware.SessionMiddleware',
+	'django.middleware.common.CommonMiddleware',
+	'django.middleware.csrf.CsrfViewMiddleware',
+	'django.contrib.auth.middleware.AuthenticationMiddleware',
+	# Semua halaman tracker memerlukan login (data dipisah per pengguna)
+	'django.contrib.auth.middleware.LoginRequiredMiddleware',
+	# Profil cProfile + SQL per request, hanya bila diminta/terpilih sampling
+	'tracker.middleware.ProfilingMiddleware',
+	'django.contrib.messages.middleware.MessageMiddleware',
+	'django.middleware.clickjacking.XFrameOptionsMiddleware',
+	'tracker.middleware.ReadYourWritesMiddleware',
+]
+
+ROOT_URLCONF = 'dailyprogress.urls'
+
+TEMPLATES = [
+	{
+		'BACKEND': 'django.template.backends.django.DjangoTemplates',
+		'DIRS': [BASE_DIR / 'templates'],
+		'APP_DIRS': True,
+		'OPTIONS': {
+			'context_processors': [
+				'django.template.context_processors.request',
+				'django.contrib.auth.context_processors.auth',
+				'django.contrib.messages.context_processors.messages',
+			],
+		},
+	},
+]
+
+WSGI_APPLICATION = 'dailyprogress.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+
+DATABASES = {
+	'default': {
+		'ENGINE': 'django.db.backends.sqlite3',
+		'NAME': BASE_DIR / 'db.sqlite3',
+	}
+}
+
+# Override with DATABASE_URL if provided (e.g., Railway Postgres)
+# Koneksi persisten dicek dulu sebelum dipakai ulang (CONN_HEALTH_CHECKS), jadi
+# koneksi yang diputus server/proxy tidak membuat request pertama gagal.
+CONN_MAX_AGE = int(os.getenv('CONN_MAX_AGE', '600'))
+_db_from_env = dj_database_url.config(conn_max_age=CONN_MAX_AGE, conn_health_checks=True, ssl_require=False)
+if _db_from_env:
+	DATABASES['default'] = _db_from_env
+
+# Pool koneksi psycopg 3 untuk PostgreSQL, dibagi antar thread dalam satu worker
+# gunicorn. Ukuran maksimum default = jumlah thread (GUNICORN_THREADS).
+# Pool menggantikan koneksi persisten, jadi CONN_MAX_AGE harus 0.
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql' and os.getenv('DB_POOL', 'true').lower() == 'true':
+	DATABASES['default']['CONN_MAX_AGE'] = 0
+	DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+		'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+		'max_size': int(os.getenv('DB_POOL_MAX_SIZE', os.getenv('GUNICORN_THREADS', '4'))),
+		'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+	}
+
+# Replica baca untuk laporan/saldo/ekspor (tracker.db_router). Tanpa konfigurasi
+# ini semua query ke 'default'. SQLITE_REPLICA=true memakai salinan SQLite lokal
+# (read-only) yang disegarkan `python manage.py refresh_replica --interval 60`.
+SQLITE_REPLICA_PATH = Path(os.getenv('SQLITE_REPLICA_PATH', BASE_DIR / 'db.replica.sqlite3'))
+_replica_url = os.getenv('DATABASE_REPLICA_URL')
+if _replica_url:
+	DATABASES['replica'] = dj_database_url.parse(_replica_url, conn_max_age=CONN_MAX_AGE, conn_health_checks=True)
+elif os.getenv('SQLITE_REPLICA', 'false').lower() == 'true':
+	DATABASES['replica'] = {
+		'ENGINE': 'django.db.backends.sqlite3',
+		'NAME': f'file:{SQLITE_REPLICA_PATH}?mode=ro',
+	}
+if 'replica' in DATABASES:
+	DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['tracker.db_router.ReadReplicaRouter']
+
+# Lama (detik) halaman dibaca dari primary setelah pengguna menulis data
+READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', '60'))
+
+# Cache bersama antar worker gunicorn. Dipakai tracker.user_cache untuk token versi
+# (objek-nya sendiri di-cache di memori tiap worker). Default: file di direktori
+# temp (cukup untuk satu host); REDIS_URL untuk beberapa host.
+CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'progresharian-cache'))
+if os.getenv('REDIS_URL'):
+	CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': os.getenv('REDIS_URL')}}
+else:
+	CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': CACHE_DIR}}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+	{
+		'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+	},
+	{
+		'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+	},
+	{
+		'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+	},
+	{
+		'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+	},
+]
+
+# Login (django.contrib.auth.urls di /accounts/)
+
+LOGIN_URL = 'login'
+LOGIN_REDIRECT_URL = '/'
+LOGOUT_REDIRECT_URL = 'login'
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+STATIC_URL = 'static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+	# File hasil job (ekspor analitik). Tidak dilayani langsung: diunduh lewat
+	# JobDownloadView yang memeriksa pemilik. Web dan worker harus melihat direktori
+	# yang sama; untuk beberapa host ganti dengan storage bersama (mis. S3).
+	"default": {
+		"BACKEND": "django.core.files.storage.FileSystemStorage",
+	},
+	"staticfiles": {
+		"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+	},
+}
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', BASE_DIR / 'media')
+
+# Background jobs (tracker.jobs)
+# Jalankan `python manage.py run_worker` (proses `worker` di Procfile).
+# JOBS_EAGER=true menjalankan job langsung di request, berguna tanpa worker.
+
+JOBS_EAGER = os.getenv('JOBS_EAGER', 'false').lower() == 'true'
+
+# Pembaruan live / server-sent events (tracker.live, /live/events)
+# Stream hanya di ASGI (GUNICORN_ASGI=true). Di WSGI setiap request langsung dijawab
+# dan browser menyambung ulang tiap LIVE_WSGI_RETRY_SECONDS, supaya thread gthread
+# tidak tertahan oleh tab dashboard yang terbuka.
+
+LIVE_POLL_SECONDS = float(os.getenv('LIVE_POLL_SECONDS', '2'))
+LIVE_STREAM_SECONDS = int(os.getenv('LIVE_STREAM_SECONDS', '300'))
+LIVE_WSGI_RETRY_SECONDS = float(os.getenv('LIVE_WSGI_RETRY_SECONDS', '15'))
+
+# Profil per request (tracker.profiling): staf menambahkan ?_profile=1 ke URL;
+# PROFILE_SAMPLE_RATE (mis. 0.01) memprofil sebagian request secara acak.
+# Hasilnya ada di admin (Request profiles), dibatasi PROFILE_MAX_ROWS baris.
+
+PROFILE_QUERY_FLAG = '_profile'
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_MAX_ROWS = int(os.getenv('PROFILE_MAX_ROWS', '200'))
+
+# Arsip data lama (tracker.archive / `python manage.py archive_data`)
+
+ARCHIVE_HORIZON_DAYS = int(os.getenv('ARCHIVE_HORIZON_DAYS', '365'))
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
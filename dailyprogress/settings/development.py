@@ -0,0 +1,8 @@
+# Profil development: DEBUG aktif secara default, database dan sesi apa adanya.
+
+from .base import *  # noqa: F401,F403
+from .base import os
+
+ENVIRONMENT = 'development'
+
+DEBUG = os.getenv('DEBUG', 'true').lower() == 'true'
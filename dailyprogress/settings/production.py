@@ -0,0 +1,41 @@
+# Profil production. DEBUG mati kecuali diminta eksplisit; pemeriksaan performa saat
+# start (tracker/checks.py) menolak boot bila pengaturan yang merugikan aktif.
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, TEMPLATES, os
+
+ENVIRONMENT = 'production'
+
+DEBUG = os.getenv('DEBUG', 'false').lower() == 'true'
+
+# Template dikompilasi sekali per worker, tidak bergantung pada DEBUG
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+	('django.template.loaders.cached.Loader', [
+		'django.template.loaders.filesystem.Loader',
+		'django.template.loaders.app_directories.Loader',
+	]),
+]
+
+# Sesi dibaca dari cache (ditulis juga ke database supaya tidak hilang saat cache
+# dibersihkan); pesan flash di cookie, tanpa tulis sesi tambahan per request
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Opsi database
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+	DATABASES['default'].setdefault('OPTIONS', {}).update({
+		# Penulis serentak menunggu lock (detik), bukan langsung "database is locked"
+		'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '20')),
+		# BEGIN IMMEDIATE: lock tulis diambil di awal transaksi, jadi tidak ada
+		# deadlock saat dua transaksi baca sama-sama naik menjadi tulis
+		'transaction_mode': 'IMMEDIATE',
+		# WAL: pembaca tidak memblokir penulis; synchronous=NORMAL cukup aman di WAL
+		'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+	})
+elif DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+	# Query yang tertahan tidak menghabiskan slot pool selamanya
+	DATABASES['default'].setdefault('OPTIONS', {}).setdefault('options', f"-c statement_timeout={os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000')}")
+
+# Pemeriksaan performa saat start: Error menolak boot bila true, selain itu hanya log
+PERF_CHECK_STRICT = os.getenv('PERF_CHECK_STRICT', 'true').lower() == 'true'
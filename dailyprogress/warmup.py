@@ -0,0 +1,53 @@
+"""Pemanasan worker setelah start, dipanggil dari hook gunicorn (gunicorn.conf.py).
+
+Tanpa ini request pertama setiap worker menanggung import view, pembentukan
+resolver URL, kompilasi template, dan pembukaan koneksi database.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def _project_templates():
+	# Hanya template proyek & app tracker; template admin dimuat saat dibutuhkan
+	for template_dir in engines['django'].template_dirs:
+		root = Path(template_dir)
+		if not root.is_relative_to(settings.BASE_DIR) or not root.is_dir():
+			continue
+		for path in root.rglob('*.html'):
+			yield path.relative_to(root).as_posix()
+
+
+def warm_up(database: bool = True) -> dict:
+	started = time.monotonic()
+	resolver = get_resolver()
+	# Memaksa import semua view dan membangun tabel reverse()
+	resolver.reverse_dict
+	templates = 0
+	engine = engines['django']
+	for name in sorted(set(_project_templates())):
+		try:
+			engine.get_template(name)
+			templates += 1
+		except Exception:
+			logger.warning('Gagal memuat template %s saat warm-up', name, exc_info=True)
+	if database:
+		for alias in settings.DATABASES:
+			try:
+				connections[alias].ensure_connection()
+			except Exception:
+				logger.warning('Database %s belum bisa dihubungi saat warm-up', alias, exc_info=True)
+			finally:
+				# Dengan pool, close() mengembalikan koneksi ke pool yang sudah terisi
+				connections[alias].close()
+	elapsed = time.monotonic() - started
+	logger.info('Warm-up selesai: %s template, %.2f detik', templates, elapsed)
+	return {'templates': templates, 'seconds': elapsed}
@@ -0,0 +1,63 @@
+# Konfigurasi gunicorn (dipakai Procfile). Semua nilai bisa diatur lewat env:
+#   WEB_CONCURRENCY       jumlah worker (default: 2 x CPU + 1, maks GUNICORN_MAX_WORKERS)
+#   GUNICORN_THREADS      thread per worker; > 1 memakai worker gthread
+#   GUNICORN_PRELOAD      muat aplikasi di master sebelum fork (hemat memori, start cepat)
+#   GUNICORN_MAX_REQUESTS worker didaur ulang setelah N request (cegah memori membengkak)
+#   GUNICORN_ASGI         true: worker uvicorn + dailyprogress/asgi.py; stream live
+#                         (/live/events) dan API async (/api/...) tidak menahan
+#                         thread selama menunggu event/klien lambat
+import multiprocessing
+import os
+
+# gunicorn adalah server production: profil settings production kecuali DJANGO_ENV diatur
+os.environ.setdefault('DJANGO_ENV', 'production')
+
+
+def _env_int(name, default):
+	return int(os.getenv(name, default))
+
+
+asgi = os.getenv('GUNICORN_ASGI', 'false').lower() == 'true'
+wsgi_app = 'dailyprogress.asgi:application' if asgi else 'dailyprogress.wsgi:application'
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+workers = _env_int('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, _env_int('GUNICORN_MAX_WORKERS', 8)))
+threads = _env_int('GUNICORN_THREADS', 4)
+if asgi:
+	# View sinkron dijalankan di thread pool asgiref; `threads` tidak dipakai
+	worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+	worker_class = 'gthread' if threads > 1 else 'sync'
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+# Heartbeat worker di tmpfs: menghindari jeda I/O disk pada container
+if os.path.isdir('/dev/shm'):
+	worker_tmp_dir = '/dev/shm'
+
+
+def pre_fork(server, worker):
+	# Dengan preload_app, koneksi database yang sempat dibuka di master tidak boleh ikut diwariskan
+	if preload_app:
+		from django.db import connections
+		connections.close_all()
+
+
+def post_worker_init(worker):
+	# Warm-up hanya optimasi: kegagalannya tidak boleh menghentikan worker
+	try:
+		from dailyprogress.warmup import warm_up
+		result = warm_up()
+	except Exception:
+		worker.log.exception('Warm-up worker %s gagal', worker.pid)
+		return
+	worker.log.info('Worker %s siap: %s template dimuat dalam %.2f detik', worker.pid, result['templates'], result['seconds'])
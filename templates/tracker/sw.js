@@ -0,0 +1,71 @@
+// Service worker Progres Harian (dilayani oleh tracker/offline.py, versi {{ version }}).
+// - static file (nama ber-hash) dan CSS/font dari CDN: cache dulu, jaringan bila belum ada
+// - halaman: jaringan dulu; salinan terakhir disimpan untuk dibuka saat offline
+// - POST tidak disentuh: form yang diantrekan saat offline diurus oleh base.html
+const VERSION = '{{ version }}';
+const STATIC_CACHE = 'ph-static-' + VERSION;
+const PAGES_CACHE = 'ph-pages';
+const PRECACHE = {{ precache|safe }};
+const STATIC_PREFIX = {{ static_prefix|safe }};
+const SKIP_PREFIXES = {{ skip_prefixes|safe }};
+const OFFLINE_URL = {{ offline_url|safe }};
+const CDN_ORIGIN = 'https://cdn.jsdelivr.net';
+
+self.addEventListener('install', function(event){
+	event.waitUntil(
+		caches.open(STATIC_CACHE)
+			.then(function(cache){ return cache.addAll(PRECACHE); })
+			.then(function(){ return self.skipWaiting(); })
+	);
+});
+
+self.addEventListener('activate', function(event){
+	event.waitUntil(
+		caches.keys()
+			.then(function(keys){
+				return Promise.all(keys.filter(function(key){ return key.startsWith('ph-static-') && key !== STATIC_CACHE; }).map(function(key){ return caches.delete(key); }));
+			})
+			.then(function(){ return self.clients.claim(); })
+	);
+});
+
+function cacheFirst(request){
+	return caches.open(STATIC_CACHE).then(function(cache){
+		return cache.match(request).then(function(hit){
+			if (hit) return hit;
+			return fetch(request).then(function(response){
+				// CSS dari CDN dimuat tanpa CORS (respons opaque)
+				if (response.ok || response.type === 'opaque') cache.put(request, response.clone());
+				return response;
+			});
+		});
+	});
+}
+
+function networkFirst(request){
+	return fetch(request).then(function(response){
+		// Redirect (mis. ke halaman login) tidak disimpan
+		if (response.ok && !response.redirected && response.type === 'basic') {
+			const copy = response.clone();
+			caches.open(PAGES_CACHE).then(function(cache){ cache.put(request, copy); });
+		}
+		return response;
+	}).catch(function(){
+		return caches.open(PAGES_CACHE)
+			.then(function(cache){ return cache.match(request); })
+			.then(function(hit){ return hit || caches.match(OFFLINE_URL); });
+	});
+}
+
+self.addEventListener('fetch', function(event){
+	const request = event.request;
+	if (request.method !== 'GET') return;
+	const url = new URL(request.url);
+	if (url.origin === self.location.origin && url.pathname.startsWith(STATIC_PREFIX)) {
+		event.respondWith(cacheFirst(request));
+	} else if (url.origin === CDN_ORIGIN && (request.destination === 'style' || request.destination === 'font')) {
+		event.respondWith(cacheFirst(request));
+	} else if (request.mode === 'navigate' && url.origin === self.location.origin && !SKIP_PREFIXES.some(function(prefix){ return url.pathname.startsWith(prefix); })) {
+		event.respondWith(networkFirst(request));
+	}
+});
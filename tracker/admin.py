@@ -1,69 +1,369 @@
-from django.contrib import admin
-from .models import DailyTask, Account, Transaction, Saving, SavingsGoal, UserPreferences, LearningLog, HealthLog, MindfulnessLog, WaterIntake
+import csv
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+from django.utils import timezone
+from django.utils.functional import cached_property
+from . import balance_history, live
+from .models import DailyTask, Account, Transaction, Category, CategoryAlias, Saving, SavingsGoal, UserPreferences, LearningLog, LearningTopic, LearningTopicAlias, HealthLog, MindfulnessLog, JournalTerm, WaterIntake, Job, JobStatus, ImportProfile, ArchiveRun, ArchivedTransaction, ArchivedSaving, RequestProfile
+
+
+class BoundedCountPaginator(Paginator):
+	# COUNT(*) dibatasi lewat subquery ber-LIMIT, jadi tidak memindai seluruh tabel.
+	# Batasnya dihitung dari halaman yang sedang dibuka, jadi halaman sesudah batas
+	# tetap bisa dicapai; jumlah yang terpotong tampil sebagai "N+"
+	# (templates/admin/tracker/pagination.html).
+	max_count = 10000
+
+	def __init__(self, *args, page_number=1, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.limit = (max(page_number, 1) - 1) * self.per_page + self.max_count
+
+	@cached_property
+	def _bounded_count(self):
+		return self.object_list[:self.limit + 1].count()
+
+	@cached_property
+	def count(self):
+		return min(self._bounded_count, self.limit)
+
+	@property
+	def capped(self) -> bool:
+		return self._bounded_count > self.limit
+
+
+class FastChangeListAdmin(admin.ModelAdmin):
+	paginator = BoundedCountPaginator
+	show_full_result_count = False
+	list_per_page = 50
+
+	def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+		try:
+			page_number = int(request.GET.get(PAGE_VAR, 1))
+		except ValueError:
+			page_number = 1
+		return self.paginator(queryset, per_page, orphans, allow_empty_first_page, page_number=page_number)
+
+
+class _EchoBuffer:
+	def write(self, value):
+		return value
+
+
+def stream_csv(filename, header, rows):
+	writer = csv.writer(_EchoBuffer())
+
+	def _lines():
+		yield writer.writerow(header)
+		for row in rows:
+			yield writer.writerow(row)
+
+	response = StreamingHttpResponse(_lines(), content_type='text/csv')
+	response['Content-Disposition'] = f'attachment; filename="{filename}"'
+	return response
+
+
+class RecategorizeForm(forms.Form):
+	category = forms.CharField(max_length=100, required=False, label='Kategori baru')
+
+
+class ReassignAccountForm(forms.Form):
+	account = forms.ModelChoiceField(queryset=Account.objects.select_related('user').order_by('user', 'name'), label='Akun tujuan')
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.fields['account'].label_from_instance = lambda account: f'{account.name} ({account.user})'
+
+
+def _bulk_update_action(modeladmin, request, queryset, form_class, title, apply):
+	"""Aksi massal dua langkah: tampilkan form, lalu terapkan dengan satu UPDATE."""
+	if 'apply' in request.POST:
+		form = form_class(request.POST)
+		if form.is_valid():
+			updated = apply(queryset, form.cleaned_data)
+			modeladmin.message_user(request, f'{updated} baris diperbarui.', messages.SUCCESS)
+			return None
+	else:
+		form = form_class()
+	context = {
+		**modeladmin.admin_site.each_context(request),
+		'title': title,
+		'opts': modeladmin.model._meta,
+		'form': form,
+		'action': request.POST.get('action'),
+		'selected_ids': request.POST.getlist(ACTION_CHECKBOX_NAME),
+		'select_across': request.POST.get('select_across', '0'),
+		'selected_count': queryset.count(),
+	}
+	return render(request, 'admin/tracker/bulk_action.html', context)
+
+
+def _recategorize(queryset, data):
+	# Kategori ternormalisasi milik masing-masing pengguna: satu UPDATE per pengguna
+	updated = 0
+	for user_id in queryset.values_list('user_id', flat=True).distinct().order_by():
+		category = Category.objects.resolve(user_id, data['category'])
+		updated += queryset.filter(user_id=user_id).update(category=data['category'], category_ref=category, updated_at=timezone.now())
+	return updated
+
+
+@admin.action(description='Ubah kategori transaksi terpilih')
+def recategorize(modeladmin, request, queryset):
+	return _bulk_update_action(modeladmin, request, queryset, RecategorizeForm, 'Ubah kategori', _recategorize)
+
+
+def _reassign(queryset, data):
+	# Hanya baris milik pengguna yang sama dengan akun tujuan yang dipindah
+	account = data['account']
+	moved = queryset.filter(user_id=account.user_id)
+	sources = set(moved.values_list('account_id', flat=True))
+	updated = moved.update(account=account, updated_at=timezone.now())
+	balance_history.invalidate()
+	live.publish_balances(account.user_id, sources | {account.pk})
+	return updated
+
+
+@admin.action(description='Pindahkan ke akun lain')
+def reassign_account(modeladmin, request, queryset):
+	return _bulk_update_action(modeladmin, request, queryset, ReassignAccountForm, 'Pindahkan ke akun lain', _reassign)
+
+
+@admin.action(description='Ekspor terpilih ke CSV')
+def export_transactions_csv(modeladmin, request, queryset):
+	rows = queryset.order_by('date', 'id').values_list('date', 'account__name', 'type', 'amount', 'category', 'note').iterator(chunk_size=2000)
+	return stream_csv('transactions.csv', ['date', 'account', 'type', 'amount', 'category', 'note'], rows)
+
+
+@admin.action(description='Ekspor terpilih ke CSV')
+def export_savings_csv(modeladmin, request, queryset):
+	rows = queryset.order_by('date', 'id').values_list('date', 'account__name', 'amount', 'goal__name', 'goal_name', 'note').iterator(chunk_size=2000)
+	return stream_csv('savings.csv', ['date', 'account', 'amount', 'goal', 'goal_name', 'note'], rows)
 
 
 @admin.register(DailyTask)
-class DailyTaskAdmin(admin.ModelAdmin):
-	list_display = ('date', 'category', 'title', 'is_completed')
-	list_filter = ('category', 'is_completed', 'date')
+class DailyTaskAdmin(FastChangeListAdmin):
+	list_display = ('date', 'user', 'category', 'title', 'is_completed')
+	list_filter = ('user', 'category', 'is_completed', 'date')
 	search_fields = ('title', 'description')
-	date_hierarchy = 'date'
 
 
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
-	list_display = ('name', 'initial_balance', 'current_balance', 'created_at')
+	list_display = ('name', 'user', 'initial_balance', 'current_balance', 'created_at')
+	list_filter = ('user',)
 	search_fields = ('name',)
 
+	def get_queryset(self, request):
+		return super().get_queryset(request).with_balance()
+
+	@admin.display(description='Saldo', ordering='annotated_balance')
+	def current_balance(self, obj):
+		return obj.current_balance
+
 
 @admin.register(Transaction)
-class TransactionAdmin(admin.ModelAdmin):
-	list_display = ('date', 'account', 'type', 'amount', 'category')
-	list_filter = ('type', 'account', 'date')
+class TransactionAdmin(FastChangeListAdmin):
+	list_display = ('date', 'user', 'account', 'type', 'amount', 'category')
+	list_filter = ('user', 'type', 'account', 'date')
+	list_select_related = ('account',)
 	search_fields = ('category', 'note')
-	date_hierarchy = 'date'
+	# Diisi Transaction.save dari teks kategori
+	readonly_fields = ('category_ref',)
+	actions = (recategorize, reassign_account, export_transactions_csv)
 
 
 @admin.register(Saving)
-class SavingAdmin(admin.ModelAdmin):
-	list_display = ('date', 'account', 'amount', 'goal', 'goal_name')
-	list_filter = ('account', 'goal', 'date')
+class SavingAdmin(FastChangeListAdmin):
+	list_display = ('date', 'user', 'account', 'amount', 'goal', 'goal_name')
+	list_filter = ('user', 'account', 'goal', 'date')
+	list_select_related = ('account', 'goal')
 	search_fields = ('goal_name', 'note')
-	date_hierarchy = 'date'
+	actions = (reassign_account, export_savings_csv)
 
 
 @admin.register(SavingsGoal)
 class SavingsGoalAdmin(admin.ModelAdmin):
-	list_display = ('name', 'target_amount', 'saved_amount', 'progress_percent', 'created_at')
+	list_display = ('name', 'user', 'target_amount', 'saved_amount', 'progress_percent', 'created_at')
+	list_filter = ('user',)
+	search_fields = ('name',)
+
+	def get_queryset(self, request):
+		return super().get_queryset(request).with_saved_amount()
+
+	@admin.display(description='Terkumpul', ordering='annotated_saved_amount')
+	def saved_amount(self, obj):
+		return obj.saved_amount
+
+	@admin.display(description='Progres (%)')
+	def progress_percent(self, obj):
+		return round(obj.progress_percent, 1)
+
+
+@admin.register(ImportProfile)
+class ImportProfileAdmin(admin.ModelAdmin):
+	list_display = ('name', 'user', 'delimiter', 'date_column', 'date_format', 'amount_column', 'debit_column', 'credit_column')
 	search_fields = ('name',)
 
 
 @admin.register(UserPreferences)
 class UserPreferencesAdmin(admin.ModelAdmin):
-	list_display = ('preferred_academic_focus', 'preferred_health_focus', 'daily_water_goal_glasses', 'created_at')
+	list_display = ('user', 'preferred_academic_focus', 'preferred_health_focus', 'daily_water_goal_glasses', 'created_at')
+
+
+class CategoryAliasInline(admin.TabularInline):
+	model = CategoryAlias
+	extra = 0
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+	list_display = ('name', 'user', 'key', 'created_at')
+	list_filter = ('user',)
+	search_fields = ('name', 'key', 'aliases__key')
+	readonly_fields = ('key',)
+	inlines = (CategoryAliasInline,)
+
+
+class LearningTopicAliasInline(admin.TabularInline):
+	model = LearningTopicAlias
+	extra = 0
+
+
+@admin.register(LearningTopic)
+class LearningTopicAdmin(admin.ModelAdmin):
+	list_display = ('name', 'user', 'key', 'created_at')
+	list_filter = ('user',)
+	search_fields = ('name', 'key', 'aliases__key')
+	readonly_fields = ('key',)
+	inlines = (LearningTopicAliasInline,)
 
 
 @admin.register(LearningLog)
-class LearningLogAdmin(admin.ModelAdmin):
-	list_display = ('date', 'topic', 'duration_minutes')
+class LearningLogAdmin(FastChangeListAdmin):
+	list_display = ('date', 'user', 'topic', 'topic_ref', 'duration_minutes')
+	list_filter = ('user', 'date')
+	list_select_related = ('topic_ref',)
 	search_fields = ('topic',)
-	date_hierarchy = 'date'
+	autocomplete_fields = ('topic_ref',)
 
 
 @admin.register(HealthLog)
-class HealthLogAdmin(admin.ModelAdmin):
-	list_display = ('date', 'activity', 'duration_or_sets')
+class HealthLogAdmin(FastChangeListAdmin):
+	list_display = ('date', 'user', 'activity', 'duration_or_sets', 'minutes', 'sets', 'reps', 'distance_km')
+	list_filter = ('user', 'date')
 	search_fields = ('activity',)
-	date_hierarchy = 'date'
 
 
 @admin.register(MindfulnessLog)
-class MindfulnessLogAdmin(admin.ModelAdmin):
-	list_display = ('date',)
-	date_hierarchy = 'date'
+class MindfulnessLogAdmin(FastChangeListAdmin):
+	list_display = ('date', 'user')
+	list_filter = ('user', 'date')
+
+
+@admin.register(JournalTerm)
+class JournalTermAdmin(FastChangeListAdmin):
+	list_display = ('month', 'user', 'field', 'term', 'count')
+	list_filter = ('user', 'field', 'month')
+	search_fields = ('term',)
+	readonly_fields = ('user', 'month', 'field', 'term', 'count')
 
 
 @admin.register(WaterIntake)
-class WaterIntakeAdmin(admin.ModelAdmin):
-	list_display = ('date', 'glasses')
-	date_hierarchy = 'date'
+class WaterIntakeAdmin(FastChangeListAdmin):
+	list_display = ('date', 'user', 'glasses')
+	list_filter = ('user', 'date')
+
+
+@admin.action(description='Jalankan ulang job terpilih')
+def retry_jobs(modeladmin, request, queryset):
+	updated = queryset.filter(status=JobStatus.FAILED).update(status=JobStatus.PENDING, attempts=0, run_after=timezone.now(), finished_at=None, updated_at=timezone.now())
+	modeladmin.message_user(request, f'{updated} job dijadwalkan ulang.', messages.SUCCESS)
+
+
+@admin.register(Job)
+class JobAdmin(FastChangeListAdmin):
+	list_display = ('id', 'kind', 'user', 'status', 'progress', 'total', 'attempts', 'created_at', 'finished_at')
+	list_filter = ('status', 'kind')
+	exclude = ('input_data', 'output_data', 'output_file')
+	readonly_fields = ('kind', 'user', 'payload', 'result', 'output_name', 'progress', 'total', 'attempts', 'error', 'locked_at', 'finished_at')
+	actions = (retry_jobs,)
+
+	def get_queryset(self, request):
+		return super().get_queryset(request).defer('input_data', 'output_data')
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(FastChangeListAdmin):
+	list_display = ('created_at', 'method', 'path', 'view_name', 'status_code', 'duration_ms', 'sql_count', 'sql_ms', 'user', 'sampled')
+	list_filter = ('view_name', 'sampled', 'status_code')
+	search_fields = ('path',)
+	exclude = ('functions', 'queries', 'stats_data')
+	readonly_fields = ('method', 'path', 'view_name', 'status_code', 'user', 'sampled', 'duration_ms', 'sql_count', 'sql_ms', 'download', 'top_functions', 'top_queries')
+
+	def get_queryset(self, request):
+		return super().get_queryset(request).defer('stats_data')
+
+	def has_add_permission(self, request):
+		return False
+
+	def get_urls(self):
+		return [
+			path('<int:profile_id>/download/', self.admin_site.admin_view(self.download_view), name='tracker_requestprofile_download'),
+		] + super().get_urls()
+
+	def download_view(self, request, profile_id):
+		if not self.has_view_permission(request):
+			raise PermissionDenied
+		profile = get_object_or_404(RequestProfile, pk=profile_id)
+		response = HttpResponse(bytes(profile.stats_data or b''), content_type='application/octet-stream')
+		response['Content-Disposition'] = f'attachment; filename="request-{profile.pk}.prof"'
+		return response
+
+	@admin.display(description='File profil')
+	def download(self, obj):
+		url = reverse('admin:tracker_requestprofile_download', args=[obj.pk])
+		return format_html('<a href="{}">request-{}.prof</a> (python -m pstats / snakeviz)', url, obj.pk)
+
+	@admin.display(description='Fungsi teratas (waktu kumulatif)')
+	def top_functions(self, obj):
+		rows = format_html_join('', '<tr><td>{}</td><td>{}</td><td>{}</td><td><code>{}</code></td></tr>', (
+			(f['cumtime_ms'], f['tottime_ms'], f['calls'], f['function']) for f in obj.functions
+		))
+		return format_html('<table><tr><th>kumulatif (ms)</th><th>sendiri (ms)</th><th>panggilan</th><th>fungsi</th></tr>{}</table>', rows)
+
+	@admin.display(description='Query SQL (per teks query)')
+	def top_queries(self, obj):
+		rows = format_html_join('', '<tr><td>{}</td><td>{}</td><td>{}</td><td><code>{}</code></td></tr>', (
+			(q['ms'], q['count'], q['alias'], q['sql']) for q in obj.queries
+		))
+		return format_html('<table><tr><th>total (ms)</th><th>jumlah</th><th>db</th><th>sql</th></tr>{}</table>', rows)
+
+
+@admin.register(ArchiveRun)
+class ArchiveRunAdmin(admin.ModelAdmin):
+	list_display = ('cutoff', 'counts', 'created_at')
+	readonly_fields = ('cutoff', 'counts')
+
+
+@admin.register(ArchivedTransaction)
+class ArchivedTransactionAdmin(FastChangeListAdmin):
+	list_display = ('date', 'account', 'type', 'amount', 'category', 'archived_at')
+	list_filter = ('type', 'account')
+	list_select_related = ('account',)
+	search_fields = ('category', 'note')
+
+
+@admin.register(ArchivedSaving)
+class ArchivedSavingAdmin(FastChangeListAdmin):
+	list_display = ('date', 'account', 'amount', 'goal', 'goal_name', 'archived_at')
+	list_filter = ('account',)
+	list_select_related = ('account', 'goal')
+	search_fields = ('goal_name', 'note')
@@ -0,0 +1,173 @@
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+from .models import (
+	Transaction, ArchivedTransaction, Saving, ArchivedSaving, LearningLog, ArchivedLearningLog, HealthLog, ArchivedHealthLog,
+)
+
+try:
+	import pyarrow
+	import pyarrow.parquet
+except ImportError:  # pyarrow opsional: tanpa itu ekspor memakai NDJSON
+	pyarrow = None
+
+# Ekspor analitik kolumnar: transaksi, tabungan, log belajar dan log kesehatan
+# (tabel aktif + arsip) dalam satu arsip zip. Dengan pyarrow tiap dataset ditulis
+# sebagai Parquet (kompresi zstd, satu row group per chunk); tanpa pyarrow sebagai
+# NDJSON ter-deflate. schema.json selalu ikut, berisi tipe tiap kolom, supaya
+# NDJSON tetap bisa dimuat dengan tipe yang benar (desimal ditulis sebagai string).
+# Baris dibaca per chunk lewat values_list().iterator(), tanpa membuat objek model.
+
+CHUNK_SIZE = 5000
+SPOOL_BYTES = 32 * 1024 * 1024
+FORMATS = ('parquet', 'ndjson')
+
+# dataset -> (model aktif, model arsip), [(kolom, lookup values_list, tipe)]
+DATASETS = {
+	'transactions': ((Transaction, ArchivedTransaction), [
+		('id', 'id', 'int64'), ('user_id', 'user_id', 'int64'), ('date', 'date', 'date'),
+		('account_id', 'account_id', 'int64'), ('account', 'account__name', 'string'),
+		('type', 'type', 'string'), ('amount', 'amount', 'decimal(12,2)'),
+		('category', 'category', 'string'), ('category_id', 'category_ref_id', 'int64'),
+		('category_name', 'category_ref__name', 'string'), ('note', 'note', 'string'),
+	]),
+	'savings': ((Saving, ArchivedSaving), [
+		('id', 'id', 'int64'), ('user_id', 'user_id', 'int64'), ('date', 'date', 'date'),
+		('account_id', 'account_id', 'int64'), ('account', 'account__name', 'string'),
+		('amount', 'amount', 'decimal(12,2)'), ('goal_id', 'goal_id', 'int64'), ('goal', 'goal__name', 'string'),
+		('goal_name', 'goal_name', 'string'), ('note', 'note', 'string'),
+	]),
+	'learning_logs': ((LearningLog, ArchivedLearningLog), [
+		('id', 'id', 'int64'), ('user_id', 'user_id', 'int64'), ('date', 'date', 'date'),
+		('topic', 'topic', 'string'), ('topic_id', 'topic_ref_id', 'int64'), ('topic_name', 'topic_ref__name', 'string'),
+		('duration_minutes', 'duration_minutes', 'int64'), ('key_takeaways', 'key_takeaways', 'string'),
+		('source_url', 'source_url', 'string'),
+	]),
+	'health_logs': ((HealthLog, ArchivedHealthLog), [
+		('id', 'id', 'int64'), ('user_id', 'user_id', 'int64'), ('date', 'date', 'date'),
+		('activity', 'activity', 'string'), ('duration_or_sets', 'duration_or_sets', 'string'), ('note', 'note', 'string'),
+		('minutes', 'minutes', 'int64'), ('sets', 'sets', 'int64'), ('reps', 'reps', 'int64'),
+		('distance_km', 'distance_km', 'decimal(7,2)'),
+	]),
+}
+# Kolom tambahan: baris berasal dari tabel arsip
+ARCHIVED_COLUMN = ('archived', 'bool')
+
+
+def available_format(requested: str = 'auto') -> str:
+	if requested == 'parquet' and pyarrow is None:
+		raise ValueError('Format parquet memerlukan pyarrow (pip install pyarrow)')
+	if requested in FORMATS:
+		return requested
+	return 'parquet' if pyarrow is not None else 'ndjson'
+
+
+def _columns(name) -> list:
+	_, columns = DATASETS[name]
+	return [(column, kind) for column, _, kind in columns] + [ARCHIVED_COLUMN]
+
+
+def _chunks(name, user_id=None, chunk_size=CHUNK_SIZE):
+	"""List baris (tuple, urutan kolom sesuai DATASETS + archived) per chunk."""
+	models, columns = DATASETS[name]
+	lookups = [lookup for _, lookup, _ in columns]
+	for model in models:
+		qs = model.objects.all() if user_id is None else model.objects.filter(user_id=user_id)
+		archived = model in (ArchivedTransaction, ArchivedSaving, ArchivedLearningLog, ArchivedHealthLog)
+		chunk = []
+		for row in qs.order_by('pk').values_list(*lookups).iterator(chunk_size=chunk_size):
+			chunk.append(row + (archived,))
+			if len(chunk) >= chunk_size:
+				yield chunk
+				chunk = []
+		if chunk:
+			yield chunk
+
+
+def _arrow_type(kind):
+	if kind.startswith('decimal('):
+		precision, scale = kind[len('decimal('):-1].split(',')
+		return pyarrow.decimal128(int(precision), int(scale))
+	return {'int64': pyarrow.int64(), 'string': pyarrow.string(), 'date': pyarrow.date32(), 'bool': pyarrow.bool_()}[kind]
+
+
+def _write_parquet(name, out, chunks):
+	schema = pyarrow.schema([(column, _arrow_type(kind)) for column, kind in _columns(name)])
+	count = 0
+	with pyarrow.parquet.ParquetWriter(out, schema, compression='zstd') as writer:
+		for chunk in chunks:
+			# Transpos baris -> kolom; satu row group per chunk
+			arrays = [pyarrow.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+			writer.write_batch(pyarrow.record_batch(arrays, schema=schema))
+			count += len(chunk)
+			yield count
+	if not count:
+		yield 0
+
+
+def _json_value(value):
+	if isinstance(value, Decimal):
+		return str(value)
+	if isinstance(value, date):
+		return value.isoformat()
+	return value
+
+
+def _write_ndjson(name, out, chunks):
+	columns = [column for column, _ in _columns(name)]
+	text = io.TextIOWrapper(out, encoding='utf-8', newline='\n')
+	count = 0
+	for chunk in chunks:
+		text.writelines(json.dumps(dict(zip(columns, map(_json_value, row))), ensure_ascii=False) + '\n' for row in chunk)
+		count += len(chunk)
+		yield count
+	text.flush()
+	text.detach()
+	if not count:
+		yield 0
+
+
+def write_archive(out, fmt='auto', user_id=None, datasets=None, chunk_size=CHUNK_SIZE, progress=None) -> dict:
+	"""Tulis zip ekspor ke file `out`; kembalikan {dataset: jumlah baris}.
+
+	`progress(dataset, baris_sejauh_ini)` dipanggil setelah tiap chunk.
+	"""
+	fmt = available_format(fmt)
+	counts = {}
+	with zipfile.ZipFile(out, 'w', allowZip64=True) as archive:
+		for name in datasets or DATASETS:
+			chunks = _chunks(name, user_id, chunk_size)
+			if fmt == 'parquet':
+				# ParquetWriter butuh file yang bisa tell(): tulis dulu ke spool, lalu simpan
+				# tanpa kompresi zip (isi Parquet sudah terkompresi)
+				with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+					for counts[name] in _write_parquet(name, spool, chunks):
+						progress and progress(name, counts[name])
+					spool.seek(0)
+					with archive.open(zipfile.ZipInfo(f'{name}.parquet', date.today().timetuple()[:6]), 'w', force_zip64=True) as member:
+						shutil.copyfileobj(spool, member)
+			else:
+				info = zipfile.ZipInfo(f'{name}.ndjson', date.today().timetuple()[:6])
+				info.compress_type = zipfile.ZIP_DEFLATED
+				with archive.open(info, 'w', force_zip64=True) as member:
+					for counts[name] in _write_ndjson(name, member, chunks):
+						progress and progress(name, counts[name])
+		schema = {
+			'format': fmt,
+			'datasets': {name: {'file': f'{name}.{fmt}', 'rows': counts[name], 'columns': dict(_columns(name))} for name in counts},
+		}
+		archive.writestr('schema.json', json.dumps(schema, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+	return counts
+
+
+def total_rows(user_id=None, datasets=None) -> int:
+	total = 0
+	for name in datasets or DATASETS:
+		for model in DATASETS[name][0]:
+			total += (model.objects.all() if user_id is None else model.objects.filter(user_id=user_id)).count()
+	return total
@@ -0,0 +1,178 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.decorators import login_not_required
+from django.db.models import Count, Q, Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from .archive import aarchive_cutoff, acount_over, asum_over, ranged, reaches_archive
+from .db_router import aread_from_replica
+from .middleware import pinned_to_primary
+from .models import (
+	Account, ArchivedSaving, ArchivedTransaction, Category, DailyTask, HealthLog, LearningLog, Saving, Transaction,
+	TransactionType, UserPreferences, WaterIntake,
+)
+
+# API baca JSON untuk klien mobile: ringkasan dashboard, daftar saldo dan total
+# laporan. View async + ORM async (aget/afirst/aaggregate/async for), jadi di
+# bawah ASGI (GUNICORN_ASGI=true) klien yang lambat hanya memegang coroutine,
+# bukan thread atau worker. Di WSGI view yang sama tetap berjalan (lewat
+# async_to_sync). Pembacaan mengikuti aturan replica yang sama dengan halaman.
+
+LIST_LIMIT = 50
+MAX_LIST_LIMIT = 200
+CENT = Decimal('0.01')
+
+
+def _date(value):
+	try:
+		return date.fromisoformat(value) if value else None
+	except ValueError:
+		return None
+
+
+def _money(value) -> Decimal:
+	# Saldo/total dari SUM di SQLite tidak membawa skala kolom
+	return Decimal(str(value or 0)).quantize(CENT)
+
+
+def _id(value):
+	return int(value) if value and value.isdigit() else None
+
+
+def _limit(value) -> int:
+	try:
+		return min(max(int(value), 1), MAX_LIST_LIMIT)
+	except (TypeError, ValueError):
+		return LIST_LIMIT
+
+
+@method_decorator(login_not_required, name='dispatch')
+class AsyncAPIView(View):
+	"""Basis view API: 401 JSON (bukan redirect login) dan baca dari replica untuk GET."""
+	http_method_names = ['get', 'head', 'options']
+
+	async def dispatch(self, request, *args, **kwargs):
+		user = await request.auser()
+		if not user.is_authenticated:
+			return JsonResponse({'error': 'Perlu login'}, status=401)
+		async with aread_from_replica(request.method in ('GET', 'HEAD') and not pinned_to_primary(request)):
+			return await super().dispatch(request, *args, user=user, **kwargs)
+
+
+class DashboardSummaryAPI(AsyncAPIView):
+	async def get(self, request, user):
+		today = timezone.localdate()
+		week_start = today - timedelta(days=today.weekday())
+		tasks = [
+			task async for task in DailyTask.objects.filter(user=user, date=today)
+			.order_by('category', 'created_at').values('id', 'category', 'title', 'is_completed')
+		]
+		per_day = {
+			row['date']: row async for row in DailyTask.objects.filter(user=user, date__range=(week_start, week_start + timedelta(days=6)))
+			.values('date').annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True))).order_by()
+		}
+		water = await WaterIntake.objects.filter(user=user, date=today).values_list('glasses', flat=True).afirst()
+		water_goal = await UserPreferences.objects.filter(user=user).values_list('daily_water_goal_glasses', flat=True).afirst()
+		accounts = [account async for account in Account.objects.filter(user=user).with_balance().order_by('name')]
+		recent = [
+			row async for row in Transaction.objects.filter(user=user).order_by('-date', '-id')
+			.values('id', 'date', 'type', 'amount', 'category', 'account_id')[:5]
+		]
+		return JsonResponse({
+			'date': today,
+			'tasks': tasks,
+			'tasks_completed': sum(1 for task in tasks if task['is_completed']),
+			'week': [
+				{'date': day, 'completed': per_day.get(day, {}).get('completed', 0), 'total': per_day.get(day, {}).get('total', 0)}
+				for day in (week_start + timedelta(days=i) for i in range(7))
+			],
+			'water': {'glasses': water or 0, 'goal': water_goal or 8},
+			'accounts': [{'id': a.pk, 'name': a.name, 'balance': _money(a.current_balance)} for a in accounts],
+			'total_balance': _money(sum((a.current_balance for a in accounts), Decimal('0'))),
+			'recent_transactions': recent,
+		})
+
+
+class SaldoAPI(AsyncAPIView):
+	async def get(self, request, user):
+		start = _date(request.GET.get('start'))
+		end = _date(request.GET.get('end'))
+		q = request.GET.get('q', '').strip()
+		ttype = request.GET.get('type', '').strip()
+		account_id = _id(request.GET.get('account_id'))
+		limit = _limit(request.GET.get('limit'))
+		# Sama dengan SaldoView: arsip hanya dicari bila rentang/pencarian mencapainya
+		include_archive = bool(start or q) and reaches_archive(start, await aarchive_cutoff())
+
+		def _filter(qs, text_fields, types=True):
+			if account_id:
+				qs = qs.filter(account_id=account_id)
+			if start:
+				qs = qs.filter(date__gte=start)
+			if end:
+				qs = qs.filter(date__lte=end)
+			if types and ttype in (TransactionType.INCOME, TransactionType.EXPENSE):
+				qs = qs.filter(type=ttype)
+			if q:
+				qs = qs.filter(Q(**{f'{text_fields[0]}__icontains': q}) | Q(**{f'{text_fields[1]}__icontains': q}))
+			return qs.order_by('-date', '-id')[:limit]
+
+		async def _rows(models, text_fields, fields, types=True):
+			rows = []
+			for model in models if include_archive else models[:1]:
+				rows += [row async for row in _filter(model.objects.filter(user=user), text_fields, types).values(*fields)]
+			return sorted(rows, key=lambda row: (row['date'], row['id']), reverse=True)[:limit]
+
+		transactions = await _rows(
+			(Transaction, ArchivedTransaction), ('category', 'note'),
+			('id', 'date', 'type', 'amount', 'category', 'category_ref_id', 'note', 'account_id'),
+		)
+		savings = await _rows(
+			(Saving, ArchivedSaving), ('goal_name', 'note'),
+			('id', 'date', 'amount', 'goal_id', 'goal_name', 'note', 'account_id'), types=False,
+		)
+		accounts = [
+			{'id': a.pk, 'name': a.name, 'balance': _money(a.current_balance)}
+			async for a in Account.objects.filter(user=user).with_balance().order_by('name')
+		]
+		return JsonResponse({
+			'accounts': accounts,
+			'transactions': transactions,
+			'savings': savings,
+			'includes_archive': include_archive,
+		})
+
+
+class ReportTotalsAPI(AsyncAPIView):
+	async def get(self, request, user):
+		today = timezone.localdate()
+		start = _date(request.GET.get('start')) or today.replace(day=1)
+		end = _date(request.GET.get('end')) or today
+		cutoff = await aarchive_cutoff()
+		transactions = ranged(Transaction, start, end, cutoff, user=user)
+		by_category = defaultdict(Decimal)
+		for qs in transactions:
+			async for row in qs.filter(type=TransactionType.EXPENSE).values('category_ref_id').annotate(total=Sum('amount')).order_by():
+				by_category[row['category_ref_id']] += row['total']
+		names = {
+			pk: name async for pk, name in
+			Category.objects.filter(user=user, pk__in=[pk for pk in by_category if pk]).values_list('pk', 'name')
+		}
+		return JsonResponse({
+			'start': start,
+			'end': end,
+			'income_total': _money(await asum_over([qs.filter(type=TransactionType.INCOME) for qs in transactions], 'amount')),
+			'expense_total': _money(await asum_over([qs.filter(type=TransactionType.EXPENSE) for qs in transactions], 'amount')),
+			'by_category': [
+				{'category_id': pk, 'category': names.get(pk, ''), 'total': _money(total)}
+				for pk, total in sorted(by_category.items(), key=lambda item: -item[1])
+			],
+			'learning_minutes': await asum_over(ranged(LearningLog, start, end, cutoff, user=user), 'duration_minutes'),
+			'health_count': await acount_over(ranged(HealthLog, start, end, cutoff, user=user)),
+			'includes_archive': len(transactions) > 1,
+		})
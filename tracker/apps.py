@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class TrackerConfig(AppConfig):
 	default_auto_field = 'django.db.models.BigAutoField'
 	name = 'tracker'
+
+	def ready(self):
+		from . import job_handlers  # noqa: F401 (mendaftarkan handler job)
+		from . import journal_terms  # noqa: F401 (sinyal indeks kata jurnal)
+		from . import user_cache  # noqa: F401 (sinyal invalidasi cache per pengguna)
+		from . import balance_history  # noqa: F401 (sinyal riwayat saldo)
+		from . import live  # noqa: F401 (sinyal event live)
+		from .checks import enforce_on_startup
+		enforce_on_startup()
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .user_cache import invalidate
+from .models import (
+	Account, SavingsGoal, TransactionType, ArchiveRun,
+	DailyTask, Transaction, Saving, LearningLog, HealthLog, MindfulnessLog, WaterIntake,
+	ArchivedDailyTask, ArchivedTransaction, ArchivedSaving, ArchivedLearningLog, ArchivedHealthLog, ArchivedMindfulnessLog, ArchivedWaterIntake,
+)
+
+# Hot/cold storage: baris dengan tanggal < cutoff dipindah ke tabel Archived*.
+# Saldo akun dan total tujuan tabungan tetap utuh lewat Account.archived_net dan
+# SavingsGoal.archived_saved. Query laporan/pencarian memakai `ranged()` agar
+# tabel arsip hanya disentuh bila rentang tanggal yang diminta mencapainya.
+
+ARCHIVES = {
+	DailyTask: ArchivedDailyTask,
+	Transaction: ArchivedTransaction,
+	Saving: ArchivedSaving,
+	LearningLog: ArchivedLearningLog,
+	HealthLog: ArchivedHealthLog,
+	MindfulnessLog: ArchivedMindfulnessLog,
+	WaterIntake: ArchivedWaterIntake,
+}
+
+
+# Penanda "cutoff belum dibaca" untuk ranged(); None berarti memang belum pernah diarsipkan
+UNKNOWN = object()
+
+
+def archive_cutoff():
+	return ArchiveRun.objects.order_by('-cutoff').values_list('cutoff', flat=True).first()
+
+
+async def aarchive_cutoff():
+	return await ArchiveRun.objects.order_by('-cutoff').values_list('cutoff', flat=True).afirst()
+
+
+def default_cutoff(today=None) -> date:
+	today = today or timezone.localdate()
+	return today - timedelta(days=settings.ARCHIVE_HORIZON_DAYS)
+
+
+def reaches_archive(start, cutoff) -> bool:
+	return cutoff is not None and (start is None or start < cutoff)
+
+
+def ranged(model, start=None, end=None, cutoff=UNKNOWN, **filters):
+	"""Queryset tabel aktif, ditambah queryset arsip bila `start` lebih lama dari cutoff.
+
+	`cutoff` bisa diberikan pemanggil supaya tidak di-query ulang per model (juga
+	None, tanpa arsip); view async wajib memberikannya karena tidak ada query di sini.
+	"""
+	if cutoff is UNKNOWN:
+		cutoff = archive_cutoff()
+	querysets = []
+	for candidate in (model, ARCHIVES[model]) if reaches_archive(start, cutoff) else (model,):
+		qs = candidate.objects.filter(**filters)
+		if start:
+			qs = qs.filter(date__gte=start)
+		if end:
+			qs = qs.filter(date__lte=end)
+		querysets.append(qs)
+	return querysets
+
+
+def sum_over(querysets, field: str):
+	return sum((qs.aggregate(total=Sum(field))['total'] or 0 for qs in querysets), 0)
+
+
+def count_over(querysets) -> int:
+	return sum(qs.count() for qs in querysets)
+
+
+async def asum_over(querysets, field: str):
+	total = 0
+	for qs in querysets:
+		total += (await qs.aaggregate(total=Sum(field)))['total'] or 0
+	return total
+
+
+async def acount_over(querysets) -> int:
+	total = 0
+	for qs in querysets:
+		total += await qs.acount()
+	return total
+
+
+def _copy_fields(archive_model):
+	return [f.attname for f in archive_model._meta.concrete_fields if f.attname != 'archived_at']
+
+
+def _apply_summaries(model, rows):
+	# Pindahkan kontribusi saldo baris yang diarsipkan ke kolom ringkasan
+	now = timezone.now()
+	if model is Transaction:
+		net = defaultdict(Decimal)
+		for row in rows:
+			net[row['account_id']] += row['amount'] if row['type'] == TransactionType.INCOME else -row['amount']
+		for account_id, delta in net.items():
+			Account.objects.filter(id=account_id).update(archived_net=F('archived_net') + delta, updated_at=now)
+	elif model is Saving:
+		net = defaultdict(Decimal)
+		saved = defaultdict(Decimal)
+		for row in rows:
+			net[row['account_id']] -= row['amount']
+			if row['goal_id']:
+				saved[row['goal_id']] += row['amount']
+		for account_id, delta in net.items():
+			Account.objects.filter(id=account_id).update(archived_net=F('archived_net') + delta, updated_at=now)
+		for goal_id, delta in saved.items():
+			SavingsGoal.objects.filter(id=goal_id).update(archived_saved=F('archived_saved') + delta, updated_at=now)
+
+
+def archive_model(model, cutoff: date, batch_size: int = 2000) -> int:
+	archive = ARCHIVES[model]
+	fields = _copy_fields(archive)
+	moved = 0
+	while True:
+		with transaction.atomic():
+			rows = list(model.objects.filter(date__lt=cutoff).order_by('pk').values(*fields)[:batch_size])
+			if not rows:
+				break
+			archive.objects.bulk_create([archive(**row) for row in rows])
+			_apply_summaries(model, rows)
+			# Pemindahan, bukan penghapusan: lewati sinyal delete & collector
+			doomed = model.objects.filter(pk__in=[row['id'] for row in rows])
+			doomed._raw_delete(doomed.db)
+		moved += len(rows)
+	return moved
+
+
+def archive_before(cutoff: date, batch_size: int = 2000) -> dict:
+	# Catat cutoff lebih dulu, supaya pembaca ikut melihat tabel arsip selama proses berjalan
+	run = ArchiveRun.objects.create(cutoff=cutoff)
+	counts = {model._meta.model_name: archive_model(model, cutoff, batch_size) for model in ARCHIVES}
+	run.counts = counts
+	run.save(update_fields=['counts'])
+	# archived_net/archived_saved berubah lewat UPDATE langsung (tanpa sinyal)
+	invalidate()
+	return counts
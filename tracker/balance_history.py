@@ -0,0 +1,201 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Transaction, Saving, ArchivedTransaction, ArchivedSaving, TransactionType
+
+# Riwayat saldo harian per akun. Arus kas harian dari transaksi dan tabungan (aktif
+# dan arsip) dijumlahkan dengan satu query: UNION ALL -> GROUP BY tanggal ->
+# SUM(SUM(net)) OVER (ORDER BY tanggal). Hasilnya disimpan di cache; request
+# berikutnya hanya meminta hari setelah tanggal terakhir di cache. Sinyal
+# Transaction/Saving memotong cache mulai tanggal baris yang berubah.
+#
+# Titik riwayat: (tanggal, arus bersih hari itu, kumulatif arus) tanpa saldo awal,
+# jadi mengubah Account.initial_balance tidak membuat cache basi.
+#
+# Tiap akun punya token versi yang dinaikkan (cache.incr) oleh setiap invalidasi.
+# Entri cache menyimpan versi saat dihitung dan hanya dipakai bila versinya masih
+# sama; request yang membaca arus kas bersamaan dengan invalidasi tidak menulis
+# hasilnya, supaya pemotongan cache tidak tertimpa riwayat lama.
+
+CACHE_TIMEOUT = 7 * 24 * 3600
+GENERATION_KEY = 'tracker:balance-history:generation'
+CENT = Decimal('0.01')
+
+
+def _keys(account_id) -> tuple:
+	"""(kunci entri, kunci versi) untuk akun pada generasi cache saat ini."""
+	generation = cache.get_or_set(GENERATION_KEY, time.time_ns, timeout=None)
+	key = f'tracker:balance-history:{generation}:{account_id}'
+	return key, f'{key}:version'
+
+
+def _version(version_key) -> int:
+	version = cache.get(version_key)
+	if version is None:
+		# Mulai dari waktu sekarang, bukan 0: token yang ter-evict tidak mencocokkan entri lama
+		cache.add(version_key, time.time_ns(), timeout=None)
+		version = cache.get(version_key)
+	return version
+
+
+def _store(key, version_key, version, through, points):
+	# Lewati penulisan bila ada invalidasi sejak `version` dibaca; invalidasi yang
+	# menyelip di antara pemeriksaan dan set membuat entri langsung dibuang lagi
+	if cache.get(version_key) != version:
+		return
+	cache.set(key, {'version': version, 'through': through, 'points': points}, CACHE_TIMEOUT)
+	if cache.get(version_key) != version:
+		cache.delete(key)
+
+
+def _decimal(value) -> Decimal:
+	# SQLite mengembalikan float untuk SUM kolom desimal
+	return value if isinstance(value, Decimal) else Decimal(str(value or 0)).quantize(CENT)
+
+
+def _flows_sql(connection, account_id, since):
+	qn = connection.ops.quote_name
+	selects, params = [], []
+	for model in (Transaction, ArchivedTransaction, Saving, ArchivedSaving):
+		if model in (Transaction, ArchivedTransaction):
+			net = f'CASE WHEN {qn("type")} = %s THEN {qn("amount")} ELSE -{qn("amount")} END'
+			params.append(TransactionType.INCOME)
+		else:
+			net = f'-{qn("amount")}'
+		where = f'{qn("account_id")} = %s'
+		params.append(account_id)
+		if since:
+			where += f' AND {qn("date")} > %s'
+			params.append(since)
+		selects.append(f'SELECT {qn("date")} AS day, {net} AS net FROM {qn(model._meta.db_table)} WHERE {where}')
+	return ' UNION ALL '.join(selects), params
+
+
+def _daily_flows(account_id, since=None):
+	"""(tanggal, net, kumulatif) per hari setelah `since`; kumulatif dihitung dari nol."""
+	# Selalu dari primary: riwayat yang dibaca dari replica tertinggal akan tersimpan di cache
+	connection = connections[router.db_for_write(Transaction)]
+	flows, params = _flows_sql(connection, account_id, since)
+	with connection.cursor() as cursor:
+		if connection.features.supports_over_clause:
+			cursor.execute(
+				f'SELECT day, SUM(net), SUM(SUM(net)) OVER (ORDER BY day ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) '
+				f'FROM ({flows}) flows GROUP BY day ORDER BY day',
+				params,
+			)
+			for day, net, running in cursor:
+				yield _to_date(day), _decimal(net), _decimal(running)
+		else:
+			# Tanpa window function: akumulasi sambil membaca hasil GROUP BY
+			cursor.execute(f'SELECT day, SUM(net) FROM ({flows}) flows GROUP BY day ORDER BY day', params)
+			running = Decimal('0')
+			for day, net in cursor:
+				running += _decimal(net)
+				yield _to_date(day), _decimal(net), running
+
+
+def _to_date(value):
+	# Kolom hasil query mentah: SQLite mengembalikan string 'YYYY-MM-DD'
+	return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def history(account) -> list:
+	"""Titik (tanggal, net, saldo) untuk setiap hari yang punya transaksi/tabungan."""
+	key, version_key = _keys(account.pk)
+	# Versi dibaca sebelum entri dan arus kas
+	version = _version(version_key)
+	entry = cache.get(key)
+	if entry is None or entry.get('version') != version:
+		entry = {'through': None, 'points': []}
+	points = entry['points']
+	base = points[-1][2] if points else Decimal('0')
+	new = [(day, net, base + running) for day, net, running in _daily_flows(account.pk, entry['through'])]
+	if new or entry['through'] is None:
+		points = points + new
+		through = max(filter(None, (timezone.localdate(), entry['through'], points[-1][0] if points else None)))
+		_store(key, version_key, version, through, points)
+	initial = Decimal(account.initial_balance)
+	return [(day, net, initial + running) for day, net, running in points]
+
+
+def daily_series(account, days: int = 180, end=None):
+	"""Saldo tiap hari (diisi maju) untuk `days` hari terakhir, siap untuk grafik."""
+	end = end or timezone.localdate()
+	start = end - timedelta(days=days - 1)
+	points = history(account)
+	balance = Decimal(account.initial_balance)
+	series = []
+	index = 0
+	for offset in range(days):
+		day = start + timedelta(days=offset)
+		while index < len(points) and points[index][0] <= day:
+			balance = points[index][2]
+			index += 1
+		series.append((day, balance))
+	return series
+
+
+def _truncate(account_id, since):
+	key, version_key = _keys(account_id)
+	_version(version_key)
+	version = cache.incr(version_key)
+	entry = cache.get(key)
+	if entry is None:
+		return
+	# Entri yang tidak berasal dari versi tepat sebelumnya terlewat invalidasi lain: buang
+	if since is None or entry.get('version') != version - 1:
+		cache.delete(key)
+		return
+	points = [p for p in entry['points'] if p[0] < since]
+	through = min(filter(None, (entry['through'], since - timedelta(days=1))))
+	_store(key, version_key, version, through, points)
+
+
+def invalidate(account_id=None, since=None):
+	"""Buang cache mulai tanggal `since` (atau seluruhnya); tanpa akun: semua akun."""
+	if account_id is None:
+		transaction.on_commit(lambda: cache.set(GENERATION_KEY, time.time_ns(), timeout=None))
+	else:
+		transaction.on_commit(lambda: _truncate(account_id, since))
+
+
+def _row_date(instance):
+	return type(instance)._meta.get_field('date').to_python(instance.date)
+
+
+@receiver(pre_save, sender=Transaction)
+@receiver(pre_save, sender=Saving)
+def _remember_old_flow(sender, instance, raw=False, **kwargs):
+	# Edit bisa memindah tanggal ke belakang atau mengganti akun: catat posisi lama
+	instance._old_flow = None
+	if instance.pk and not raw:
+		instance._old_flow = sender.objects.filter(pk=instance.pk).values_list('account_id', 'date').first()
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Saving)
+def _row_saved(sender, instance, raw=False, **kwargs):
+	if raw:
+		return
+	new_date = _row_date(instance)
+	old = getattr(instance, '_old_flow', None)
+	if old is None:
+		invalidate(instance.account_id, new_date)
+	elif old[0] == instance.account_id:
+		invalidate(instance.account_id, min(old[1], new_date))
+	else:
+		invalidate(old[0], old[1])
+		invalidate(instance.account_id, new_date)
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Saving)
+def _row_deleted(sender, instance, **kwargs):
+	invalidate(instance.account_id, _row_date(instance))
@@ -0,0 +1,97 @@
+from bisect import bisect_left
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import user_cache
+from .models import Category, CategoryAlias, Transaction, ArchivedTransaction, RecurringTransaction, normalize_category
+
+# Kategori transaksi ternormalisasi. Teks yang diketik tetap di Transaction.category;
+# category_ref menunjuk ke Category (kunci: normalize_category), jadi "Makan",
+# "makan " dan "MAKAN" jatuh ke satu grup. Autocomplete dilayani dari indeks prefiks
+# di memori proses (user_cache.category_index): tanpa query kategori selama indeks
+# masih berlaku, walau middleware sesi/autentikasi tetap membaca database.
+
+CATEGORIZED_MODELS = (Transaction, ArchivedTransaction, RecurringTransaction)
+AUTOCOMPLETE_LIMIT = 8
+
+
+def resolve_ids(user_id, texts) -> dict:
+	"""{teks: id kategori} untuk teks-teks milik satu pengguna (dipakai insert massal)."""
+	resolved = {}
+	for text in set(texts):
+		category = Category.objects.resolve(user_id, text)
+		resolved[text] = category.pk if category else None
+	return resolved
+
+
+def merge_categories(target: Category, names) -> dict:
+	"""Gabungkan kategori/ejaan `names` ke `target`.
+
+	Transaksi milik kategori sumber dipindah ke target, kunci sumber dicatat sebagai
+	alias lalu kategori sumber dihapus. Hanya kategori milik pengguna `target`.
+	"""
+	moved = 0
+	aliases = 0
+	with transaction.atomic():
+		for name in names:
+			key = normalize_category(name)
+			if not key or key == target.key:
+				continue
+			source = Category.objects.filter(user_id=target.user_id, key=key).exclude(pk=target.pk).first()
+			if source is not None:
+				for model in CATEGORIZED_MODELS:
+					extra = {} if model is ArchivedTransaction else {'updated_at': timezone.now()}
+					moved += model.objects.filter(category_ref=source).update(category_ref=target, **extra)
+				CategoryAlias.objects.filter(category=source).update(category=target)
+				source.delete()
+			_, created = CategoryAlias.objects.update_or_create(user_id=target.user_id, key=key, defaults={'category': target})
+			aliases += int(created)
+		# UPDATE massal tanpa sinyal CategoryAlias
+		user_cache.invalidate(target.user_id)
+	return {'moved': moved, 'aliases': aliases}
+
+
+def backfill_categories(batch_size: int = 500) -> int:
+	"""Isi category_ref untuk baris lama: satu UPDATE per teks kategori yang berbeda."""
+	updated = 0
+	for model in CATEGORIZED_MODELS:
+		texts = model.objects.filter(category_ref__isnull=True).exclude(category='').values_list('user_id', 'category').distinct().order_by()
+		extra = {} if model is ArchivedTransaction else {'updated_at': timezone.now()}
+		for user_id, text in texts.iterator(chunk_size=batch_size):
+			category = Category.objects.resolve(user_id, text)
+			if category is not None:
+				updated += model.objects.filter(user_id=user_id, category_ref__isnull=True, category=text).update(category_ref=category, **extra)
+	return updated
+
+
+def build_index(categories, aliases) -> tuple:
+	"""Indeks prefiks terurut: (akhiran kunci, nama, id) mulai dari tiap kata kunci kategori dan aliasnya."""
+	names = {category_id: name for category_id, name, _ in categories}
+	keys = [(category_id, key) for category_id, _, key in categories]
+	keys += [(category_id, key) for category_id, key in aliases if category_id in names]
+	entries = set()
+	for category_id, key in keys:
+		words = key.split(' ')
+		for position in range(len(words)):
+			entries.add((' '.join(words[position:]), names[category_id], category_id))
+	return tuple(sorted(entries))
+
+
+def autocomplete(user, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> list:
+	key = normalize_category(prefix)
+	if not key:
+		return []
+	index = user_cache.category_index(user)
+	found = []
+	seen = set()
+	# Semua entri berprefiks `key` berurutan mulai dari titik bisect
+	for entry_key, name, category_id in index[bisect_left(index, (key,)):]:
+		if not entry_key.startswith(key):
+			break
+		if category_id not in seen:
+			seen.add(category_id)
+			found.append({'id': category_id, 'name': name})
+	# Kategori yang diawali teks yang diketik lebih dulu, sisanya (cocok di tengah/alias) menyusul
+	found.sort(key=lambda item: (not normalize_category(item['name']).startswith(key), item['name'].casefold()))
+	return found[:limit]
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import math
+
+from django.core.cache import cache
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# Grafik SVG yang dirender di server: halaman menampilkan grafik tanpa JavaScript
+# dan tanpa pustaka dari CDN. Warna teks/garis mengikuti tema lewat kelas CSS
+# (.chart di static/css/app.css). Hasil render disimpan di cache dengan kunci
+# hash data grafik, jadi data yang sama (versi data sama) tidak dirender ulang.
+
+RENDERER_VERSION = 1
+CACHE_TIMEOUT = 7 * 24 * 3600
+PALETTE = ['#a78bfa', '#ec4899', '#42a5f5', '#66bb6a', '#ffa726', '#26a69a', '#8d6e63', '#ef5350']
+
+WIDTH = 600
+PAD_LEFT = 48
+PAD_RIGHT = 12
+PAD_TOP = 12
+LEGEND_HEIGHT = 24
+AXIS_HEIGHT = 20
+MAX_X_LABELS = 12
+
+
+def _cached(kind, data, render):
+	digest = hashlib.sha1(json.dumps([RENDERER_VERSION, kind, data], sort_keys=True, default=str).encode()).hexdigest()
+	key = f'tracker:chart:{digest}'
+	svg = cache.get(key)
+	if svg is None:
+		svg = render()
+		cache.set(key, svg, CACHE_TIMEOUT)
+	return mark_safe(svg)
+
+
+def _number(value) -> str:
+	value = float(value)
+	return f'{value:,.0f}'.replace(',', '.') if value == int(value) or abs(value) >= 100 else f'{value:.1f}'
+
+
+def _nice_step(span: float, ticks: int = 4) -> float:
+	raw = span / ticks
+	magnitude = 10 ** math.floor(math.log10(raw))
+	for factor in (1, 2, 2.5, 5, 10):
+		if factor * magnitude >= raw:
+			return factor * magnitude
+	return 10 * magnitude
+
+
+def _scale(values):
+	"""(bawah, atas, langkah) sumbu Y yang rapi dan selalu memuat nol."""
+	low = min([0.0, *values])
+	high = max([0.0, *values])
+	if high == low:
+		high = low + 1
+	step = _nice_step(high - low)
+	if all(float(v).is_integer() for v in values):
+		# Hitungan (tugas, repetisi) tidak punya garis 0,5
+		step = max(step, 1)
+	return math.floor(low / step) * step, math.ceil(high / step) * step, step
+
+
+def _svg(height, body, label) -> str:
+	return (
+		f'<svg class="chart" viewBox="0 0 {WIDTH} {height}" width="100%" role="img" aria-label="{escape(label)}" '
+		f'xmlns="http://www.w3.org/2000/svg">{"".join(body)}</svg>'
+	)
+
+
+def _legend(names, colors, y) -> list:
+	parts = []
+	x = PAD_LEFT
+	for name, color in zip(names, colors):
+		parts.append(f'<rect x="{x}" y="{y - 9}" width="10" height="10" rx="2" fill="{color}"/>')
+		parts.append(f'<text x="{x + 14}" y="{y}">{escape(name)}</text>')
+		x += 24 + 7 * len(str(name))
+	return parts
+
+
+def _axes(low, high, step, top, bottom) -> tuple:
+	"""Garis bantu + label sumbu Y; mengembalikan (elemen, fungsi nilai -> y)."""
+	def y_of(value):
+		return bottom - (float(value) - low) / (high - low) * (bottom - top)
+
+	parts = []
+	tick = low
+	while tick <= high + step / 2:
+		y = y_of(tick)
+		parts.append(f'<line class="grid" x1="{PAD_LEFT}" y1="{y:.1f}" x2="{WIDTH - PAD_RIGHT}" y2="{y:.1f}"/>')
+		parts.append(f'<text class="axis" x="{PAD_LEFT - 6}" y="{y + 4:.1f}" text-anchor="end">{_number(tick)}</text>')
+		tick += step
+	return parts, y_of
+
+
+def _x_labels(labels, x_of, y) -> list:
+	every = max(1, math.ceil(len(labels) / MAX_X_LABELS))
+	return [
+		f'<text class="axis" x="{x_of(i):.1f}" y="{y}" text-anchor="middle">{escape(label)}</text>'
+		for i, label in enumerate(labels) if i % every == 0
+	]
+
+
+def bar_chart(labels, series, height=200, label='Grafik batang'):
+	"""Batang vertikal berkelompok. `series`: [(nama, [nilai per label], warna)]."""
+	data = {'labels': list(labels), 'series': [[name, [float(v) for v in values], color] for name, values, color in series]}
+
+	def render():
+		legend_y = height - 6
+		bottom = height - LEGEND_HEIGHT - AXIS_HEIGHT
+		low, high, step = _scale([v for _, values, _ in data['series'] for v in values])
+		parts, y_of = _axes(low, high, step, PAD_TOP, bottom)
+		slot = (WIDTH - PAD_LEFT - PAD_RIGHT) / max(1, len(data['labels']))
+		bar = slot * 0.8 / max(1, len(data['series']))
+		for i, name_label in enumerate(data['labels']):
+			for j, (name, values, color) in enumerate(data['series']):
+				value = values[i] if i < len(values) else 0
+				x = PAD_LEFT + i * slot + slot * 0.1 + j * bar
+				top, base = sorted((y_of(value), y_of(0)))
+				parts.append(
+					f'<rect x="{x:.1f}" y="{top:.1f}" width="{bar * 0.9:.1f}" height="{max(base - top, 0):.1f}" fill="{color}">'
+					f'<title>{escape(name_label)} · {escape(name)}: {_number(value)}</title></rect>'
+				)
+		parts += _x_labels(data['labels'], lambda i: PAD_LEFT + (i + 0.5) * slot, bottom + 15)
+		if len(data['series']) > 1:
+			parts += _legend([s[0] for s in data['series']], [s[2] for s in data['series']], legend_y)
+		return _svg(height, parts, label)
+
+	return _cached('bar', data, render)
+
+
+def hbar_chart(labels, values, colors, height=120, label='Grafik batang'):
+	"""Batang horizontal, satu per label (mis. pemasukan vs pengeluaran)."""
+	data = {'labels': list(labels), 'values': [float(v) for v in values], 'colors': list(colors)}
+
+	def render():
+		left = 110
+		high = max([0.0, *data['values']]) or 1
+		row = (height - PAD_TOP - AXIS_HEIGHT) / max(1, len(data['labels']))
+		parts = []
+		for i, (name, value, color) in enumerate(zip(data['labels'], data['values'], data['colors'])):
+			y = PAD_TOP + i * row
+			width = value / high * (WIDTH - left - PAD_RIGHT - 80)
+			parts.append(f'<text x="{left - 8}" y="{y + row / 2 + 4:.1f}" text-anchor="end">{escape(name)}</text>')
+			parts.append(f'<rect x="{left}" y="{y + row * 0.15:.1f}" width="{width:.1f}" height="{row * 0.7:.1f}" rx="3" fill="{color}"><title>{escape(name)}: {_number(value)}</title></rect>')
+			parts.append(f'<text class="axis" x="{left + width + 6:.1f}" y="{y + row / 2 + 4:.1f}">{_number(value)}</text>')
+		return _svg(height, parts, label)
+
+	return _cached('hbar', data, render)
+
+
+def pie_chart(labels, values, height=220, label='Grafik lingkaran'):
+	"""Donat dengan legenda di kanan; irisan bernilai nol dilewati."""
+	data = {'labels': list(labels), 'values': [float(v) for v in values]}
+
+	def render():
+		total = sum(v for v in data['values'] if v > 0)
+		cx, cy, r, inner = height / 2, height / 2, height / 2 - 10, height / 4
+		parts = []
+		if not total:
+			parts.append(f'<circle cx="{cx}" cy="{cy}" r="{r}" class="empty"/>')
+			parts.append(f'<text class="axis" x="{cx}" y="{cy + 4}" text-anchor="middle">Belum ada data</text>')
+			return _svg(height, parts, label)
+		angle = -math.pi / 2
+		legend = []
+		for i, (name, value) in enumerate(zip(data['labels'], data['values'])):
+			if value <= 0:
+				continue
+			color = PALETTE[i % len(PALETTE)]
+			share = value / total
+			title = f'<title>{escape(name)}: {_number(value)} ({share:.0%})</title>'
+			if share >= 0.9999:
+				parts.append(f'<circle cx="{cx}" cy="{cy}" r="{(r + inner) / 2}" fill="none" stroke="{color}" stroke-width="{r - inner}">{title}</circle>')
+			else:
+				end = angle + share * 2 * math.pi
+				large = 1 if share > 0.5 else 0
+				points = [(cx + rad * math.cos(a), cy + rad * math.sin(a)) for rad, a in ((r, angle), (r, end), (inner, end), (inner, angle))]
+				parts.append(
+					f'<path d="M{points[0][0]:.1f},{points[0][1]:.1f} A{r},{r} 0 {large} 1 {points[1][0]:.1f},{points[1][1]:.1f} '
+					f'L{points[2][0]:.1f},{points[2][1]:.1f} A{inner},{inner} 0 {large} 0 {points[3][0]:.1f},{points[3][1]:.1f} Z" fill="{color}">{title}</path>'
+				)
+				angle = end
+			legend.append((f'{name} ({share:.0%})', color))
+		for i, (name, color) in enumerate(legend[:10]):
+			y = PAD_TOP + 10 + i * 20
+			parts.append(f'<rect x="{height + 20}" y="{y - 9}" width="10" height="10" rx="2" fill="{color}"/>')
+			parts.append(f'<text x="{height + 36}" y="{y}">{escape(name)}</text>')
+		return _svg(height, parts, label)
+
+	return _cached('pie', data, render)
+
+
+def line_chart(labels, series, height=220, stepped=False, label='Grafik garis'):
+	"""Garis per seri. `series`: [(nama, [nilai per label], warna)]; nilai boleh negatif."""
+	data = {'labels': list(labels), 'series': [[name, [float(v) for v in values], color] for name, values, color in series], 'stepped': stepped}
+
+	def render():
+		legend = len(data['series']) > 1
+		bottom = height - AXIS_HEIGHT - (LEGEND_HEIGHT if legend else 0)
+		low, high, step = _scale([v for _, values, _ in data['series'] for v in values])
+		parts, y_of = _axes(low, high, step, PAD_TOP, bottom)
+		span = max(1, len(data['labels']) - 1)
+
+		def x_of(i):
+			return PAD_LEFT + i / span * (WIDTH - PAD_LEFT - PAD_RIGHT)
+
+		for name, values, color in data['series']:
+			if not values:
+				continue
+			path = [f'M{x_of(0):.1f},{y_of(values[0]):.1f}']
+			for i, value in enumerate(values[1:], start=1):
+				path.append(f'H{x_of(i):.1f}V{y_of(value):.1f}' if data['stepped'] else f'L{x_of(i):.1f},{y_of(value):.1f}')
+			parts.append(
+				f'<path d="{"".join(path)}" fill="none" stroke="{color}" stroke-width="2">'
+				f'<title>{escape(name)}: {_number(values[-1])} ({escape(data["labels"][len(values) - 1])})</title></path>'
+			)
+		parts += _x_labels(data['labels'], x_of, bottom + 15)
+		if legend:
+			parts += _legend([s[0] for s in data['series']], [s[2] for s in data['series']], height - 6)
+		return _svg(height, parts, label)
+
+	return _cached('line', data, render)
@@ -0,0 +1,99 @@
+import logging
+
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+# Pemeriksaan performa untuk profil production (dailyprogress/settings/production.py).
+# Terdaftar sebagai system check (tag "performance", ikut `manage.py check`) dan
+# dijalankan juga saat app siap (TrackerConfig.ready), karena gunicorn tidak
+# menjalankan system check.
+
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache')
+
+
+def _template_loaders_cached() -> bool:
+	for engine in settings.TEMPLATES:
+		if engine['BACKEND'] != 'django.template.backends.django.DjangoTemplates':
+			continue
+		loaders = engine.get('OPTIONS', {}).get('loaders')
+		# Tanpa `loaders` Django memakai cached loader kecuali DEBUG (sudah diperiksa terpisah)
+		if loaders is not None and not any(
+			(loader[0] if isinstance(loader, (list, tuple)) else loader) == CACHED_LOADER for loader in loaders
+		):
+			return False
+	return True
+
+
+@checks.register('performance')
+def performance_checks(app_configs=None, **kwargs):
+	if getattr(settings, 'ENVIRONMENT', None) != 'production':
+		return []
+	issues = []
+	if settings.DEBUG:
+		# Tanpa PERF_CHECK_STRICT hanya peringatan (manage.py tetap berjalan)
+		level = checks.Error if getattr(settings, 'PERF_CHECK_STRICT', False) else checks.Warning
+		issues.append(level(
+			'DEBUG aktif di production: setiap query SQL disimpan di memori dan halaman error membocorkan detail.',
+			hint='Hapus DEBUG=true dari environment production.', id='tracker.E001',
+		))
+	if not _template_loaders_cached():
+		issues.append(checks.Warning(
+			'Template loader tanpa cached.Loader: template dikompilasi ulang di setiap request.',
+			hint=f'Bungkus loader dengan {CACHED_LOADER}.', id='tracker.W001',
+		))
+	if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.db':
+		issues.append(checks.Warning(
+			'Sesi dibaca dari database di setiap request.',
+			hint='Gunakan django.contrib.sessions.backends.cached_db.', id='tracker.W002',
+		))
+	if settings.MESSAGE_STORAGE == 'django.contrib.messages.storage.session.SessionStorage':
+		issues.append(checks.Warning(
+			'Pesan flash disimpan di sesi: setiap redirect menulis sesi.',
+			hint='Gunakan django.contrib.messages.storage.cookie.CookieStorage.', id='tracker.W003',
+		))
+	if settings.CACHES['default']['BACKEND'] in LOCAL_CACHES:
+		issues.append(checks.Warning(
+			'Cache default tidak dibagi antar worker: token versi tracker.user_cache tidak sampai ke worker lain.',
+			hint='Gunakan FileBasedCache (CACHE_DIR) atau Redis (REDIS_URL).', id='tracker.W004',
+		))
+	database = settings.DATABASES['default']
+	options = database.get('OPTIONS', {})
+	if database['ENGINE'] == 'django.db.backends.sqlite3':
+		if not options.get('timeout') or options.get('transaction_mode') != 'IMMEDIATE':
+			issues.append(checks.Warning(
+				'SQLite tanpa busy timeout/BEGIN IMMEDIATE: tulis serentak gagal dengan "database is locked".',
+				hint="Atur OPTIONS 'timeout' dan 'transaction_mode': 'IMMEDIATE'.", id='tracker.W005',
+			))
+	elif database['ENGINE'] == 'django.db.backends.postgresql' and not database.get('CONN_MAX_AGE') and 'pool' not in options:
+		issues.append(checks.Warning(
+			'PostgreSQL tanpa pool dan tanpa koneksi persisten: koneksi baru di setiap request.',
+			hint='Aktifkan DB_POOL=true atau CONN_MAX_AGE > 0.', id='tracker.W006',
+		))
+	if 'Manifest' not in settings.STORAGES.get('staticfiles', {}).get('BACKEND', ''):
+		issues.append(checks.Warning(
+			'Static files tanpa nama ber-hash: CSS (termasuk gaya grafik) tidak di-cache browser sebagai immutable.',
+			hint='Gunakan whitenoise.storage.CompressedManifestStaticFilesStorage.', id='tracker.W008',
+		))
+	if settings.PROFILE_SAMPLE_RATE > 0.05:
+		issues.append(checks.Warning(
+			f'PROFILE_SAMPLE_RATE={settings.PROFILE_SAMPLE_RATE}: cProfile memperlambat request terpilih berkali lipat.',
+			hint='Gunakan sampling <= 0.05 atau ?_profile=1 untuk staf.', id='tracker.W007',
+		))
+	return issues
+
+
+def enforce_on_startup():
+	"""Log semua temuan; temuan level Error (hanya dengan PERF_CHECK_STRICT) menolak boot."""
+	issues = performance_checks()
+	for issue in issues:
+		logger.log(logging.ERROR if issue.is_serious() else logging.WARNING, '%s: %s (%s)', issue.id, issue.msg, issue.hint)
+	errors = [issue for issue in issues if issue.is_serious()]
+	if errors:
+		raise ImproperlyConfigured(
+			'Pengaturan production merugikan performa: ' + '; '.join(f'{issue.id} {issue.msg}' for issue in errors)
+			+ ' (PERF_CHECK_STRICT=false untuk tetap menjalankan)'
+		)
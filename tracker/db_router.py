@@ -0,0 +1,73 @@
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Pembacaan berat (laporan, saldo, ekspor) bisa diarahkan ke alias `replica`:
+# replika streaming PostgreSQL (DATABASE_REPLICA_URL) atau salinan SQLite lokal
+# yang disegarkan `python manage.py refresh_replica` (SQLITE_REPLICA=true).
+# Di luar blok `read_from_replica()` semua query tetap ke database utama.
+
+REPLICA_ALIAS = 'replica'
+RETRY_AFTER_SECONDS = 30
+
+_read_alias = ContextVar('tracker_read_alias', default=None)
+_replica_down_until = 0.0
+
+
+def replica_available() -> bool:
+	"""True bila alias replica dikonfigurasi dan bisa dihubungi; gagal -> jeda sebelum dicoba lagi."""
+	global _replica_down_until
+	if REPLICA_ALIAS not in settings.DATABASES or time.monotonic() < _replica_down_until:
+		return False
+	try:
+		connections[REPLICA_ALIAS].ensure_connection()
+	except DatabaseError:
+		logger.warning('Database replica tidak tersedia, kembali ke primary', exc_info=True)
+		_replica_down_until = time.monotonic() + RETRY_AFTER_SECONDS
+		return False
+	return True
+
+
+@contextmanager
+def read_from_replica(enabled: bool = True):
+	alias = REPLICA_ALIAS if enabled and replica_available() else None
+	token = _read_alias.set(alias)
+	try:
+		yield alias
+	finally:
+		_read_alias.reset(token)
+
+
+@asynccontextmanager
+async def aread_from_replica(enabled: bool = True):
+	# Versi view async: pemeriksaan koneksi replica dijalankan di thread
+	alias = REPLICA_ALIAS if enabled and await sync_to_async(replica_available)() else None
+	token = _read_alias.set(alias)
+	try:
+		yield alias
+	finally:
+		_read_alias.reset(token)
+
+
+class ReadReplicaRouter:
+	def db_for_read(self, model, **hints):
+		return _read_alias.get()
+
+	def db_for_write(self, model, **hints):
+		return 'default'
+
+	def allow_relation(self, obj1, obj2, **hints):
+		# Replica berisi data yang sama dengan primary
+		return True
+
+	def allow_migrate(self, db, app_label, model_name=None, **hints):
+		if db == REPLICA_ALIAS:
+			return False
+		return None
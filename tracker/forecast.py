@@ -0,0 +1,44 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from .models import TransactionType
+from .recurrence import RecurrenceRule, add_months, days_in_month
+
+
+def month_starts(start: date, months: int):
+	return [date(*add_months(start.year, start.month, i), 1) for i in range(months)]
+
+
+def project_balances(accounts, templates, today: date, months: int):
+	"""Proyeksi saldo per akun per bulan dari template transaksi berulang.
+
+	`accounts` sebaiknya dari `Account.objects.with_balance()` dan `templates` semua
+	template aktif; keduanya dimuat sekali lalu diekspansi di memori tanpa menulis
+	transaksi proyeksi ke database.
+	"""
+	buckets = month_starts(today.replace(day=1), months)
+	last_bucket = buckets[-1]
+	horizon = date(last_bucket.year, last_bucket.month, days_in_month(last_bucket.year, last_bucket.month))
+	bucket_index = {(b.year, b.month): i for i, b in enumerate(buckets)}
+
+	# flows[account_id][bucket] = [income, expense]
+	flows = defaultdict(lambda: [[Decimal('0'), Decimal('0')] for _ in buckets])
+	for template in templates:
+		rule = RecurrenceRule.from_template(template)
+		amount = Decimal(template.amount)
+		column = 0 if template.type == TransactionType.INCOME else 1
+		for occurrence in rule.occurrences(template.next_date, horizon):
+			# Kejadian yang sudah lewat tapi belum digenerate masuk ke bulan berjalan
+			index = bucket_index.get((occurrence.year, occurrence.month), 0)
+			flows[template.account_id][index][column] += amount
+
+	projection = []
+	for account in accounts:
+		balance = Decimal(account.current_balance)
+		rows = []
+		for bucket, (income, expense) in zip(buckets, flows[account.id]):
+			balance += income - expense
+			rows.append({'month': bucket, 'income': income, 'expense': expense, 'net': income - expense, 'balance': balance})
+		projection.append({'account': account, 'start_balance': Decimal(account.current_balance), 'rows': rows})
+	return projection
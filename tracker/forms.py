@@ -0,0 +1,15 @@
+from django import forms
+
+from .health_metrics import METRIC_LIMITS
+
+
+class HealthMetricsForm(forms.Form):
+	# Metrik opsional form log kesehatan; batasnya mengikuti kolom HealthLog
+	minutes = forms.IntegerField(required=False, min_value=0, max_value=METRIC_LIMITS['minutes'])
+	sets = forms.IntegerField(required=False, min_value=0, max_value=METRIC_LIMITS['sets'])
+	reps = forms.IntegerField(required=False, min_value=0, max_value=METRIC_LIMITS['reps'])
+	distance_km = forms.DecimalField(required=False, min_value=0, max_value=METRIC_LIMITS['distance_km'], max_digits=7, decimal_places=2)
+
+	def __init__(self, data):
+		# Desimal boleh memakai koma (5,2 km)
+		super().__init__({field: str(data.get(field) or '').strip().replace(',', '.') for field in self.base_fields})
@@ -0,0 +1,117 @@
+import re
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, F, IntegerField, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .archive import ranged
+from .models import HealthLog, ArchivedHealthLog
+
+# Parser teks bebas HealthLog.duration_or_sets -> metrik numerik.
+# Contoh: "30 menit", "1h30m", "1:05:00", "3x12", "4 set x 10 rep", "5,2 km", "800 meter".
+# Satuan "m" berarti menit (sama seperti tampilan log belajar "(30m)"); jarak memakai km/meter.
+
+METRIC_FIELDS = ('minutes', 'sets', 'reps', 'distance_km')
+# Nilai terbesar yang muat di kolom HealthLog (PositiveIntegerField, PositiveSmallIntegerField, DecimalField(7, 2))
+METRIC_LIMITS = {'minutes': 2147483647, 'sets': 32767, 'reps': 2147483647, 'distance_km': Decimal('99999.99')}
+
+_NUM = r'(\d+(?:\.\d+)?)'
+_END = r'(?![a-z])'
+_PATTERNS = (
+	('clock', re.compile(r'(\d+):(\d{2}):(\d{2})')),
+	('sets_reps', re.compile(r'(\d+)\s*(?:sets?|seri)?\s*(?:[x×*]|sets?\s+of|@)\s*(\d+)\s*(?:reps?|repetisi|kali)?' + _END)),
+	('km', re.compile(_NUM + r'\s*(?:km|kilometers?)' + _END)),
+	('meter', re.compile(_NUM + r'\s*(?:meters?|mtr)' + _END)),
+	('hours', re.compile(_NUM + r'\s*(?:jam|hours?|hrs?|h)' + _END)),
+	('minutes', re.compile(_NUM + r'\s*(?:menit|mnt|minutes?|mins?|m)' + _END)),
+	('seconds', re.compile(_NUM + r'\s*(?:detik|dtk|seconds?|secs?|s)' + _END)),
+	('sets', re.compile(r'(\d+)\s*(?:sets?|seri)' + _END)),
+	('reps', re.compile(r'(\d+)\s*(?:reps?|repetisi|kali)' + _END)),
+)
+
+
+def parse_metrics(text: str) -> dict:
+	"""Ambil metrik dari teks; hanya kunci yang ditemukan yang dikembalikan."""
+	text = re.sub(r'(\d),(\d)', r'\1.\2', (text or '').lower())
+	seconds = Decimal('0')
+	has_time = False
+	result = {}
+	for name, pattern in _PATTERNS:
+		for match in pattern.finditer(text):
+			values = match.groups()
+			if name == 'clock':
+				h, m, s = (int(v) for v in values)
+				seconds += h * 3600 + m * 60 + s
+				has_time = True
+			elif name == 'sets_reps':
+				result['sets'], result['reps'] = int(values[0]), int(values[1])
+			elif name == 'km':
+				result['distance_km'] = result.get('distance_km', Decimal('0')) + Decimal(values[0])
+			elif name == 'meter':
+				result['distance_km'] = result.get('distance_km', Decimal('0')) + Decimal(values[0]) / 1000
+			elif name in ('hours', 'minutes', 'seconds'):
+				seconds += Decimal(values[0]) * {'hours': 3600, 'minutes': 60, 'seconds': 1}[name]
+				has_time = True
+			elif name not in result:
+				result[name] = int(values[0])
+		# Bagian yang sudah cocok dihapus agar tidak terbaca ulang oleh pola berikutnya
+		text = pattern.sub(' ', text)
+	if has_time:
+		result['minutes'] = int((seconds / 60).to_integral_value())
+	if 'distance_km' in result:
+		result['distance_km'] = result['distance_km'].quantize(Decimal('0.01'))
+	# Angka di luar batas kolom (salah ketik) dibuang, bukan disimpan
+	return {field: value for field, value in result.items() if value <= METRIC_LIMITS[field]}
+
+
+def backfill_metrics(batch_size: int = 500) -> int:
+	"""Parse ulang log yang belum punya metrik, per batch berdasarkan pk."""
+	updated = 0
+	for model in (HealthLog, ArchivedHealthLog):
+		update_fields = list(METRIC_FIELDS) + (['updated_at'] if model is HealthLog else [])
+		pending = model.objects.exclude(duration_or_sets='').filter(**{f'{field}__isnull': True for field in METRIC_FIELDS})
+		last_pk = 0
+		while True:
+			batch = list(pending.filter(pk__gt=last_pk).order_by('pk').only('id', 'duration_or_sets', *METRIC_FIELDS)[:batch_size])
+			if not batch:
+				break
+			last_pk = batch[-1].pk
+			changed = []
+			for log in batch:
+				parsed = parse_metrics(log.duration_or_sets)
+				if parsed:
+					for field, value in parsed.items():
+						setattr(log, field, value)
+					log.updated_at = timezone.now()
+					changed.append(log)
+			model.objects.bulk_update(changed, update_fields)
+			updated += len(changed)
+	return updated
+
+
+PERIODS = {'week': TruncWeek, 'month': TruncMonth}
+
+
+def training_volume(user, start, end, period: str = 'week'):
+	"""Volume latihan per minggu/bulan: satu query GROUP BY per tabel (aktif, plus arsip bila perlu)."""
+	trunc = PERIODS[period]
+	buckets = defaultdict(lambda: {'minutes': 0, 'sets': 0, 'reps': 0, 'distance_km': Decimal('0'), 'sessions': 0})
+	for qs in ranged(HealthLog, start, end, user=user):
+		rows = qs.annotate(period=trunc('date')).values('period').annotate(
+			total_minutes=Sum('minutes'),
+			total_sets=Sum('sets'),
+			# Total repetisi = set x repetisi per set (tanpa set dianggap satu set)
+			total_reps=Sum(Coalesce('sets', Value(1), output_field=IntegerField()) * F('reps')),
+			total_distance=Sum('distance_km'),
+			sessions=Count('id'),
+		).order_by()
+		for row in rows:
+			bucket = buckets[row['period']]
+			bucket['minutes'] += row['total_minutes'] or 0
+			bucket['sets'] += row['total_sets'] or 0
+			bucket['reps'] += row['total_reps'] or 0
+			bucket['distance_km'] += row['total_distance'] or 0
+			bucket['sessions'] += row['sessions']
+	return [{'period': key, **values} for key, values in sorted(buckets.items())]
@@ -0,0 +1,216 @@
+import csv
+import hashlib
+import json
+import re
+from collections import Counter
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from .models import TransactionType
+
+# Parser mutasi rekening. Setiap parser menerima bytes file dan menghasilkan
+# dict dengan kunci: date, type, amount (positif), category, note, external_id.
+# Tambahkan format baru dengan @register_parser('kode').
+
+PARSERS = {}
+
+QIF_DATE_FORMATS = ('%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d', "%d/%m'%y", "%m/%d'%y", '%d-%m-%Y', '%d.%m.%Y')
+
+
+class ImportParseError(ValueError):
+	pass
+
+
+def register_parser(code: str):
+	def register(cls):
+		cls.code = code
+		PARSERS[code] = cls
+		return cls
+	return register
+
+
+def detect_format(filename: str) -> str:
+	name = (filename or '').lower()
+	if name.endswith(('.ofx', '.qfx')):
+		return 'ofx'
+	if name.endswith('.qif'):
+		return 'qif'
+	if name.endswith(('.jsonl', '.ndjson')):
+		return 'jsonl'
+	return 'csv'
+
+
+def parse_amount(value, decimal_comma: bool = False):
+	text = str(value if value is not None else '').strip().replace(' ', '').replace('Rp', '')
+	if not text:
+		return None
+	if decimal_comma:
+		text = text.replace('.', '').replace(',', '.')
+	else:
+		text = text.replace(',', '')
+	if text.startswith('(') and text.endswith(')'):
+		text = '-' + text[1:-1]
+	try:
+		return Decimal(text)
+	except InvalidOperation:
+		return None
+
+
+def _parse_date(value, formats):
+	text = (value or '').strip()
+	for fmt in formats:
+		try:
+			return datetime.strptime(text, fmt).date()
+		except ValueError:
+			continue
+	return None
+
+
+def _row(tx_date, signed_amount, category='', note='', external_id='', type_=None):
+	if type_ not in TransactionType.values:
+		type_ = TransactionType.EXPENSE if signed_amount < 0 else TransactionType.INCOME
+	return {
+		'date': tx_date,
+		'type': type_,
+		'amount': abs(signed_amount),
+		'category': (category or '').strip()[:100],
+		'note': (note or '').strip()[:255],
+		'external_id': (external_id or '').strip(),
+	}
+
+
+class StatementParser:
+	code = ''
+
+	def __init__(self, profile=None):
+		self.profile = profile
+
+	def parse(self, data: bytes):
+		raise NotImplementedError
+
+	@staticmethod
+	def decode(data: bytes) -> str:
+		try:
+			return data.decode('utf-8-sig')
+		except UnicodeDecodeError:
+			return data.decode('latin-1')
+
+
+@register_parser('csv')
+class CSVParser(StatementParser):
+	"""CSV dengan pemetaan kolom dari ImportProfile (default: format ekspor aplikasi ini)."""
+
+	def parse(self, data: bytes):
+		p = self.profile
+		delimiter = (p.delimiter if p else ',') or ','
+		date_formats = (p.date_format,) if p and p.date_format else ('%Y-%m-%d',)
+		decimal_comma = bool(p and p.decimal_comma)
+		reader = csv.DictReader(self.decode(data).splitlines(), delimiter=delimiter)
+		for record in reader:
+			get = lambda column: (record.get(column) or '') if column else ''
+			tx_date = _parse_date(get(p.date_column if p else 'date'), date_formats)
+			if p and (p.debit_column or p.credit_column):
+				debit = parse_amount(get(p.debit_column), decimal_comma) or Decimal('0')
+				credit = parse_amount(get(p.credit_column), decimal_comma) or Decimal('0')
+				signed = credit - abs(debit)
+				type_ = None
+			else:
+				amount = parse_amount(get(p.amount_column if p else 'amount'), decimal_comma)
+				if amount is None:
+					continue
+				raw_type = get(p.type_column if p else 'type').strip()
+				if p and p.type_column:
+					type_ = TransactionType.INCOME if raw_type.upper() in [v.strip().upper() for v in p.income_values.split(',')] else TransactionType.EXPENSE
+				else:
+					type_ = raw_type
+				signed = amount
+			if tx_date is None or not signed:
+				continue
+			yield _row(tx_date, signed, get(p.category_column if p else 'category'), get(p.note_column if p else 'note'), type_=type_)
+
+
+@register_parser('ofx')
+class OFXParser(StatementParser):
+	"""OFX 1.x (SGML) maupun 2.x (XML): cukup membaca blok <STMTTRN>."""
+
+	_block = re.compile(r'<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|</BANKTRANLIST>)', re.S | re.I)
+	_tag = re.compile(r'<(\w+)>([^<\r\n]*)')
+
+	def parse(self, data: bytes):
+		text = self.decode(data)
+		for block in self._block.findall(text):
+			fields = {tag.upper(): value.strip() for tag, value in self._tag.findall(block)}
+			tx_date = _parse_date(fields.get('DTPOSTED', '')[:8], ('%Y%m%d',))
+			amount = parse_amount(fields.get('TRNAMT'))
+			if tx_date is None or not amount:
+				continue
+			note = ' '.join(v for v in (fields.get('NAME', ''), fields.get('MEMO', '')) if v)
+			yield _row(tx_date, amount, note=note, external_id=fields.get('FITID', ''))
+
+
+@register_parser('qif')
+class QIFParser(StatementParser):
+	def parse(self, data: bytes):
+		formats = (self.profile.date_format,) if self.profile and self.profile.date_format else QIF_DATE_FORMATS
+		record = {}
+		for line in self.decode(data).splitlines():
+			line = line.strip()
+			if not line or line.startswith('!'):
+				continue
+			if line == '^':
+				row = self._finish(record, formats)
+				if row:
+					yield row
+				record = {}
+				continue
+			record.setdefault(line[0], line[1:].strip())
+		row = self._finish(record, formats)
+		if row:
+			yield row
+
+	@staticmethod
+	def _finish(record, formats):
+		tx_date = _parse_date(record.get('D', ''), formats)
+		amount = parse_amount(record.get('T') or record.get('U'))
+		if tx_date is None or not amount:
+			return None
+		note = ' '.join(v for v in (record.get('P', ''), record.get('M', '')) if v)
+		return _row(tx_date, amount, category=record.get('L', ''), note=note, external_id=record.get('N', ''))
+
+
+@register_parser('jsonl')
+class JSONLinesParser(StatementParser):
+	"""Satu objek JSON per baris: date, amount (bertanda bila tanpa type), type, category, note, id."""
+
+	def parse(self, data: bytes):
+		for number, line in enumerate(self.decode(data).splitlines(), 1):
+			if not line.strip():
+				continue
+			try:
+				obj = json.loads(line)
+				tx_date = date.fromisoformat(str(obj.get('date', ''))[:10])
+			except (ValueError, AttributeError) as exc:
+				raise ImportParseError(f'Baris {number} bukan JSON transaksi yang valid') from exc
+			amount = parse_amount(obj.get('amount'))
+			if not amount:
+				continue
+			yield _row(tx_date, amount, obj.get('category', ''), obj.get('note', ''), str(obj.get('id', '') or ''), type_=obj.get('type'))
+
+
+def fingerprint_rows(rows):
+	"""Tambahkan `fingerprint` stabil ke setiap baris.
+
+	Pakai ID dari bank (FITID) bila ada; jika tidak, hash isi baris ditambah urutan
+	kemunculannya di file, sehingga dua transaksi identik yang sah tetap tersimpan
+	dan impor ulang file yang sama memetakan ke fingerprint yang sama.
+	"""
+	seen = Counter()
+	for row in rows:
+		if row['external_id']:
+			basis = f"id|{row['external_id']}"
+		else:
+			content = f"{row['date'].isoformat()}|{row['type']}|{row['amount']:.2f}|{row['note'].lower()}"
+			seen[content] += 1
+			basis = f"row|{content}|{seen[content]}"
+		row['fingerprint'] = hashlib.sha256(basis.encode('utf-8')).hexdigest()
+		yield row
@@ -0,0 +1,244 @@
+import csv
+import io
+import tempfile
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from . import analytics_export
+from .archive import archive_before, archive_cutoff, default_cutoff
+from .categories import resolve_ids
+from .db_router import read_from_replica
+from .importers import PARSERS, ImportParseError, fingerprint_rows
+from .jobs import PermanentJobError, job_handler
+from .models import Account, Transaction, ArchivedTransaction, Saving, ImportProfile, SavingsGoal, DailyTask, RecurringTransaction, RecurringTask, LiveEventKind
+from .recurrence import RecurrenceRule
+from . import balance_history, live
+from .user_cache import invalidate
+
+BATCH_SIZE = 500
+
+
+def _csv_rows(job):
+	return list(csv.DictReader(bytes(job.input_data or b'').decode('utf-8-sig').splitlines()))
+
+
+def _parse_row_date(value):
+	try:
+		return date.fromisoformat((value or '').strip())
+	except ValueError:
+		return None
+
+
+def _parse_row_amount(value):
+	try:
+		return Decimal((value or '').strip())
+	except InvalidOperation:
+		return None
+
+
+def _write_csv(job, filename, header, rows):
+	buffer = io.StringIO()
+	writer = csv.writer(buffer)
+	writer.writerow(header)
+	count = 0
+	for row in rows:
+		writer.writerow(row)
+		count += 1
+		if count % 5000 == 0:
+			job.report_progress(count)
+	job.output_data = buffer.getvalue().encode('utf-8')
+	job.output_name = filename
+	job.report_progress(count, count)
+	return count
+
+
+@job_handler('import_transactions')
+def import_transactions(job):
+	account = Account.objects.get(id=job.payload['account_id'], user_id=job.user_id)
+	profile = ImportProfile.objects.filter(id=job.payload.get('profile_id'), user_id=job.user_id).first() if job.payload.get('profile_id') else None
+	parser = PARSERS[job.payload.get('format') or 'csv'](profile)
+	# FITID ganda dalam satu file dianggap satu transaksi
+	try:
+		rows = list({r['fingerprint']: r for r in fingerprint_rows(parser.parse(bytes(job.input_data or b'')))}.values())
+	except ImportParseError as exc:
+		raise PermanentJobError(str(exc)) from exc
+	job.report_progress(0, len(rows))
+	cutoff = archive_cutoff()
+	created = 0
+	# Satu transaksi DB + upsert berbasis indeks unik (user, account, fingerprint):
+	# impor ulang tidak menggandakan baris dan percobaan ulang job aman.
+	with transaction.atomic():
+		for start in range(0, len(rows), BATCH_SIZE):
+			batch = rows[start:start + BATCH_SIZE]
+			existing = set(Transaction.objects.filter(account=account, fingerprint__in=[r['fingerprint'] for r in batch]).values_list('fingerprint', flat=True))
+			old_fingerprints = [r['fingerprint'] for r in batch if cutoff and r['date'] < cutoff]
+			archived = set(ArchivedTransaction.objects.filter(account=account, fingerprint__in=old_fingerprints).values_list('fingerprint', flat=True)) if old_fingerprints else set()
+			existing |= archived
+			# bulk_create melewati Transaction.save: kategori di-resolve sekali per teks
+			category_ids = resolve_ids(account.user_id, [r['category'] for r in batch])
+			Transaction.objects.bulk_create(
+				[Transaction(user_id=account.user_id, account=account, date=r['date'], type=r['type'], amount=r['amount'], category=r['category'], category_ref_id=category_ids[r['category']], note=r['note'], fingerprint=r['fingerprint']) for r in batch if r['fingerprint'] not in archived],
+				update_conflicts=True,
+				unique_fields=['user', 'account', 'fingerprint'],
+				update_fields=['date', 'type', 'amount', 'updated_at'],
+			)
+			created += len(batch) - len(existing)
+			job.report_progress(start + len(batch))
+	# Upsert massal tanpa sinyal: riwayat saldo akun dihitung ulang
+	balance_history.invalidate(account.id)
+	live.publish_balances(account.user_id, [account.id])
+	job.result = {'created': created, 'existing': len(rows) - created, 'message': f'Impor transaksi: {created} baris baru, {len(rows) - created} sudah ada'}
+
+
+@job_handler('import_savings_csv')
+def import_savings_csv(job):
+	account = Account.objects.get(id=job.payload['account_id'], user_id=job.user_id)
+	rows = _csv_rows(job)
+	job.report_progress(0, len(rows))
+	goals = {goal.name: goal for goal in SavingsGoal.objects.filter(user_id=account.user_id)}
+	new_savings = []
+	for row in rows:
+		sv_date = _parse_row_date(row.get('date'))
+		amount = _parse_row_amount(row.get('amount'))
+		if sv_date and amount is not None:
+			goal = goals.get(row.get('goal') or '')
+			new_savings.append(Saving(user_id=account.user_id, account=account, date=sv_date, amount=amount, goal=goal, goal_name=row.get('goal_name') or '', note=row.get('note') or ''))
+	with transaction.atomic():
+		for start in range(0, len(new_savings), BATCH_SIZE):
+			Saving.objects.bulk_create(new_savings[start:start + BATCH_SIZE])
+			job.report_progress(min(start + BATCH_SIZE, len(new_savings)))
+	job.report_progress(len(rows))
+	# bulk_create tidak mengirim sinyal: total tujuan tabungan di cache perlu dimuat ulang
+	invalidate(account.user_id)
+	balance_history.invalidate(account.id)
+	live.publish_balances(account.user_id, [account.id])
+	job.result = {'created': len(new_savings), 'skipped': len(rows) - len(new_savings), 'message': f'Impor tabungan: {len(new_savings)} baris ditambahkan'}
+
+
+@job_handler('export_transactions_csv')
+def export_transactions_csv(job):
+	qs = Transaction.objects.filter(user_id=job.user_id).order_by('date', 'id')
+	if job.payload.get('account_id'):
+		qs = qs.filter(account_id=job.payload['account_id'])
+	# Ekspor dibaca dari replica, kecuali diminta tepat setelah pengguna menulis data
+	with read_from_replica(not job.payload.get('primary')):
+		job.report_progress(0, qs.count())
+		rows = qs.values_list('date', 'account__name', 'type', 'amount', 'category', 'note').iterator(chunk_size=2000)
+		count = _write_csv(job, 'transactions.csv', ['date', 'account', 'type', 'amount', 'category', 'note'], rows)
+	job.result = {'rows': count, 'message': f'Ekspor transaksi: {count} baris'}
+
+
+@job_handler('export_savings_csv')
+def export_savings_csv(job):
+	qs = Saving.objects.filter(user_id=job.user_id).order_by('date', 'id')
+	if job.payload.get('account_id'):
+		qs = qs.filter(account_id=job.payload['account_id'])
+	with read_from_replica(not job.payload.get('primary')):
+		job.report_progress(0, qs.count())
+		rows = qs.values_list('date', 'account__name', 'amount', 'goal__name', 'goal_name', 'note').iterator(chunk_size=2000)
+		count = _write_csv(job, 'savings.csv', ['date', 'account', 'amount', 'goal', 'goal_name', 'note'], ((d, a, amt, g or '', gn, n) for d, a, amt, g, gn, n in rows))
+	job.result = {'rows': count, 'message': f'Ekspor tabungan: {count} baris'}
+
+
+@job_handler('export_analytics')
+def export_analytics(job):
+	# Zip kolumnar (Parquet/NDJSON, lihat tracker/analytics_export.py) milik pengguna job
+	try:
+		fmt = analytics_export.available_format(job.payload.get('format') or 'auto')
+	except ValueError as exc:
+		raise PermanentJobError(str(exc)) from exc
+	done = {}
+
+	def progress(name, rows):
+		# Satu UPDATE progres per chunk
+		done[name] = rows
+		job.report_progress(sum(done.values()))
+
+	job.output_name = f'analytics-{timezone.localdate():%Y%m%d}-{fmt}.zip'
+	# Zip ditulis ke file sementara di disk lalu disalin per chunk ke storage: ukuran
+	# ekspor tidak dibatasi memori worker maupun kolom database
+	with tempfile.TemporaryFile() as out:
+		with read_from_replica(not job.payload.get('primary')):
+			job.report_progress(0, analytics_export.total_rows(job.user_id))
+			counts = analytics_export.write_archive(out, fmt, user_id=job.user_id, progress=progress)
+		out.seek(0)
+		if job.output_file:
+			job.output_file.delete(save=False)
+		job.output_file.save(job.output_name, File(out), save=False)
+	total = sum(counts.values())
+	job.report_progress(total, total)
+	job.result = {'rows': total, 'format': fmt, 'message': f'Ekspor analitik ({fmt}): {total} baris'}
+
+
+def _owned(qs, job):
+	# Job tanpa pemilik (dijalankan sistem) memproses template semua pengguna
+	return qs.filter(user_id=job.user_id) if job.user_id else qs
+
+
+def _expand_templates(templates, today, build):
+	created = []
+	now = timezone.now()
+	for template in templates:
+		rule = RecurrenceRule.from_template(template)
+		before = (template.next_date, template.is_active)
+		last = None
+		for occurrence in rule.occurrences(template.next_date, today):
+			created.append(build(template, occurrence))
+			last = occurrence
+		if last is not None:
+			template.next_date = rule.advance(last)
+		template.is_active = not rule.is_finished(template.next_date)
+		# bulk_update tidak memicu auto_now; tanpa ini snapshot inkremental melewatkan template
+		if (template.next_date, template.is_active) != before:
+			template.updated_at = now
+	return created
+
+
+@job_handler('generate_recurring_finance')
+def generate_recurring_finance(job):
+	today = timezone.localdate()
+	recurs = list(_owned(RecurringTransaction.objects.filter(is_active=True, next_date__lte=today), job))
+	job.report_progress(0, len(recurs))
+	new_transactions = _expand_templates(recurs, today, lambda r, d: Transaction(
+		user_id=r.user_id, account_id=r.account_id, date=d, type=r.type, amount=r.amount, category=r.category, category_ref_id=r.category_ref_id, note=r.note,
+	))
+	with transaction.atomic():
+		Transaction.objects.bulk_create(new_transactions, batch_size=BATCH_SIZE)
+		RecurringTransaction.objects.bulk_update(recurs, ['next_date', 'is_active', 'updated_at'], batch_size=BATCH_SIZE)
+		first_dates = {}
+		for tr in new_transactions:
+			first_dates[tr.account_id] = min(tr.date, first_dates.get(tr.account_id, tr.date))
+		for account_id, first in first_dates.items():
+			balance_history.invalidate(account_id, first)
+		live.publish_many([(tr.user_id, LiveEventKind.TRANSACTION, live.transaction_payload(tr)) for tr in new_transactions])
+		for user_id, account_id in {(tr.user_id, tr.account_id) for tr in new_transactions}:
+			live.publish_balances(user_id, [account_id])
+	job.report_progress(len(recurs))
+	job.result = {'created': len(new_transactions), 'message': f'Recurring transaksi digenerate: {len(new_transactions)}'}
+
+
+@job_handler('generate_recurring_tasks')
+def generate_recurring_tasks(job):
+	today = timezone.localdate()
+	recurs = list(_owned(RecurringTask.objects.filter(is_active=True, next_date__lte=today), job))
+	job.report_progress(0, len(recurs))
+	new_tasks = _expand_templates(recurs, today, lambda r, d: DailyTask(
+		user_id=r.user_id, date=d, category=r.category, title=r.title, description=r.description,
+	))
+	with transaction.atomic():
+		DailyTask.objects.bulk_create(new_tasks, batch_size=BATCH_SIZE)
+		RecurringTask.objects.bulk_update(recurs, ['next_date', 'is_active', 'updated_at'], batch_size=BATCH_SIZE)
+		live.publish_many([(task.user_id, LiveEventKind.TASK, live.task_payload(task)) for task in new_tasks])
+	job.report_progress(len(recurs))
+	job.result = {'created': len(new_tasks), 'message': f'Recurring tugas digenerate: {len(new_tasks)}'}
+
+
+@job_handler('archive_data')
+def archive_data(job):
+	cutoff = date.fromisoformat(job.payload['cutoff']) if job.payload.get('cutoff') else default_cutoff()
+	counts = archive_before(cutoff)
+	job.result = {'counts': counts, 'message': f'Arsip s.d. {cutoff}: {sum(counts.values())} baris dipindahkan'}
@@ -0,0 +1,118 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Antrian job sederhana yang disimpan di database utama. Handler didaftarkan
+# dengan @job_handler('nama') (lihat tracker/job_handlers.py) dan dijalankan
+# oleh `python manage.py run_worker`.
+
+HANDLERS = {}
+
+
+class PermanentJobError(Exception):
+	# Kesalahan input: job langsung FAILED tanpa dicoba ulang
+	pass
+
+
+def job_handler(kind: str):
+	def register(func):
+		HANDLERS[kind] = func
+		return func
+	return register
+
+
+def enqueue(kind: str, payload: dict = None, input_data: bytes = None, max_attempts: int = 3, user=None) -> Job:
+	# `user`: pemilik job; handler membatasi data yang dibaca/ditulis ke pengguna ini
+	if kind not in HANDLERS:
+		raise ValueError(f'Job handler tidak dikenal: {kind}')
+	job = Job.objects.create(kind=kind, payload=payload or {}, input_data=input_data, max_attempts=max_attempts, user=user)
+	if getattr(settings, 'JOBS_EAGER', False):
+		# Mode tanpa worker (development): jalankan langsung di request
+		Job.objects.filter(pk=job.pk).update(status=JobStatus.RUNNING, locked_at=timezone.now(), attempts=F('attempts') + 1)
+		job.refresh_from_db()
+		run_job(job)
+	return job
+
+
+def claim_next():
+	"""Ambil satu job PENDING secara atomik; aman dipakai beberapa worker sekaligus."""
+	now = timezone.now()
+	candidates = Job.objects.filter(status=JobStatus.PENDING, run_after__lte=now).order_by('run_after', 'id').values_list('id', flat=True)[:10]
+	for job_id in candidates:
+		claimed = Job.objects.filter(id=job_id, status=JobStatus.PENDING).update(
+			status=JobStatus.RUNNING, locked_at=now, attempts=F('attempts') + 1, updated_at=now
+		)
+		if claimed:
+			return Job.objects.get(id=job_id)
+	return None
+
+
+def _retry_delay(attempts: int) -> timedelta:
+	return timedelta(seconds=min(30 * 2 ** (attempts - 1), 3600))
+
+
+def run_job(job: Job):
+	handler = HANDLERS.get(job.kind)
+	try:
+		if handler is None:
+			raise ValueError(f'Job handler tidak dikenal: {job.kind}')
+		handler(job)
+	except Exception as exc:
+		job.error = traceback.format_exc()
+		if job.attempts < job.max_attempts and not isinstance(exc, PermanentJobError):
+			job.status = JobStatus.PENDING
+			job.run_after = timezone.now() + _retry_delay(job.attempts)
+			logger.warning('Job #%s (%s) gagal, dicoba lagi (percobaan %s/%s)', job.pk, job.kind, job.attempts, job.max_attempts)
+		else:
+			job.status = JobStatus.FAILED
+			job.finished_at = timezone.now()
+			logger.error('Job #%s (%s) gagal permanen', job.pk, job.kind)
+		job.locked_at = None
+		job.save(update_fields=['status', 'run_after', 'error', 'locked_at', 'finished_at', 'updated_at'])
+		return job
+	job.status = JobStatus.DONE
+	job.finished_at = timezone.now()
+	job.locked_at = None
+	job.error = ''
+	job.save()
+	return job
+
+
+def requeue_stale(timeout: timedelta) -> int:
+	"""Kembalikan job RUNNING yang workernya mati (terkunci terlalu lama) ke antrian.
+
+	Job yang workernya mati pada percobaan terakhir ditandai FAILED.
+	"""
+	now = timezone.now()
+	stale = Job.objects.filter(status=JobStatus.RUNNING, locked_at__lt=now - timeout)
+	requeued = stale.filter(attempts__lt=F('max_attempts')).update(status=JobStatus.PENDING, locked_at=None, updated_at=now)
+	failed = stale.filter(attempts__gte=F('max_attempts')).update(
+		status=JobStatus.FAILED, locked_at=None, finished_at=now, updated_at=now,
+		error=f'Worker berhenti saat percobaan terakhir (terkunci lebih dari {timeout})',
+	)
+	if failed:
+		logger.error('%s job gagal permanen: worker berhenti saat percobaan terakhir', failed)
+	return requeued
+
+
+def purge_finished(older_than: timedelta) -> int:
+	cutoff = timezone.now() - older_than
+	deleted, _ = Job.objects.filter(status__in=[JobStatus.DONE, JobStatus.FAILED], finished_at__lt=cutoff).delete()
+	return deleted
+
+
+@receiver(post_delete, sender=Job)
+def _delete_output_file(sender, instance, **kwargs):
+	# File hasil ikut dihapus bersama job (purge_finished, admin)
+	if instance.output_file:
+		instance.output_file.delete(save=False)
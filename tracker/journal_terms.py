@@ -0,0 +1,138 @@
+import re
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import MindfulnessLog, ArchivedMindfulnessLog, JournalField, JournalTerm
+
+# Indeks frekuensi kata untuk jurnal (MindfulnessLog). Setiap simpan/hapus hanya
+# menghitung selisih kata entri itu, jadi halaman tema tidak perlu membaca ulang
+# seluruh jurnal.
+
+FIELDS = JournalField.values
+MIN_LENGTH = 3
+APPLY_ATTEMPTS = 3
+
+STOPWORDS = frozenset('''
+ada adalah agar akan aku anda antara apa apakah atau bagi bahwa banyak baru bisa belum
+bukan dalam dan dapat dari dengan di dia hal hanya hari harus ini itu jadi jika
+juga kalau kami kamu karena ke kita lagi lebih maka masih mau melakukan mereka
+nya oleh pada para perlu saat saja sama sangat satu saya sebagai sebuah sedang sekali
+sendiri seperti setelah sudah supaya tapi tetapi tidak untuk waktu yaitu yang
+about after again all also and any are because been but can could did does for from had
+has have her his how into its just more not now our out she should than that the their
+them then there they this too very was were what when which who will with would you your
+'''.split())
+
+_WORD = re.compile(r'[^\W\d_]+(?:-[^\W\d_]+)*')
+
+
+def tokenize(text: str) -> Counter:
+	words = (w for w in _WORD.findall((text or '').casefold()) if len(w) >= MIN_LENGTH and w not in STOPWORDS)
+	return Counter(w[:64] for w in words)
+
+
+def entry_terms(entry) -> Counter:
+	"""Counter dengan kunci (user, bulan, kolom, kata) untuk satu entri jurnal."""
+	# View membuat entri dengan tanggal berupa string 'YYYY-MM-DD'
+	month = MindfulnessLog._meta.get_field('date').to_python(entry.date).replace(day=1)
+	counts = Counter()
+	for field in FIELDS:
+		for term, n in tokenize(getattr(entry, field)).items():
+			counts[(entry.user_id, month, field, term)] += n
+	return counts
+
+
+def apply_delta(delta: Counter):
+	"""Tambahkan selisih hitungan ke JournalTerm: satu SELECT, lalu bulk update/create/delete."""
+	delta = {key: n for key, n in delta.items() if n}
+	if not delta:
+		return
+	for attempt in range(1, APPLY_ATTEMPTS + 1):
+		try:
+			_apply_once(delta)
+			return
+		except IntegrityError:
+			# Entri lain menyisipkan kata yang sama lebih dulu (uniq_journal_term): ulangi,
+			# kali ini baris tersebut terbaca dan dikunci oleh select_for_update
+			if attempt == APPLY_ATTEMPTS:
+				raise
+
+
+def _apply_once(delta: dict):
+	users = {user_id for user_id, _, _, _ in delta}
+	months = {month for _, month, _, _ in delta}
+	terms = {term for _, _, _, term in delta}
+	with transaction.atomic():
+		existing = {
+			(row.user_id, row.month, row.field, row.term): row
+			for row in JournalTerm.objects.select_for_update().filter(user_id__in=users, month__in=months, term__in=terms)
+		}
+		to_create, to_update, to_delete = [], [], []
+		for key, n in delta.items():
+			row = existing.get(key)
+			if row is None:
+				if n > 0:
+					to_create.append(JournalTerm(user_id=key[0], month=key[1], field=key[2], term=key[3], count=n))
+				continue
+			row.count = max(row.count + n, 0)
+			(to_update if row.count else to_delete).append(row)
+		JournalTerm.objects.bulk_create(to_create)
+		JournalTerm.objects.bulk_update(to_update, ['count'])
+		if to_delete:
+			JournalTerm.objects.filter(pk__in=[row.pk for row in to_delete]).delete()
+
+
+@receiver(pre_save, sender=MindfulnessLog)
+def _remember_old_terms(sender, instance, raw=False, **kwargs):
+	# Isi lama dibaca sekali sebelum disimpan supaya post_save cukup menerapkan selisihnya
+	instance._old_terms = Counter()
+	if instance.pk and not raw:
+		old = sender.objects.filter(pk=instance.pk).only('user_id', 'date', *FIELDS).first()
+		if old is not None:
+			instance._old_terms = entry_terms(old)
+
+
+@receiver(post_save, sender=MindfulnessLog)
+def _index_saved_entry(sender, instance, raw=False, **kwargs):
+	if raw:
+		return
+	delta = entry_terms(instance)
+	delta.subtract(getattr(instance, '_old_terms', Counter()))
+	apply_delta(delta)
+
+
+@receiver(post_delete, sender=MindfulnessLog)
+def _unindex_deleted_entry(sender, instance, **kwargs):
+	delta = Counter()
+	delta.subtract(entry_terms(instance))
+	apply_delta(delta)
+
+
+def rebuild_index(batch_size: int = 1000) -> int:
+	"""Bangun ulang seluruh indeks dari tabel aktif dan arsip (untuk data lama atau perbaikan)."""
+	counts = Counter()
+	for model in (MindfulnessLog, ArchivedMindfulnessLog):
+		for entry in model.objects.only('user_id', 'date', *FIELDS).iterator(chunk_size=batch_size):
+			counts.update(entry_terms(entry))
+	with transaction.atomic():
+		JournalTerm.objects.all().delete()
+		JournalTerm.objects.bulk_create(
+			(JournalTerm(user_id=user_id, month=month, field=field, term=term, count=n) for (user_id, month, field, term), n in counts.items()),
+			batch_size=batch_size,
+		)
+	return len(counts)
+
+
+def top_terms(user, start_month, end_month, limit: int = 10, field: str = None):
+	"""Kata teratas per (bulan, kolom) dalam satu query dengan ROW_NUMBER() OVER (PARTITION BY ...)."""
+	qs = JournalTerm.objects.filter(user=user, month__gte=start_month, month__lte=end_month)
+	if field:
+		qs = qs.filter(field=field)
+	return qs.annotate(
+		rank=Window(RowNumber(), partition_by=[F('month'), F('field')], order_by=[F('count').desc(), F('term').asc()]),
+	).filter(rank__lte=limit).order_by('-month', 'field', 'rank').values('month', 'field', 'term', 'count')
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Account, DailyTask, LiveEvent, LiveEventKind, Saving, Transaction, WaterIntake
+
+# Pembaruan live (server-sent events). Sinyal model menulis event kecil ke tabel
+# LiveEvent setelah commit; stream tiap klien membaca event miliknya dengan
+# id > Last-Event-ID lewat indeks (user, id). Tabel dipakai sebagai broadcaster
+# supaya event dari worker gunicorn mana pun (dan dari run_worker) sampai ke
+# semua perangkat. Stream async disajikan lewat dailyprogress/asgi.py. Di WSGI tidak
+# ada stream: tiap request menjawab event yang sudah ada lalu ditutup, dan EventSource
+# menyambung ulang setelah `retry` (polling berinterval, tanpa menahan thread).
+
+BATCH_SIZE = 100
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000
+
+
+def _primary():
+	# Event dan saldo selalu dari primary: replica tertinggal membuat klien melewatkan event
+	return router.db_for_write(LiveEvent)
+
+
+def publish_many(events):
+	"""Simpan event [(user_id, kind, payload)] setelah commit dengan satu INSERT."""
+	events = [LiveEvent(user_id=user_id, kind=kind, payload=payload) for user_id, kind, payload in events]
+	if events:
+		transaction.on_commit(lambda: LiveEvent.objects.using(_primary()).bulk_create(events))
+
+
+def publish(user_id, kind, payload):
+	publish_many([(user_id, kind, payload)])
+
+
+def publish_balances(user_id, account_ids):
+	# Saldo dihitung saat event dibaca, jadi cukup kirim id akun
+	publish_many([(user_id, LiveEventKind.BALANCE, {'account_id': account_id}) for account_id in set(account_ids)])
+
+
+def latest_id(user) -> int:
+	"""Id event terakhir milik pengguna: titik mulai stream untuk halaman yang baru dirender."""
+	return LiveEvent.objects.using(_primary()).filter(user=user).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def purge_events(keep: timedelta) -> int:
+	deleted, _ = LiveEvent.objects.using(_primary()).filter(created_at__lt=timezone.now() - keep).delete()
+	return deleted
+
+
+def _field(instance, name):
+	# View menyimpan tanggal/nominal apa adanya dari POST (string)
+	return type(instance)._meta.get_field(name).to_python(getattr(instance, name))
+
+
+def _money(value) -> str:
+	# Format sama dengan yang dirender template (dua desimal)
+	return f'{Decimal(str(value)):.2f}'
+
+
+def task_payload(task, deleted=False) -> dict:
+	return {
+		'id': task.pk, 'date': _field(task, 'date').isoformat(), 'category': task.category,
+		'title': task.title, 'is_completed': task.is_completed, 'deleted': deleted,
+	}
+
+
+def transaction_payload(tr, deleted=False) -> dict:
+	return {
+		'id': tr.pk, 'account_id': tr.account_id, 'date': _field(tr, 'date').isoformat(), 'type': tr.type,
+		'amount': _money(_field(tr, 'amount')), 'category': tr.category, 'deleted': deleted,
+	}
+
+
+def poll(user_id, after_id: int, release: bool = True) -> tuple:
+	"""Event baru milik pengguna setelah `after_id`: (id terakhir, [(id, kind, data)]).
+
+	`release` menutup koneksi setelahnya, untuk stream yang menunggu lama di antara poll.
+	"""
+	alias = _primary()
+	try:
+		rows = list(
+			LiveEvent.objects.using(alias).filter(user_id=user_id, id__gt=after_id)
+			.order_by('id').values_list('id', 'kind', 'payload')[:BATCH_SIZE]
+		)
+		if not rows:
+			return after_id, []
+		# Beberapa event saldo untuk akun yang sama cukup dikirim sekali (yang terakhir)
+		last_balance = {payload['account_id']: event_id for event_id, kind, payload in rows if kind == LiveEventKind.BALANCE}
+		balances = {
+			account.pk: account for account in
+			Account.objects.using(alias).filter(user_id=user_id, pk__in=last_balance).with_balance()
+		} if last_balance else {}
+		events = []
+		for event_id, kind, payload in rows:
+			if kind == LiveEventKind.BALANCE:
+				account = balances.get(payload['account_id'])
+				if account is None or last_balance[account.pk] != event_id:
+					continue
+				payload = {'account_id': account.pk, 'name': account.name, 'balance': _money(account.current_balance)}
+			events.append((event_id, kind, payload))
+		return rows[-1][0], events
+	finally:
+		# Jangan tahan koneksi (atau slot pool) selama stream menunggu
+		if release:
+			connections[alias].close()
+
+
+def _frame(event_id, kind, payload) -> bytes:
+	return f'id: {event_id}\nevent: {kind}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n'.encode()
+
+
+def _frames(events) -> bytes:
+	return b''.join(_frame(*event) for event in events)
+
+
+async def stream(user_id, after_id: int, lifetime: float):
+	"""Stream SSE async (ASGI): polling tabel event tanpa memblokir event loop."""
+	yield f'retry: {RETRY_MS}\n\n'.encode()
+	deadline = time.monotonic() + lifetime
+	last_sent = time.monotonic()
+	while time.monotonic() < deadline:
+		after_id, events = await sync_to_async(poll)(user_id, after_id)
+		if events:
+			yield _frames(events)
+			last_sent = time.monotonic()
+		elif time.monotonic() - last_sent >= HEARTBEAT_SECONDS:
+			yield b': ping\n\n'
+			last_sent = time.monotonic()
+		await asyncio.sleep(settings.LIVE_POLL_SECONDS)
+
+
+def poll_once(user_id, after_id: int, retry_seconds: float) -> bytes:
+	"""Jawaban WSGI: event yang sudah ada, lalu klien menyambung ulang setelah `retry_seconds`."""
+	# Koneksi mengikuti siklus request biasa (CONN_MAX_AGE), tidak ditutup di sini
+	_, events = poll(user_id, after_id, release=False)
+	return f'retry: {int(retry_seconds * 1000)}\n\n'.encode() + _frames(events)
+
+
+@receiver(post_save, sender=DailyTask)
+@receiver(post_delete, sender=DailyTask)
+def _task_changed(sender, instance, raw=False, **kwargs):
+	if not raw:
+		publish(instance.user_id, LiveEventKind.TASK, task_payload(instance, deleted=kwargs['signal'] is post_delete))
+
+
+@receiver(post_save, sender=WaterIntake)
+def _water_changed(sender, instance, raw=False, **kwargs):
+	if not raw:
+		publish(instance.user_id, LiveEventKind.WATER, {'date': _field(instance, 'date').isoformat(), 'glasses': instance.glasses})
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def _transaction_changed(sender, instance, raw=False, **kwargs):
+	if raw:
+		return
+	# Akun lama dicatat oleh pre_save di balance_history (transaksi dipindah ke akun lain)
+	old = getattr(instance, '_old_flow', None)
+	accounts = {instance.account_id, old[0]} if old else {instance.account_id}
+	publish_many(
+		[(instance.user_id, LiveEventKind.TRANSACTION, transaction_payload(instance, deleted=kwargs['signal'] is post_delete))]
+		+ [(instance.user_id, LiveEventKind.BALANCE, {'account_id': account_id}) for account_id in accounts]
+	)
+
+
+@receiver(post_save, sender=Saving)
+@receiver(post_delete, sender=Saving)
+def _saving_changed(sender, instance, raw=False, **kwargs):
+	if not raw:
+		old = getattr(instance, '_old_flow', None)
+		publish_balances(instance.user_id, [instance.account_id] + ([old[0]] if old else []))
+
+
+@receiver(post_save, sender=Account)
+def _account_changed(sender, instance, raw=False, **kwargs):
+	# Saldo awal bisa diubah dari admin
+	if not raw:
+		publish_balances(instance.user_id, [instance.pk])
@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tracker.archive import ARCHIVES, archive_before
+
+
+class Command(BaseCommand):
+	help = 'Memindahkan log & transaksi yang lebih tua dari horizon ke tabel arsip'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--days', type=int, default=None, help=f'Horizon dalam hari (default ARCHIVE_HORIZON_DAYS={settings.ARCHIVE_HORIZON_DAYS})')
+		parser.add_argument('--before', help='Cutoff eksplisit YYYY-MM-DD (mengabaikan --days)')
+		parser.add_argument('--batch-size', type=int, default=2000)
+		parser.add_argument('--dry-run', action='store_true', help='Hanya hitung baris yang akan diarsipkan')
+
+	def handle(self, *args, **options):
+		if options['before']:
+			try:
+				cutoff = date.fromisoformat(options['before'])
+			except ValueError as exc:
+				raise CommandError('Format --before harus YYYY-MM-DD') from exc
+		else:
+			days = settings.ARCHIVE_HORIZON_DAYS if options['days'] is None else options['days']
+			cutoff = timezone.localdate() - timedelta(days=days)
+		if options['dry_run']:
+			for model in ARCHIVES:
+				self.stdout.write(f'{model._meta.model_name}: {model.objects.filter(date__lt=cutoff).count()}')
+			return
+		counts = archive_before(cutoff, options['batch_size'])
+		for name, moved in counts.items():
+			self.stdout.write(f'{name}: {moved} baris diarsipkan')
+		self.stdout.write(self.style.SUCCESS(f'Arsip selesai, cutoff {cutoff}'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tracker.health_metrics import backfill_metrics
+
+
+class Command(BaseCommand):
+	help = 'Mengisi metrik numerik HealthLog (menit, set, repetisi, jarak) dari teks duration_or_sets'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--batch-size', type=int, default=500)
+
+	def handle(self, *args, **options):
+		updated = backfill_metrics(options['batch_size'])
+		self.stdout.write(self.style.SUCCESS(f'{updated} log kesehatan diperbarui'))
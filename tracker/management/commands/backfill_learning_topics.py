@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from tracker.models import LearningLog, ArchivedLearningLog
+from tracker.topics import backfill_topics
+
+
+class Command(BaseCommand):
+	help = 'Mengisi topik ternormalisasi (topic_ref) untuk log belajar yang belum punya'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--dry-run', action='store_true', help='Hanya hitung log yang belum punya topik')
+
+	def handle(self, *args, **options):
+		if options['dry_run']:
+			for model in (LearningLog, ArchivedLearningLog):
+				pending = model.objects.filter(topic_ref__isnull=True)
+				self.stdout.write(f'{model._meta.model_name}: {pending.count()} log, {pending.values("topic").distinct().count()} teks topik')
+			return
+		updated = backfill_topics()
+		self.stdout.write(self.style.SUCCESS(f'{updated} log belajar dihubungkan ke topik'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from tracker.categories import CATEGORIZED_MODELS, backfill_categories
+
+
+class Command(BaseCommand):
+	help = 'Mengisi kategori ternormalisasi (category_ref) untuk transaksi yang belum punya'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--dry-run', action='store_true', help='Hanya hitung baris yang belum punya kategori')
+		parser.add_argument('--batch-size', type=int, default=500, help='Jumlah teks kategori yang dibaca per batch')
+
+	def handle(self, *args, **options):
+		if options['dry_run']:
+			for model in CATEGORIZED_MODELS:
+				pending = model.objects.filter(category_ref__isnull=True).exclude(category='')
+				self.stdout.write(f'{model._meta.model_name}: {pending.count()} baris, {pending.values("user_id", "category").distinct().count()} teks kategori')
+			return
+		updated = backfill_categories(options['batch_size'])
+		self.stdout.write(self.style.SUCCESS(f'{updated} baris dihubungkan ke kategori'))
@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.analytics_export import CHUNK_SIZE, DATASETS, FORMATS, available_format, write_archive
+
+
+class Command(BaseCommand):
+	help = 'Ekspor massal transaksi, tabungan, log belajar & kesehatan ke zip kolumnar (Parquet bila pyarrow terpasang, selain itu NDJSON)'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--output', required=True, help='Path file zip tujuan')
+		parser.add_argument('--user', help='Username; tanpa ini semua pengguna diekspor')
+		parser.add_argument('--format', choices=('auto',) + FORMATS, default='auto')
+		parser.add_argument('--dataset', action='append', choices=list(DATASETS), help='Dataset yang diekspor (boleh diulang); default semua')
+		parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Jumlah baris yang dibaca per chunk')
+
+	def handle(self, *args, **options):
+		user_id = None
+		if options['user']:
+			User = get_user_model()
+			user_id = User.objects.filter(**{User.USERNAME_FIELD: options['user']}).values_list('pk', flat=True).first()
+			if user_id is None:
+				raise CommandError(f'Pengguna tidak ditemukan: {options["user"]}')
+		try:
+			fmt = available_format(options['format'])
+		except ValueError as exc:
+			raise CommandError(str(exc)) from exc
+		with open(options['output'], 'wb') as out:
+			counts = write_archive(out, fmt, user_id=user_id, datasets=options['dataset'], chunk_size=options['chunk_size'])
+		for name, rows in counts.items():
+			self.stdout.write(f'{name}: {rows} baris')
+		self.stdout.write(self.style.SUCCESS(f'Ekspor {fmt} ditulis ke {options["output"]}'))
@@ -0,0 +1,380 @@
+import http.client
+import json
+import os
+import random
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count, Sum
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from tracker.models import Account, DailyTask, TaskCategory, Transaction, WaterIntake
+
+# Uji beban tulis serentak: menjalankan gunicorn persis seperti baris `web` di
+# Procfile (gunicorn.conf.py) terhadap database SQLite sementara, lalu banyak klien
+# (thread, koneksi keep-alive) mengirim campuran baca dan quick-add. Beberapa klien
+# memakai pengguna yang sama, seperti satu orang dengan ponsel dan laptop.
+# Setelah selesai, isi database dibandingkan dengan jumlah tulis yang dijawab
+# sukses untuk menghitung lost update.
+
+ALIAS = 'loadtest'
+DEFAULT_MIX = 'dashboard=3,saldo=1,transaction=3,water=2,toggle=2'
+# Status yang dianggap sukses per operasi (tulis dijawab redirect)
+OPERATIONS = {'dashboard': 200, 'saldo': 200, 'transaction': 302, 'water': 302, 'toggle': 302}
+READY_TIMEOUT = 30
+REQUEST_TIMEOUT = 30
+LOCK_MARKER = b'database is locked'
+# Hanya request ini yang boleh dikirim ulang setelah koneksi putus
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+
+def _parse_mix(value: str) -> dict:
+	mix = {}
+	for part in value.split(','):
+		name, _, weight = part.partition('=')
+		name = name.strip()
+		if name not in OPERATIONS:
+			raise CommandError(f'Operasi tidak dikenal: {name} (pilihan: {", ".join(OPERATIONS)})')
+		try:
+			mix[name] = int(weight or 1)
+		except ValueError:
+			raise CommandError(f'Bobot tidak valid untuk {name}: {weight}')
+	if not any(mix.values()):
+		raise CommandError('Campuran operasi kosong')
+	return mix
+
+
+def _percentile(sorted_values, pct):
+	if not sorted_values:
+		return 0.0
+	index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+	return round(sorted_values[index], 1)
+
+
+def _latency_summary(latencies) -> dict:
+	latencies = sorted(seconds * 1000 for seconds in latencies)
+	return {
+		'p50_ms': _percentile(latencies, 50),
+		'p90_ms': _percentile(latencies, 90),
+		'p99_ms': _percentile(latencies, 99),
+		'max_ms': round(latencies[-1], 1) if latencies else 0.0,
+	}
+
+
+class UnconfirmedWrite(Exception):
+	"""POST sudah terkirim tetapi jawabannya tidak diterima: mungkin sudah tersimpan, jadi tidak diulang."""
+
+
+class LoadClient:
+	"""Satu perangkat: sesi login, token CSRF dan koneksi keep-alive ke gunicorn."""
+
+	def __init__(self, port, user_id, session_key, tasks):
+		self.port = port
+		self.user_id = user_id
+		self.tasks = tasks
+		# Token CSRF (cookie + header) cukup 32 karakter alfanumerik acak
+		self.csrf = get_random_string(32)
+		self.cookie = f'{settings.SESSION_COOKIE_NAME}={session_key}; {settings.CSRF_COOKIE_NAME}={self.csrf}'
+		self.conn = None
+
+	def request(self, method, path, fields=None):
+		headers = {'Cookie': self.cookie, 'Host': f'127.0.0.1:{self.port}'}
+		body = None
+		if method == 'POST':
+			body = urlencode(fields or {})
+			headers['Content-Type'] = 'application/x-www-form-urlencoded'
+			headers['X-CSRFToken'] = self.csrf
+		for attempt in range(2):
+			if self.conn is None:
+				self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=REQUEST_TIMEOUT)
+			sent = False
+			try:
+				self.conn.request(method, path, body=body, headers=headers)
+				sent = True
+				response = self.conn.getresponse()
+				return response.status, response.read()
+			except (http.client.HTTPException, OSError) as exc:
+				# Keep-alive ditutup worker (max_requests/keepalive habis): sambung ulang sekali.
+				# Tulis yang sudah terkirim tidak diulang supaya hitungan lost update tetap jujur.
+				self.conn.close()
+				self.conn = None
+				if sent and method not in IDEMPOTENT_METHODS:
+					raise UnconfirmedWrite(f'{method} {path}') from exc
+				if attempt:
+					raise
+
+	def perform(self, name, rng):
+		"""Jalankan satu operasi; kembalikan (status, body, id tugas untuk toggle)."""
+		if name == 'dashboard':
+			return (*self.request('GET', '/'), None)
+		if name == 'saldo':
+			return (*self.request('GET', '/saldo'), None)
+		if name == 'transaction':
+			return (*self.request('POST', '/finance/transaction/add', {
+				'date': timezone.localdate().isoformat(), 'type': rng.choice(['INCOME', 'EXPENSE']),
+				'amount': rng.randint(1, 500) * 1000, 'category': 'loadtest',
+			}), None)
+		if name == 'water':
+			return (*self.request('POST', '/water/add'), None)
+		task_id = rng.choice(self.tasks)
+		return (*self.request('POST', f'/tasks/{task_id}/toggle'), task_id)
+
+
+class Command(BaseCommand):
+	help = 'Uji beban: gunicorn (konfigurasi Procfile) + SQLite sementara, klien serentak baca/quick-add; laporan throughput, latensi, error lock dan lost update'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--clients', type=int, default=20, help='Jumlah klien serentak')
+		parser.add_argument('--users', type=int, default=2, help='Jumlah pengguna; klien dibagi rata (beberapa perangkat per pengguna)')
+		parser.add_argument('--tasks', type=int, default=5, help='Tugas hari ini per pengguna (target toggle)')
+		parser.add_argument('--duration', type=float, default=15.0, help='Lama uji (detik)')
+		parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Bobot operasi, mis. "{DEFAULT_MIX}"')
+		parser.add_argument('--workers', type=int, help='WEB_CONCURRENCY untuk gunicorn (default: gunicorn.conf.py)')
+		parser.add_argument('--threads', type=int, help='GUNICORN_THREADS untuk gunicorn (default: gunicorn.conf.py)')
+		parser.add_argument('--asgi', action='store_true', help='Jalankan dengan GUNICORN_ASGI=true')
+		parser.add_argument('--env', choices=['development', 'production'], help='DJANGO_ENV untuk gunicorn (default: profil proses ini; production butuh collectstatic)')
+		parser.add_argument('--port', type=int, default=8765)
+		parser.add_argument('--database', help='File SQLite untuk uji (default: file sementara)')
+		parser.add_argument('--seed', type=int, default=1)
+		parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+
+	def handle(self, *args, **options):
+		mix = _parse_mix(options['mix'])
+		if options['clients'] < 1 or options['users'] < 1 or options['tasks'] < 1:
+			raise CommandError('--clients, --users dan --tasks minimal 1')
+		workdir = Path(tempfile.mkdtemp(prefix='progresharian-loadtest-'))
+		db_path = Path(options['database']).resolve() if options['database'] else workdir / 'loadtest.sqlite3'
+		self._use_database(db_path)
+		clients = self._prepare(options)
+		log_path = workdir / 'gunicorn.log'
+		server = self._start_server(db_path, workdir, log_path, options)
+		try:
+			self._wait_ready(options['port'], server, log_path)
+			started = time.monotonic()
+			results = self._run(clients, mix, options)
+			elapsed = time.monotonic() - started
+		finally:
+			server.terminate()
+			try:
+				server.wait(timeout=30)
+			except subprocess.TimeoutExpired:
+				server.kill()
+		report = self._report(results, elapsed, clients, log_path)
+		report['database'] = str(db_path)
+		report['log'] = str(log_path)
+		if options['json']:
+			self.stdout.write(json.dumps(report, indent=2))
+		else:
+			self._print(report)
+
+	def _use_database(self, db_path):
+		# Alias tambahan khusus uji: database proyek tidak pernah disentuh
+		configured = connections.configure_settings({
+			'default': settings.DATABASES['default'],
+			ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(db_path)},
+		})
+		connections.settings[ALIAS] = configured[ALIAS]
+		call_command('migrate', database=ALIAS, verbosity=0)
+
+	def _prepare(self, options):
+		User = get_user_model()
+		today = timezone.localdate()
+		stamp = get_random_string(6).lower()
+		users = []
+		for n in range(options['users']):
+			user = User.objects.db_manager(ALIAS).create_user(f'loadtest-{stamp}-{n}')
+			# bulk_create: tanpa sinyal (event live/cache akan menulis ke database default)
+			Account.objects.using(ALIAS).bulk_create([Account(user=user, name='Dompet Utama', initial_balance=0)])
+			tasks = DailyTask.objects.using(ALIAS).bulk_create([
+				DailyTask(user=user, date=today, category=TaskCategory.DAILY, title=f'Tugas uji {i + 1}') for i in range(options['tasks'])
+			])
+			users.append((user, [task.pk for task in tasks]))
+		clients = []
+		for n in range(options['clients']):
+			user, tasks = users[n % len(users)]
+			session_key = get_random_string(32, 'abcdefghijklmnopqrstuvwxyz0123456789')
+			data = {SESSION_KEY: str(user.pk), BACKEND_SESSION_KEY: 'django.contrib.auth.backends.ModelBackend', HASH_SESSION_KEY: user.get_session_auth_hash()}
+			Session.objects.using(ALIAS).create(session_key=session_key, session_data=SessionStore().encode(data), expire_date=timezone.now() + timedelta(days=1))
+			clients.append(LoadClient(options['port'], user.pk, session_key, tasks))
+		return clients
+
+	def _start_server(self, db_path, workdir, log_path, options):
+		command = self._procfile_web()
+		# Tanpa replica/Redis: uji hanya mengenai gunicorn + satu file SQLite
+		env = {key: value for key, value in os.environ.items() if key not in ('DATABASE_URL', 'DATABASE_REPLICA_URL', 'SQLITE_REPLICA', 'REDIS_URL')}
+		env.update({
+			'DATABASE_URL': f'sqlite:///{db_path}',
+			'PORT': str(options['port']),
+			'CACHE_DIR': str(workdir / 'cache'),
+			'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'dailyprogress.settings'),
+			'DJANGO_ENV': options['env'] or settings.ENVIRONMENT,
+		})
+		if options['workers']:
+			env['WEB_CONCURRENCY'] = str(options['workers'])
+		if options['threads']:
+			env['GUNICORN_THREADS'] = str(options['threads'])
+		if options['asgi']:
+			env['GUNICORN_ASGI'] = 'true'
+		self.stderr.write(f'Menjalankan {shlex.join(command)} (log: {log_path})')
+		with open(log_path, 'wb') as log:
+			return subprocess.Popen(command, cwd=settings.BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+	@staticmethod
+	def _procfile_web():
+		procfile = Path(settings.BASE_DIR) / 'Procfile'
+		for line in procfile.read_text().splitlines():
+			name, _, command = line.partition(':')
+			if name.strip() == 'web':
+				return shlex.split(command)
+		raise CommandError(f'Baris "web" tidak ada di {procfile}')
+
+	@staticmethod
+	def _wait_ready(port, server, log_path):
+		deadline = time.monotonic() + READY_TIMEOUT
+		while time.monotonic() < deadline:
+			if server.poll() is not None:
+				raise CommandError(f'gunicorn berhenti (kode {server.returncode}); lihat {log_path}')
+			try:
+				conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+				conn.request('GET', '/accounts/login/', headers={'Host': f'127.0.0.1:{port}'})
+				if conn.getresponse().status == 200:
+					return
+			except OSError:
+				pass
+			finally:
+				conn.close()
+			time.sleep(0.2)
+		raise CommandError(f'gunicorn tidak siap dalam {READY_TIMEOUT} detik; lihat {log_path}')
+
+	@staticmethod
+	def _run(clients, mix, options):
+		names = list(mix)
+		weights = [mix[name] for name in names]
+		deadline = time.monotonic() + options['duration']
+		results = [[] for _ in clients]
+
+		def work(index, client):
+			rng = random.Random(options['seed'] * 1000 + index)
+			while time.monotonic() < deadline:
+				name = rng.choices(names, weights)[0]
+				began = time.perf_counter()
+				unconfirmed = False
+				try:
+					status, body, task_id = client.perform(name, rng)
+				except UnconfirmedWrite:
+					status, body, task_id, unconfirmed = 0, b'', None, True
+				except (http.client.HTTPException, OSError):
+					status, body, task_id = 0, b'', None
+				# (operasi, pengguna, status, detik, sukses, error lock, tugas, tulis tanpa jawaban)
+				results[index].append((name, client.user_id, status, time.perf_counter() - began, status == OPERATIONS[name], LOCK_MARKER in body, task_id, unconfirmed))
+
+		threads = [threading.Thread(target=work, args=(i, client), daemon=True) for i, client in enumerate(clients)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		return [row for rows in results for row in rows]
+
+	def _report(self, results, elapsed, clients, log_path):
+		by_op = defaultdict(list)
+		for row in results:
+			by_op[row[0]].append(row)
+		operations = {
+			name: {
+				'requests': len(rows),
+				'ok': sum(row[4] for row in rows),
+				'errors': sum(not row[4] for row in rows),
+				'lock_errors': sum(row[5] for row in rows),
+				'unconfirmed': sum(row[7] for row in rows),
+				'statuses': {str(status): n for status, n in sorted(Counter(row[2] for row in rows).items())},
+				**_latency_summary(row[3] for row in rows),
+			}
+			for name, rows in sorted(by_op.items())
+		}
+		return {
+			'clients': len(clients),
+			'users': len({client.user_id for client in clients}),
+			'seconds': round(elapsed, 2),
+			'requests': len(results),
+			'throughput_rps': round(len(results) / elapsed, 1) if elapsed else 0.0,
+			'errors': sum(not row[4] for row in results),
+			'lock_errors': sum(row[5] for row in results),
+			# POST yang terkirim tanpa jawaban: bisa tersimpan atau tidak, jadi lost update
+			# bisa meleset sebanyak ini (ke arah negatif)
+			'unconfirmed_writes': sum(row[7] for row in results),
+			# Dengan DEBUG=false body 500 tidak menyebut penyebabnya; log gunicorn tetap mencatatnya
+			'lock_errors_in_log': log_path.read_bytes().count(LOCK_MARKER) if log_path.exists() else 0,
+			**_latency_summary(row[3] for row in results),
+			'operations': operations,
+			'lost_updates': self._lost_updates(results, clients),
+		}
+
+	@staticmethod
+	def _lost_updates(results, clients):
+		"""Selisih antara tulis yang dijawab sukses dan isi database (positif = hilang)."""
+		water, transactions, toggles = Counter(), Counter(), Counter()
+		for name, user_id, _, _, ok, _, task_id, _ in results:
+			if not ok:
+				continue
+			if name == 'water':
+				water[user_id] += 1
+			elif name == 'transaction':
+				transactions[user_id] += 1
+			elif name == 'toggle':
+				toggles[task_id] += 1
+		user_ids = {client.user_id for client in clients}
+		task_ids = {task_id for client in clients for task_id in client.tasks}
+		stored_water = dict(WaterIntake.objects.using(ALIAS).filter(user_id__in=user_ids).values_list('user_id').annotate(Sum('glasses')).order_by())
+		stored_transactions = dict(Transaction.objects.using(ALIAS).filter(user_id__in=user_ids).values_list('user_id').annotate(Count('id')).order_by())
+		completed = dict(DailyTask.objects.using(ALIAS).filter(id__in=task_ids).values_list('id', 'is_completed'))
+		return {
+			'water_glasses': sum(water.values()) - sum(stored_water.values()),
+			'transactions': sum(transactions.values()) - sum(stored_transactions.values()),
+			# Toggle membalik status: jumlah toggle ganjil harus berakhir selesai. Status
+			# yang tidak cocok berarti minimal satu toggle tertimpa.
+			'toggled_tasks_wrong_state': sum(completed.get(task_id) != bool(toggles[task_id] % 2) for task_id in task_ids),
+			'expected': {'water_glasses': sum(water.values()), 'transactions': sum(transactions.values()), 'toggles': sum(toggles.values())},
+		}
+
+	def _print(self, report):
+		self.stdout.write(
+			f"{report['requests']} request dari {report['clients']} klien ({report['users']} pengguna) dalam {report['seconds']} detik: "
+			f"{report['throughput_rps']} req/detik"
+		)
+		self.stdout.write(
+			f"Latensi p50 {report['p50_ms']} ms, p90 {report['p90_ms']} ms, p99 {report['p99_ms']} ms, maks {report['max_ms']} ms"
+		)
+		self.stdout.write(
+			f"Error: {report['errors']}, database is locked: {report['lock_errors']} (di log gunicorn: {report['lock_errors_in_log']}), "
+			f"tulis tanpa jawaban: {report['unconfirmed_writes']}"
+		)
+		self.stdout.write(f"{'operasi':<12}{'request':>9}{'ok':>8}{'error':>7}{'lock':>6}{'p50':>9}{'p90':>9}{'p99':>9}  status")
+		for name, op in report['operations'].items():
+			statuses = ', '.join(f'{status}:{n}' for status, n in op['statuses'].items())
+			self.stdout.write(
+				f"{name:<12}{op['requests']:>9}{op['ok']:>8}{op['errors']:>7}{op['lock_errors']:>6}"
+				f"{op['p50_ms']:>9}{op['p90_ms']:>9}{op['p99_ms']:>9}  {statuses}"
+			)
+		lost = report['lost_updates']
+		style = self.style.ERROR if any(v for k, v in lost.items() if k != 'expected') else self.style.SUCCESS
+		self.stdout.write(style(
+			f"Lost update: gelas air {lost['water_glasses']} dari {lost['expected']['water_glasses']}, "
+			f"transaksi {lost['transactions']} dari {lost['expected']['transactions']}, "
+			f"tugas dengan status toggle salah {lost['toggled_tasks_wrong_state']}"
+		))
+		self.stdout.write(f"Database: {report['database']}, log: {report['log']}")
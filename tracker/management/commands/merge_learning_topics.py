@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import LearningTopic
+from tracker.topics import merge_topics
+
+
+class Command(BaseCommand):
+	help = 'Menggabungkan topik belajar (atau ejaan lain) ke satu topik, mis. merge_learning_topics --user budi Python py "python3"'
+
+	def add_arguments(self, parser):
+		parser.add_argument('target', help='Nama atau id topik tujuan')
+		parser.add_argument('--user', required=True, help='Username pemilik topik')
+		parser.add_argument('names', nargs='*', help='Topik/ejaan yang digabung ke tujuan')
+		parser.add_argument('--list', action='store_true', help='Tampilkan topik yang kuncinya mirip (calon penggabungan)')
+
+	def handle(self, *args, **options):
+		user = get_user_model().objects.filter(**{get_user_model().USERNAME_FIELD: options['user']}).first()
+		if user is None:
+			raise CommandError(f'Pengguna tidak ditemukan: {options["user"]}')
+		target = self._find(user, options['target'])
+		if options['list'] or not options['names']:
+			for topic in LearningTopic.objects.filter(user=user, key__contains=target.key).exclude(pk=target.pk):
+				self.stdout.write(f'{topic.pk}\t{topic.name}\t({topic.logs.count()} log)')
+			return
+		result = merge_topics(target, options['names'])
+		self.stdout.write(self.style.SUCCESS(f'{result["moved"]} log dipindah ke "{target.name}", {result["aliases"]} alias baru'))
+
+	@staticmethod
+	def _find(user, value):
+		topic = LearningTopic.objects.filter(user=user, pk=value).first() if value.isdigit() else None
+		topic = topic or LearningTopic.objects.resolve(user.pk, value)
+		if topic is None:
+			raise CommandError(f'Topik tidak valid: {value}')
+		return topic
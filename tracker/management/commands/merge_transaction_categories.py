@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.categories import merge_categories
+from tracker.models import Category
+
+
+class Command(BaseCommand):
+	help = 'Menggabungkan kategori transaksi (atau ejaan lain) ke satu kategori, mis. merge_transaction_categories --user budi Makan "mkn" "makan siang"'
+
+	def add_arguments(self, parser):
+		parser.add_argument('target', help='Nama atau id kategori tujuan')
+		parser.add_argument('--user', required=True, help='Username pemilik kategori')
+		parser.add_argument('names', nargs='*', help='Kategori/ejaan yang digabung ke tujuan')
+		parser.add_argument('--list', action='store_true', help='Tampilkan kategori yang kuncinya mirip (calon penggabungan)')
+
+	def handle(self, *args, **options):
+		user = get_user_model().objects.filter(**{get_user_model().USERNAME_FIELD: options['user']}).first()
+		if user is None:
+			raise CommandError(f'Pengguna tidak ditemukan: {options["user"]}')
+		target = self._find(user, options['target'])
+		if options['list'] or not options['names']:
+			for category in Category.objects.filter(user=user, key__contains=target.key).exclude(pk=target.pk):
+				self.stdout.write(f'{category.pk}\t{category.name}\t({category.transactions.count()} transaksi)')
+			return
+		result = merge_categories(target, options['names'])
+		self.stdout.write(self.style.SUCCESS(f'{result["moved"]} transaksi dipindah ke "{target.name}", {result["aliases"]} alias baru'))
+
+	@staticmethod
+	def _find(user, value):
+		category = Category.objects.filter(user=user, pk=value).first() if value.isdigit() else None
+		category = category or Category.objects.resolve(user.pk, value)
+		if category is None:
+			raise CommandError(f'Kategori tidak valid: {value}')
+		return category
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tracker.journal_terms import rebuild_index
+
+
+class Command(BaseCommand):
+	help = 'Membangun ulang indeks frekuensi kata jurnal (JournalTerm) dari seluruh entri, termasuk arsip'
+
+	def handle(self, *args, **options):
+		terms = rebuild_index()
+		self.stdout.write(self.style.SUCCESS(f'Indeks jurnal dibangun ulang: {terms} kata per bulan/kolom'))
@@ -0,0 +1,38 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+	help = 'Menyalin database SQLite utama ke replica lokal (SQLITE_REPLICA_PATH) dengan backup API SQLite'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--interval', type=int, default=0, help='Ulangi setiap N detik (0 = sekali saja)')
+
+	def handle(self, *args, **options):
+		source = connections['default']
+		if source.vendor != 'sqlite':
+			raise CommandError('refresh_replica hanya untuk SQLite; gunakan replikasi bawaan database (DATABASE_REPLICA_URL)')
+		target = settings.SQLITE_REPLICA_PATH
+		while True:
+			started = time.monotonic()
+			self._copy(source.settings_dict['NAME'], target)
+			self.stdout.write(f'Replica diperbarui: {target} ({time.monotonic() - started:.2f} detik)')
+			if not options['interval']:
+				return
+			time.sleep(options['interval'])
+
+	@staticmethod
+	def _copy(source_path, target):
+		# Backup API menyalin dalam satu transaksi tulis di file tujuan, jadi koneksi
+		# pembaca yang sudah terbuka langsung melihat salinan baru (tidak pernah setengah jadi)
+		src = sqlite3.connect(source_path)
+		dst = sqlite3.connect(target)
+		try:
+			src.backup(dst)
+		finally:
+			dst.close()
+			src.close()
@@ -0,0 +1,55 @@
+import signal
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tracker.jobs import claim_next, run_job, requeue_stale, purge_finished
+from tracker.live import purge_events
+from tracker.offline import purge_replayed
+
+
+class Command(BaseCommand):
+	help = 'Menjalankan worker antrian job (impor, ekspor, generate transaksi/tugas berulang)'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--once', action='store_true', help='Proses job yang tersedia lalu berhenti')
+		parser.add_argument('--sleep', type=float, default=2.0, help='Jeda (detik) saat antrian kosong')
+		parser.add_argument('--stale-minutes', type=int, default=30, help='Job RUNNING lebih lama dari ini dianggap worker mati')
+		parser.add_argument('--keep-days', type=int, default=7, help='Hapus job selesai yang lebih tua dari ini')
+		parser.add_argument('--live-keep-minutes', type=int, default=60, help='Hapus event live yang lebih tua dari ini')
+		parser.add_argument('--offline-keep-days', type=int, default=30, help='Hapus catatan replay antrean offline yang lebih tua dari ini')
+
+	def handle(self, *args, **options):
+		self._stopping = False
+		signal.signal(signal.SIGTERM, self._stop)
+		signal.signal(signal.SIGINT, self._stop)
+		stale = timedelta(minutes=options['stale_minutes'])
+		keep = timedelta(days=options['keep_days'])
+		live_keep = timedelta(minutes=options['live_keep_minutes'])
+		offline_keep = timedelta(days=options['offline_keep_days'])
+		last_maintenance = 0.0
+		self.stdout.write('Worker berjalan')
+		while not self._stopping:
+			close_old_connections()
+			if time.monotonic() - last_maintenance > 60:
+				requeued = requeue_stale(stale)
+				purged = purge_finished(keep)
+				purge_events(live_keep)
+				purge_replayed(offline_keep)
+				if requeued or purged:
+					self.stdout.write(f'Dikembalikan ke antrian: {requeued}, dihapus: {purged}')
+				last_maintenance = time.monotonic()
+			job = claim_next()
+			if job is None:
+				if options['once']:
+					break
+				time.sleep(options['sleep'])
+				continue
+			job = run_job(job)
+			self.stdout.write(f'Job #{job.pk} {job.kind}: {job.status}')
+		self.stdout.write('Worker berhenti')
+
+	def _stop(self, signum, frame):
+		self._stopping = True
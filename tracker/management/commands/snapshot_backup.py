@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from tracker.snapshot import SnapshotError, read_header, write_snapshot
+
+
+class Command(BaseCommand):
+	help = 'Menulis snapshot cadangan (JSON Lines ter-gzip) seluruh model tracker; bisa incremental'
+
+	def add_arguments(self, parser):
+		parser.add_argument('output', help='Path file snapshot, mis. backup-2025-01-01.snap.gz')
+		parser.add_argument('--incremental-from', metavar='SNAPSHOT', help='Hanya baris yang berubah sejak snapshot ini dibuat')
+		parser.add_argument('--chunk-size', type=int, default=2000)
+		parser.add_argument('--include-jobs', action='store_true', help='Ikut sertakan tabel antrian job')
+
+	def handle(self, *args, **options):
+		since = None
+		if options['incremental_from']:
+			try:
+				since = parse_datetime(read_header(options['incremental_from'])['taken_at'])
+			except (OSError, SnapshotError) as exc:
+				raise CommandError(str(exc)) from exc
+		result = write_snapshot(options['output'], since=since, chunk_size=options['chunk_size'], include_jobs=options['include_jobs'])
+		for label, count in result['counts'].items():
+			self.stdout.write(f'{label}: {count} baris')
+		self.stdout.write(self.style.SUCCESS(f'Snapshot {result["kind"]} ditulis ke {options["output"]} ({result["taken_at"]:%Y-%m-%d %H:%M:%S})'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.snapshot import SnapshotError, restore_snapshot
+
+
+class Command(BaseCommand):
+	help = 'Memulihkan snapshot penuh, diikuti snapshot incremental (urut dari yang terlama)'
+
+	def add_arguments(self, parser):
+		parser.add_argument('snapshots', nargs='+', help='Snapshot penuh lalu incremental sesuai urutan')
+		parser.add_argument('--batch-size', type=int, default=2000)
+		parser.add_argument('--database', default=None)
+		parser.add_argument('--noinput', action='store_false', dest='interactive', help='Jangan minta konfirmasi')
+
+	def handle(self, *args, **options):
+		if options['interactive']:
+			answer = input('Seluruh data tracker akan diganti isi snapshot. Lanjutkan? [y/N] ')
+			if answer.strip().lower() not in ('y', 'ya', 'yes'):
+				raise CommandError('Dibatalkan')
+		try:
+			counts = restore_snapshot(options['snapshots'], batch_size=options['batch_size'], using=options['database'])
+		except (OSError, SnapshotError) as exc:
+			raise CommandError(str(exc)) from exc
+		for label, count in counts.items():
+			self.stdout.write(f'{label}: {count} baris')
+		self.stdout.write(self.style.SUCCESS(f'Restore selesai dari {len(options["snapshots"])} snapshot'))
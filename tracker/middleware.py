@@ -0,0 +1,75 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .db_router import REPLICA_ALIAS
+from .profiling import profile_request, wants_profile
+
+# Read-your-writes: setelah request yang menulis (POST dsb.), browser membawa
+# cookie ini selama READ_YOUR_WRITES_SECONDS sehingga halaman berikutnya
+# (mis. redirect ke /saldo) dibaca dari primary, bukan replica yang mungkin tertinggal.
+#
+# Semua middleware di sini bisa sinkron maupun async: di bawah ASGI satu
+# middleware yang hanya sinkron membuat setiap request (termasuk API async di
+# tracker/api.py) memegang satu thread selama request berjalan.
+
+PIN_COOKIE = 'read_primary'
+
+
+def pinned_to_primary(request) -> bool:
+	return PIN_COOKIE in request.COOKIES
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+	def process_response(self, request, response):
+		if request.method not in ('GET', 'HEAD', 'OPTIONS') and REPLICA_ALIAS in settings.DATABASES:
+			response.set_cookie(PIN_COOKIE, '1', max_age=settings.READ_YOUR_WRITES_SECONDS, samesite='Lax', httponly=True)
+		return response
+
+
+class ProfilingMiddleware:
+	# Profil opt-in (tracker/profiling.py): ?_profile=1 untuk staf, atau PROFILE_SAMPLE_RATE.
+	# Dipasang setelah AuthenticationMiddleware supaya request.user tersedia.
+	# Request async tidak diprofil: cProfile hanya melihat thread yang menjalankannya.
+	sync_capable = True
+	async_capable = True
+
+	def __init__(self, get_response):
+		self.get_response = get_response
+		if iscoroutinefunction(get_response):
+			markcoroutinefunction(self)
+
+	def __call__(self, request):
+		if iscoroutinefunction(self):
+			return self.get_response(request)
+		mode = wants_profile(request)
+		if mode is None:
+			return self.get_response(request)
+		return profile_request(request, self.get_response, mode)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+	# WhiteNoiseMiddleware (6.7) hanya sinkron; versi ini melayani static file
+	# di thread dan meneruskan request lain tanpa pindah thread.
+	sync_capable = True
+	async_capable = True
+
+	def __init__(self, get_response=None, settings=settings):
+		super().__init__(get_response, settings)
+		if iscoroutinefunction(get_response):
+			markcoroutinefunction(self)
+
+	def __call__(self, request):
+		if iscoroutinefunction(self):
+			return self.__acall__(request)
+		return super().__call__(request)
+
+	async def __acall__(self, request):
+		if self.autorefresh:
+			static_file = await sync_to_async(self.find_file)(request.path_info)
+		else:
+			static_file = self.files.get(request.path_info)
+		if static_file is not None:
+			return await sync_to_async(self.serve)(static_file, request)
+		return await self.get_response(request)
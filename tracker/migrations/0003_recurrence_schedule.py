@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0002_healthlog_learninglog_mindfulnesslog_savingsgoal_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interval', models.PositiveSmallIntegerField(default=1, help_text='Ulangi setiap N periode')),
+                ('day_of_month', models.PositiveSmallIntegerField(blank=True, help_text='Tanggal jangkar untuk Bulanan/Tahunan', null=True)),
+                ('week_of_month', models.SmallIntegerField(blank=True, help_text='Minggu ke-n (1-4, -1 = terakhir) untuk Hari ke-n Bulanan', null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('category', models.CharField(choices=[('ACADEMIC', 'Akademik'), ('HEALTH', 'Kesehatan'), ('DAILY', 'Harian')], max_length=16)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('frequency', models.CharField(choices=[('DAILY', 'Harian'), ('WEEKLY', 'Mingguan'), ('MONTHLY', 'Bulanan'), ('MONTH_END', 'Akhir Bulan'), ('NTH_WEEKDAY', 'Hari ke-n Bulanan'), ('YEARLY', 'Tahunan')], default='DAILY', max_length=16)),
+                ('next_date', models.DateField(db_index=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RecurringTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interval', models.PositiveSmallIntegerField(default=1, help_text='Ulangi setiap N periode')),
+                ('day_of_month', models.PositiveSmallIntegerField(blank=True, help_text='Tanggal jangkar untuk Bulanan/Tahunan', null=True)),
+                ('week_of_month', models.SmallIntegerField(blank=True, help_text='Minggu ke-n (1-4, -1 = terakhir) untuk Hari ke-n Bulanan', null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('type', models.CharField(choices=[('INCOME', 'Pemasukan'), ('EXPENSE', 'Pengeluaran')], max_length=8)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('category', models.CharField(blank=True, max_length=100)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('frequency', models.CharField(choices=[('DAILY', 'Harian'), ('WEEKLY', 'Mingguan'), ('MONTHLY', 'Bulanan'), ('MONTH_END', 'Akhir Bulan'), ('NTH_WEEKDAY', 'Hari ke-n Bulanan'), ('YEARLY', 'Tahunan')], default='MONTHLY', max_length=16)),
+                ('next_date', models.DateField(db_index=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_transactions', to='tracker.account')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
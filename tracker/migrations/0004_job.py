@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_recurrence_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('PENDING', 'Menunggu'), ('RUNNING', 'Berjalan'), ('DONE', 'Selesai'), ('FAILED', 'Gagal')], default='PENDING', max_length=8)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('input_data', models.BinaryField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('output_data', models.BinaryField(blank=True, null=True)),
+                ('output_name', models.CharField(blank=True, max_length=255)),
+                ('progress', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3)),
+                ('error', models.TextField(blank=True)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='tracker_job_status_724198_idx')],
+            },
+        ),
+    ]
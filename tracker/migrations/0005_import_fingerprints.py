@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('delimiter', models.CharField(default=',', max_length=1)),
+                ('date_column', models.CharField(default='date', max_length=100)),
+                ('date_format', models.CharField(default='%Y-%m-%d', help_text='Format strptime, mis. %d/%m/%Y', max_length=32)),
+                ('amount_column', models.CharField(blank=True, default='amount', help_text='Nominal bertanda (negatif = pengeluaran)', max_length=100)),
+                ('debit_column', models.CharField(blank=True, help_text='Isi jika debit/kredit berada di kolom terpisah', max_length=100)),
+                ('credit_column', models.CharField(blank=True, max_length=100)),
+                ('type_column', models.CharField(blank=True, max_length=100)),
+                ('income_values', models.CharField(blank=True, default='INCOME,CR,K', help_text='Nilai kolom jenis yang berarti pemasukan, dipisah koma', max_length=100)),
+                ('category_column', models.CharField(blank=True, max_length=100)),
+                ('note_column', models.CharField(blank=True, default='note', max_length=100)),
+                ('decimal_comma', models.BooleanField(default=False, help_text='Format angka 1.234,56')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, help_text='Sidik jari isi baris impor, untuk deduplikasi', max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(fields=('account', 'fingerprint'), name='uniq_transaction_account_fingerprint'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_updated_at_tracking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LearningTopic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('key', models.CharField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LearningTopicAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['key'],
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedlearninglog',
+            name='topic_ref',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_logs', to='tracker.learningtopic'),
+        ),
+        migrations.AddField(
+            model_name='learninglog',
+            name='topic_ref',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='logs', to='tracker.learningtopic'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlearninglog',
+            index=models.Index(fields=['topic_ref', 'date'], name='tracker_arc_topic_r_652464_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learninglog',
+            index=models.Index(fields=['topic_ref', 'date'], name='tracker_lea_topic_r_bb5624_idx'),
+        ),
+        migrations.AddField(
+            model_name='learningtopicalias',
+            name='topic',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='tracker.learningtopic'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_learning_topics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedhealthlog',
+            name='distance_km',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedhealthlog',
+            name='minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedhealthlog',
+            name='reps',
+            field=models.PositiveIntegerField(blank=True, help_text='Repetisi per set', null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedhealthlog',
+            name='sets',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='healthlog',
+            name='distance_km',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='healthlog',
+            name='minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='healthlog',
+            name='reps',
+            field=models.PositiveIntegerField(blank=True, help_text='Repetisi per set', null=True),
+        ),
+        migrations.AddField(
+            model_name='healthlog',
+            name='sets',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_health_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('field', models.CharField(choices=[('achievement', 'Pencapaian'), ('challenge', 'Tantangan'), ('solution', 'Solusi'), ('gratitude', 'Syukur')], max_length=16)),
+                ('term', models.CharField(max_length=64)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-month', 'field', '-count'],
+                'indexes': [models.Index(fields=['month', 'field', '-count'], name='tracker_jou_month_5625fd_idx')],
+                'constraints': [models.UniqueConstraint(fields=('month', 'field', 'term'), name='uniq_journal_term')],
+            },
+        ),
+    ]
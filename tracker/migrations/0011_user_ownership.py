@@ -0,0 +1,297 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_journal_terms'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='journalterm',
+            name='uniq_journal_term',
+        ),
+        migrations.RemoveConstraint(
+            model_name='transaction',
+            name='uniq_transaction_account_fingerprint',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedlearninglog',
+            name='tracker_arc_topic_r_652464_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedtransaction',
+            name='tracker_arc_account_c034c4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='journalterm',
+            name='tracker_jou_month_5625fd_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='learninglog',
+            name='tracker_lea_topic_r_bb5624_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='waterintake',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='accounts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archiveddailytask',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedhealthlog',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedlearninglog',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedmindfulnesslog',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedsaving',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedtransaction',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedwaterintake',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='dailytask',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='healthlog',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='health_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='importprofile',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='import_profiles', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='journalterm',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='journal_terms', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='learninglog',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='learning_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='learningtopic',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='learning_topics', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='learningtopicalias',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='learning_topic_aliases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='mindfulnesslog',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='mindfulness_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='recurringtask',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recurring_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='recurringtransaction',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recurring_transactions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='saving',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='savings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='savingsgoal',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='savings_goals', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='userpreferences',
+            name='user',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='preferences', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='waterintake',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='water_intakes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='importprofile',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='learningtopic',
+            name='key',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='learningtopicalias',
+            name='key',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='savingsgoal',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AlterUniqueTogether(
+            name='waterintake',
+            unique_together={('user', 'date', 'created_at')},
+        ),
+        migrations.AddIndex(
+            model_name='archiveddailytask',
+            index=models.Index(fields=['user', 'date'], name='tracker_arc_user_id_3475a2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedhealthlog',
+            index=models.Index(fields=['user', 'date'], name='tracker_arc_user_id_271eda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlearninglog',
+            index=models.Index(fields=['user', 'date'], name='tracker_arc_user_id_8f0653_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlearninglog',
+            index=models.Index(fields=['user', 'topic_ref', 'date'], name='tracker_arc_user_id_104841_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedmindfulnesslog',
+            index=models.Index(fields=['user', 'date'], name='tracker_arc_user_id_cf90e6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedsaving',
+            index=models.Index(fields=['user', 'date'], name='tracker_arc_user_id_901080_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtransaction',
+            index=models.Index(fields=['user', 'date'], name='tracker_arc_user_id_483f9a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtransaction',
+            index=models.Index(fields=['user', 'account', 'fingerprint'], name='tracker_arc_user_id_9369b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedwaterintake',
+            index=models.Index(fields=['user', 'date'], name='tracker_arc_user_id_32cd32_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailytask',
+            index=models.Index(fields=['user', 'date'], name='tracker_dai_user_id_ac0e40_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthlog',
+            index=models.Index(fields=['user', 'date'], name='tracker_hea_user_id_49a618_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalterm',
+            index=models.Index(fields=['user', 'month', 'field', '-count'], name='tracker_jou_user_id_c72850_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learninglog',
+            index=models.Index(fields=['user', 'date'], name='tracker_lea_user_id_6f0de2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learninglog',
+            index=models.Index(fields=['user', 'topic_ref', 'date'], name='tracker_lea_user_id_e8ebf3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mindfulnesslog',
+            index=models.Index(fields=['user', 'date'], name='tracker_min_user_id_8a208a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringtask',
+            index=models.Index(fields=['user', 'next_date'], name='tracker_rec_user_id_bd990f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringtransaction',
+            index=models.Index(fields=['user', 'next_date'], name='tracker_rec_user_id_8cca8d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='saving',
+            index=models.Index(fields=['user', 'date'], name='tracker_sav_user_id_b2c134_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'date'], name='tracker_tra_user_id_d71426_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='account',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_account_user_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='importprofile',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_importprofile_user_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='journalterm',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'field', 'term'), name='uniq_journal_term'),
+        ),
+        migrations.AddConstraint(
+            model_name='learningtopic',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='uniq_learningtopic_user_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='learningtopicalias',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='uniq_learningtopicalias_user_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='savingsgoal',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_savingsgoal_user_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(fields=('user', 'account', 'fingerprint'), name='uniq_transaction_user_account_fingerprint'),
+        ),
+    ]
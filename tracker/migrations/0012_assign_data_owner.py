@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import migrations
+
+# Data dari masa satu pengguna diberikan ke satu pemilik: superuser pertama,
+# pengguna pertama, atau akun baru "pemilik" (password diatur lewat changepassword).
+
+OWNED_MODELS = [
+    'DailyTask', 'Account', 'Transaction', 'ImportProfile', 'SavingsGoal', 'Saving', 'UserPreferences',
+    'LearningTopic', 'LearningTopicAlias', 'LearningLog', 'HealthLog', 'MindfulnessLog', 'JournalTerm',
+    'RecurringTransaction', 'RecurringTask', 'WaterIntake',
+    'ArchivedDailyTask', 'ArchivedTransaction', 'ArchivedSaving', 'ArchivedLearningLog',
+    'ArchivedHealthLog', 'ArchivedMindfulnessLog', 'ArchivedWaterIntake',
+]
+
+
+def assign_owner(apps, schema_editor):
+    db = schema_editor.connection.alias
+    models = [apps.get_model('tracker', name) for name in OWNED_MODELS]
+    if not any(model.objects.using(db).filter(user__isnull=True).exists() for model in models):
+        return
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    owner = (
+        User.objects.using(db).filter(is_superuser=True).order_by('pk').first()
+        or User.objects.using(db).order_by('pk').first()
+        or User.objects.using(db).create(username='pemilik', password=make_password(None))
+    )
+    # UserPreferences menjadi satu-ke-satu: yang dipakai view lama (id terkecil) dipertahankan
+    prefs = apps.get_model('tracker', 'UserPreferences').objects.using(db)
+    first = prefs.filter(user__isnull=True).order_by('pk').first()
+    if first is not None:
+        prefs.filter(user__isnull=True).exclude(pk=first.pk).delete()
+        if prefs.filter(user=owner).exists():
+            first.delete()
+    for model in models:
+        model.objects.using(db).filter(user__isnull=True).update(user=owner)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0011_user_ownership'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_owner, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_live_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=8)),
+                ('path', models.CharField(max_length=500)),
+                ('view_name', models.CharField(blank=True, db_index=True, max_length=200)),
+                ('status_code', models.PositiveSmallIntegerField(default=0)),
+                ('sampled', models.BooleanField(default=False, help_text='Dipilih sampling, bukan diminta lewat query flag')),
+                ('duration_ms', models.FloatField(default=0)),
+                ('sql_count', models.PositiveIntegerField(default=0)),
+                ('sql_ms', models.FloatField(default=0)),
+                ('functions', models.JSONField(blank=True, default=list)),
+                ('queries', models.JSONField(blank=True, default=list)),
+                ('stats_data', models.BinaryField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
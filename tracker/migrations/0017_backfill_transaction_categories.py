@@ -0,0 +1,36 @@
+from django.db import migrations
+
+from tracker.models import normalize_category
+
+# category_ref untuk transaksi yang sudah ada: satu kategori per kunci ternormalisasi,
+# satu UPDATE per teks kategori yang berbeda. Data besar bisa dilanjutkan dengan
+# `manage.py backfill_transaction_categories` (logika sama dengan model terbaru).
+
+MODELS = ['Transaction', 'ArchivedTransaction', 'RecurringTransaction']
+
+
+def backfill(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Category = apps.get_model('tracker', 'Category')
+    categories = {}
+    for name in MODELS:
+        model = apps.get_model('tracker', name)
+        texts = model.objects.using(db).filter(category_ref__isnull=True).exclude(category='').values_list('user_id', 'category').distinct().order_by()
+        for user_id, text in list(texts):
+            key = normalize_category(text)
+            if not key:
+                continue
+            if (user_id, key) not in categories:
+                categories[user_id, key] = Category.objects.using(db).get_or_create(user_id=user_id, key=key, defaults={'name': text.strip()[:100]})[0]
+            model.objects.using(db).filter(user_id=user_id, category_ref__isnull=True, category=text).update(category_ref=categories[user_id, key])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0016_transaction_categories'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
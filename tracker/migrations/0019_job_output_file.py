@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0018_offline_submissions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='output_file',
+            field=models.FileField(blank=True, upload_to='jobs/%Y/%m/'),
+        ),
+    ]
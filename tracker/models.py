@@ -1,4 +1,13 @@
+import re
+import unicodedata
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
 from django.db import models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 # Create your models here.
 
@@ -9,37 +18,82 @@ class TaskCategory(models.TextChoices):
 	DAILY = 'DAILY', 'Harian'
 
 
-class DailyTask(models.Model):
+# Model yang bisa diarsipkan (lihat tracker/archive.py) memakai base abstrak
+# `...Fields` yang sama untuk tabel aktif dan tabel arsipnya.
+#
+# Semua data dimiliki satu pengguna (`user`). Indeks komposit selalu diawali
+# kolom user, jadi query dashboard/laporan hanya memindai data milik pengguna itu;
+# FK user sendiri tanpa db_index karena sudah tercakup indeks komposit tersebut.
+
+class DailyTaskFields(models.Model):
 	date = models.DateField(db_index=True)
 	category = models.CharField(max_length=16, choices=TaskCategory.choices)
 	title = models.CharField(max_length=200)
 	description = models.TextField(blank=True)
 	is_completed = models.BooleanField(default=False)
-	created_at = models.DateTimeField(auto_now_add=True)
-	updated_at = models.DateTimeField(auto_now=True)
 
 	class Meta:
-		ordering = ['-date', '-created_at']
+		abstract = True
 
 	def __str__(self) -> str:
 		return f"{self.date} - {self.get_category_display()}: {self.title}"
 
 
+class DailyTask(DailyTaskFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='daily_tasks', on_delete=models.CASCADE, db_index=False)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+
+def _amount_sum_subquery(model, fk='account', **filters):
+	totals = model.objects.filter(**{fk: OuterRef('pk')}, **filters).order_by().values(fk).annotate(total=Sum('amount')).values('total')
+	return Coalesce(Subquery(totals, output_field=models.DecimalField(max_digits=14, decimal_places=2)), Value(Decimal('0')), output_field=models.DecimalField(max_digits=14, decimal_places=2))
+
+
+class AccountQuerySet(models.QuerySet):
+	def with_balance(self):
+		# Saldo semua akun dalam satu query (subquery per jenis, tanpa join yang menggandakan baris)
+		return self.annotate(
+			annotated_balance=models.F('initial_balance')
+			+ models.F('archived_net')
+			+ _amount_sum_subquery(Transaction, type=TransactionType.INCOME)
+			- _amount_sum_subquery(Transaction, type=TransactionType.EXPENSE)
+			- _amount_sum_subquery(Saving)
+		)
+
+
 class Account(models.Model):
-	name = models.CharField(max_length=100, unique=True)
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='accounts', on_delete=models.CASCADE, db_index=False)
+	name = models.CharField(max_length=100)
 	description = models.CharField(max_length=255, blank=True)
 	initial_balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+	archived_net = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False, help_text='Total bersih transaksi & tabungan yang sudah diarsipkan')
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	objects = AccountQuerySet.as_manager()
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'name'], name='uniq_account_user_name'),
+		]
 
 	def __str__(self) -> str:
 		return self.name
 
 	@property
 	def current_balance(self):
+		annotated = getattr(self, 'annotated_balance', None)
+		if annotated is not None:
+			return annotated
 		income = self.transactions.filter(type=TransactionType.INCOME).aggregate(models.Sum('amount'))['amount__sum'] or 0
 		expense = self.transactions.filter(type=TransactionType.EXPENSE).aggregate(models.Sum('amount'))['amount__sum'] or 0
 		saving = self.savings.aggregate(models.Sum('amount'))['amount__sum'] or 0
-		return self.initial_balance + income - expense - saving
+		return self.initial_balance + self.archived_net + income - expense - saving
 
 
 class TransactionType(models.TextChoices):
@@ -47,34 +101,193 @@ class TransactionType(models.TextChoices):
 	EXPENSE = 'EXPENSE', 'Pengeluaran'
 
 
-class Transaction(models.Model):
-	account = models.ForeignKey(Account, related_name='transactions', on_delete=models.CASCADE)
+def normalize_category(text: str) -> str:
+	"""Kunci pembanding kategori transaksi: 'Makan', 'makan ' dan 'MAKAN' menjadi 'makan'."""
+	return normalize_topic(text)[:100]
+
+
+class CategoryManager(models.Manager):
+	def resolve(self, user_id: int, name: str):
+		"""Kategori milik pengguna untuk teks bebas: cocokkan kunci lalu alias; buat kategori baru bila belum ada."""
+		key = normalize_category(name)
+		if not key:
+			return None
+		category = self.filter(user_id=user_id, key=key).first()
+		if category is None:
+			alias = CategoryAlias.objects.select_related('category').filter(user_id=user_id, key=key).first()
+			category = alias.category if alias else self.get_or_create(user_id=user_id, key=key, defaults={'name': name.strip()[:100]})[0]
+		return category
+
+
+class Category(models.Model):
+	# Kategori transaksi ternormalisasi; Transaction.category tetap menyimpan teks yang diketik
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='transaction_categories', on_delete=models.CASCADE, db_index=False)
+	name = models.CharField(max_length=100)
+	key = models.CharField(max_length=100)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	objects = CategoryManager()
+
+	class Meta:
+		ordering = ['name']
+		verbose_name_plural = 'categories'
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'key'], name='uniq_category_user_key'),
+		]
+
+	def save(self, *args, **kwargs):
+		if not self.key:
+			self.key = normalize_category(self.name)
+		super().save(*args, **kwargs)
+
+	def __str__(self) -> str:
+		return self.name
+
+
+class CategoryAlias(models.Model):
+	# Ejaan lain yang digabung ke sebuah kategori (lihat `manage.py merge_transaction_categories`)
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='transaction_category_aliases', on_delete=models.CASCADE, db_index=False)
+	category = models.ForeignKey(Category, related_name='aliases', on_delete=models.CASCADE)
+	key = models.CharField(max_length=100)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['key']
+		verbose_name_plural = 'category aliases'
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'key'], name='uniq_categoryalias_user_key'),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.key} → {self.category}"
+
+
+class ResolvedRefMixin:
+	# Menjaga FK referensi mengikuti teks bebasnya: diisi ulang bila teks berubah sejak dimuat.
+	# Subkelas mengisi `ref_source = (kolom teks, kolom FK)` dan `resolve_ref()`.
+	ref_source = None
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._loaded_ref_text = instance.__dict__.get(cls.ref_source[0])
+		return instance
+
+	def resolve_ref(self):
+		raise NotImplementedError
+
+	def save(self, *args, **kwargs):
+		text_field, ref_field = self.ref_source
+		text = getattr(self, text_field)
+		update_fields = kwargs.get('update_fields')
+		if update_fields is None or text_field in update_fields:
+			changed = text != getattr(self, '_loaded_ref_text', None)
+			if getattr(self, f'{ref_field}_id') is None or changed:
+				setattr(self, ref_field, self.resolve_ref())
+				if update_fields is not None:
+					kwargs['update_fields'] = {*update_fields, ref_field}
+		super().save(*args, **kwargs)
+		self._loaded_ref_text = text
+
+
+class CategorizedMixin(ResolvedRefMixin):
+	ref_source = ('category', 'category_ref')
+
+	def resolve_ref(self):
+		return Category.objects.resolve(self.user_id, self.category)
+
+
+class TransactionFields(models.Model):
 	date = models.DateField(db_index=True)
 	type = models.CharField(max_length=8, choices=TransactionType.choices)
 	amount = models.DecimalField(max_digits=12, decimal_places=2)
 	category = models.CharField(max_length=100, blank=True)
 	note = models.CharField(max_length=255, blank=True)
+	fingerprint = models.CharField(max_length=64, null=True, blank=True, editable=False, help_text='Sidik jari isi baris impor, untuk deduplikasi')
+
+	is_archived = False
+
+	class Meta:
+		abstract = True
+
+	def __str__(self) -> str:
+		return f"{self.date} {self.type} {self.amount} ({self.account.name})"
+
+
+class Transaction(CategorizedMixin, TransactionFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='transactions', on_delete=models.CASCADE, db_index=False)
+	account = models.ForeignKey(Account, related_name='transactions', on_delete=models.CASCADE)
+	category_ref = models.ForeignKey(Category, related_name='transactions', on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 	class Meta:
 		ordering = ['-date', '-created_at']
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'account', 'fingerprint'], name='uniq_transaction_user_account_fingerprint'),
+		]
+		# Laporan per kategori: seek (user, category_ref, rentang tanggal); sekaligus menggantikan indeks FK biasa
+		indexes = [models.Index(fields=['user', 'date']), models.Index(fields=['user', 'category_ref', 'date'])]
+
+
+class ImportProfile(models.Model):
+	# Pemetaan kolom CSV mutasi bank ke field Transaction
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='import_profiles', on_delete=models.CASCADE, db_index=False)
+	name = models.CharField(max_length=100)
+	delimiter = models.CharField(max_length=1, default=',')
+	date_column = models.CharField(max_length=100, default='date')
+	date_format = models.CharField(max_length=32, default='%Y-%m-%d', help_text='Format strptime, mis. %d/%m/%Y')
+	amount_column = models.CharField(max_length=100, blank=True, default='amount', help_text='Nominal bertanda (negatif = pengeluaran)')
+	debit_column = models.CharField(max_length=100, blank=True, help_text='Isi jika debit/kredit berada di kolom terpisah')
+	credit_column = models.CharField(max_length=100, blank=True)
+	type_column = models.CharField(max_length=100, blank=True)
+	income_values = models.CharField(max_length=100, blank=True, default='INCOME,CR,K', help_text='Nilai kolom jenis yang berarti pemasukan, dipisah koma')
+	category_column = models.CharField(max_length=100, blank=True)
+	note_column = models.CharField(max_length=100, blank=True, default='note')
+	decimal_comma = models.BooleanField(default=False, help_text='Format angka 1.234,56')
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'name'], name='uniq_importprofile_user_name'),
+		]
 
 	def __str__(self) -> str:
-		return f"{self.date} {self.type} {self.amount} ({self.account.name})"
+		return self.name
+
+
+class SavingsGoalQuerySet(models.QuerySet):
+	def with_saved_amount(self):
+		return self.annotate(annotated_saved_amount=models.F('archived_saved') + _amount_sum_subquery(Saving, fk='goal'))
 
 
 class SavingsGoal(models.Model):
-	name = models.CharField(max_length=100, unique=True)
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='savings_goals', on_delete=models.CASCADE, db_index=False)
+	name = models.CharField(max_length=100)
 	target_amount = models.DecimalField(max_digits=12, decimal_places=2)
 	description = models.CharField(max_length=255, blank=True)
+	archived_saved = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False, help_text='Total tabungan yang sudah diarsipkan')
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	objects = SavingsGoalQuerySet.as_manager()
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'name'], name='uniq_savingsgoal_user_name'),
+		]
 
 	def __str__(self) -> str:
 		return self.name
 
 	@property
 	def saved_amount(self):
-		return self.savings.aggregate(models.Sum('amount'))['amount__sum'] or 0
+		annotated = getattr(self, 'annotated_saved_amount', None)
+		if annotated is not None:
+			return annotated
+		return self.archived_saved + (self.savings.aggregate(models.Sum('amount'))['amount__sum'] or 0)
 
 	@property
 	def progress_percent(self):
@@ -83,119 +296,524 @@ class SavingsGoal(models.Model):
 		return 0.0
 
 
-class Saving(models.Model):
-	account = models.ForeignKey(Account, related_name='savings', on_delete=models.CASCADE)
-	goal = models.ForeignKey(SavingsGoal, related_name='savings', on_delete=models.SET_NULL, null=True, blank=True)
+class SavingFields(models.Model):
 	date = models.DateField(db_index=True)
 	amount = models.DecimalField(max_digits=12, decimal_places=2)
 	goal_name = models.CharField(max_length=100, blank=True)
 	note = models.CharField(max_length=255, blank=True)
-	created_at = models.DateTimeField(auto_now_add=True)
+
+	is_archived = False
 
 	class Meta:
-		ordering = ['-date', '-created_at']
+		abstract = True
 
 	def __str__(self) -> str:
 		label = self.goal.name if self.goal else (self.goal_name or '-')
 		return f"{self.date} NABUNG {self.amount} ({self.account.name}) [{label}]"
 
 
+class Saving(SavingFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='savings', on_delete=models.CASCADE, db_index=False)
+	account = models.ForeignKey(Account, related_name='savings', on_delete=models.CASCADE)
+	goal = models.ForeignKey(SavingsGoal, related_name='savings', on_delete=models.SET_NULL, null=True, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+
 class UserPreferences(models.Model):
+	user = models.OneToOneField(settings.AUTH_USER_MODEL, related_name='preferences', on_delete=models.CASCADE)
 	preferred_academic_focus = models.CharField(max_length=200, blank=True, help_text='Misal: Python, Public Speaking')
 	preferred_health_focus = models.CharField(max_length=200, blank=True, help_text='Misal: Jogging, Strength')
 	daily_water_goal_glasses = models.PositiveIntegerField(default=8)
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 	def __str__(self) -> str:
 		return 'Preferensi Pengguna'
 
 
-class LearningLog(models.Model):
+def normalize_topic(text: str) -> str:
+	"""Kunci pembanding topik: 'Python  3 ', 'python 3' dan 'PYTHON 3' menjadi 'python 3'."""
+	text = unicodedata.normalize('NFKC', text or '').casefold()
+	return re.sub(r'\s+', ' ', text).strip(' .,;:-_/')
+
+
+class LearningTopicManager(models.Manager):
+	def resolve(self, user_id: int, name: str):
+		"""Topik milik pengguna untuk teks bebas: cocokkan kunci topik lalu alias; buat topik baru bila belum ada."""
+		key = normalize_topic(name)
+		if not key:
+			return None
+		topic = self.filter(user_id=user_id, key=key).first()
+		if topic is None:
+			alias = LearningTopicAlias.objects.select_related('topic').filter(user_id=user_id, key=key).first()
+			topic = alias.topic if alias else self.get_or_create(user_id=user_id, key=key, defaults={'name': name.strip()[:200]})[0]
+		return topic
+
+
+class LearningTopic(models.Model):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='learning_topics', on_delete=models.CASCADE, db_index=False)
+	name = models.CharField(max_length=200)
+	key = models.CharField(max_length=200)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	objects = LearningTopicManager()
+
+	class Meta:
+		ordering = ['name']
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'key'], name='uniq_learningtopic_user_key'),
+		]
+
+	def save(self, *args, **kwargs):
+		if not self.key:
+			self.key = normalize_topic(self.name)
+		super().save(*args, **kwargs)
+
+	def __str__(self) -> str:
+		return self.name
+
+
+class LearningTopicAlias(models.Model):
+	# Ejaan lain yang digabung ke sebuah topik (lihat `manage.py merge_learning_topics`)
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='learning_topic_aliases', on_delete=models.CASCADE, db_index=False)
+	topic = models.ForeignKey(LearningTopic, related_name='aliases', on_delete=models.CASCADE)
+	key = models.CharField(max_length=200)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['key']
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'key'], name='uniq_learningtopicalias_user_key'),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.key} → {self.topic}"
+
+
+class LearningLogFields(models.Model):
 	date = models.DateField(db_index=True)
 	topic = models.CharField(max_length=200)
 	duration_minutes = models.PositiveIntegerField(default=0)
 	key_takeaways = models.TextField(blank=True)
 	source_url = models.URLField(blank=True)
-	created_at = models.DateTimeField(auto_now_add=True)
 
 	class Meta:
-		ordering = ['-date', '-created_at']
+		abstract = True
 
 	def __str__(self) -> str:
 		return f"{self.date} - {self.topic} ({self.duration_minutes}m)"
 
 
-class HealthLog(models.Model):
+class LearningLog(ResolvedRefMixin, LearningLogFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='learning_logs', on_delete=models.CASCADE, db_index=False)
+	topic_ref = models.ForeignKey(LearningTopic, related_name='logs', on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	ref_source = ('topic', 'topic_ref')
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		# Laporan per topik: seek (user, topic_ref, rentang tanggal); sekaligus menggantikan indeks FK biasa
+		indexes = [models.Index(fields=['user', 'date']), models.Index(fields=['user', 'topic_ref', 'date'])]
+
+	def resolve_ref(self):
+		return LearningTopic.objects.resolve(self.user_id, self.topic)
+
+
+class HealthLogFields(models.Model):
 	date = models.DateField(db_index=True)
 	activity = models.CharField(max_length=200)
 	duration_or_sets = models.CharField(max_length=100, blank=True)
 	note = models.CharField(max_length=255, blank=True)
-	created_at = models.DateTimeField(auto_now_add=True)
+	# Metrik terstruktur (diisi dari form, atau di-parse dari duration_or_sets)
+	minutes = models.PositiveIntegerField(null=True, blank=True)
+	sets = models.PositiveSmallIntegerField(null=True, blank=True)
+	reps = models.PositiveIntegerField(null=True, blank=True, help_text='Repetisi per set')
+	distance_km = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
 
 	class Meta:
-		ordering = ['-date', '-created_at']
+		abstract = True
 
 	def __str__(self) -> str:
 		return f"{self.date} - {self.activity}"
 
+	@property
+	def has_metrics(self) -> bool:
+		return any(value is not None for value in (self.minutes, self.sets, self.reps, self.distance_km))
+
+
+class HealthLog(HealthLogFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='health_logs', on_delete=models.CASCADE, db_index=False)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+	def save(self, *args, **kwargs):
+		if not self.has_metrics and self.duration_or_sets:
+			from .health_metrics import parse_metrics
+			for field, value in parse_metrics(self.duration_or_sets).items():
+				setattr(self, field, value)
+		super().save(*args, **kwargs)
 
-class MindfulnessLog(models.Model):
+
+class MindfulnessLogFields(models.Model):
 	date = models.DateField(db_index=True)
 	achievement = models.TextField(blank=True)
 	challenge = models.TextField(blank=True)
 	solution = models.TextField(blank=True)
 	gratitude = models.TextField(blank=True)
+
+	class Meta:
+		abstract = True
+
+	def __str__(self) -> str:
+		return f"{self.date} - Mindfulness"
+
+
+class MindfulnessLog(MindfulnessLogFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='mindfulness_logs', on_delete=models.CASCADE, db_index=False)
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 	class Meta:
 		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+
+class JournalField(models.TextChoices):
+	ACHIEVEMENT = 'achievement', 'Pencapaian'
+	CHALLENGE = 'challenge', 'Tantangan'
+	SOLUTION = 'solution', 'Solusi'
+	GRATITUDE = 'gratitude', 'Syukur'
+
+
+class JournalTerm(models.Model):
+	# Indeks frekuensi kata jurnal per bulan & kolom; diperbarui inkremental oleh
+	# sinyal MindfulnessLog (tracker/journal_terms.py). Arsip memakai _raw_delete,
+	# jadi entri yang diarsipkan tetap terhitung.
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='journal_terms', on_delete=models.CASCADE, db_index=False)
+	month = models.DateField()
+	field = models.CharField(max_length=16, choices=JournalField.choices)
+	term = models.CharField(max_length=64)
+	count = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		ordering = ['-month', 'field', '-count']
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'month', 'field', 'term'], name='uniq_journal_term'),
+		]
+		indexes = [models.Index(fields=['user', 'month', 'field', '-count'])]
 
 	def __str__(self) -> str:
-		return f"{self.date} - Mindfulness"
+		return f"{self.month:%Y-%m} {self.field}: {self.term} ({self.count})"
 
 
 class RecurrenceFrequency(models.TextChoices):
     DAILY = 'DAILY', 'Harian'
     WEEKLY = 'WEEKLY', 'Mingguan'
     MONTHLY = 'MONTHLY', 'Bulanan'
-
-
-class RecurringTransaction(models.Model):
+    MONTH_END = 'MONTH_END', 'Akhir Bulan'
+    NTH_WEEKDAY = 'NTH_WEEKDAY', 'Hari ke-n Bulanan'
+    YEARLY = 'YEARLY', 'Tahunan'
+
+
+class RecurrenceSchedule(models.Model):
+    interval = models.PositiveSmallIntegerField(default=1, help_text='Ulangi setiap N periode')
+    day_of_month = models.PositiveSmallIntegerField(null=True, blank=True, help_text='Tanggal jangkar untuk Bulanan/Tahunan')
+    week_of_month = models.SmallIntegerField(null=True, blank=True, help_text='Minggu ke-n (1-4, -1 = terakhir) untuk Hari ke-n Bulanan')
+    end_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        from .recurrence import week_of_month_for
+        next_date = self.next_date
+        if isinstance(next_date, str):
+            next_date = date.fromisoformat(next_date)
+        if self.frequency in (RecurrenceFrequency.MONTHLY, RecurrenceFrequency.YEARLY) and not self.day_of_month:
+            self.day_of_month = next_date.day
+        if self.frequency == RecurrenceFrequency.NTH_WEEKDAY and not self.week_of_month:
+            self.week_of_month = week_of_month_for(next_date)
+        super().save(*args, **kwargs)
+
+
+class RecurringTransaction(CategorizedMixin, RecurrenceSchedule):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='recurring_transactions', on_delete=models.CASCADE, db_index=False)
     account = models.ForeignKey(Account, related_name='recurring_transactions', on_delete=models.CASCADE)
     type = models.CharField(max_length=8, choices=TransactionType.choices)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     category = models.CharField(max_length=100, blank=True)
+    category_ref = models.ForeignKey(Category, related_name='recurring_transactions', on_delete=models.SET_NULL, null=True, blank=True)
     note = models.CharField(max_length=255, blank=True)
-    frequency = models.CharField(max_length=8, choices=RecurrenceFrequency.choices, default=RecurrenceFrequency.MONTHLY)
+    frequency = models.CharField(max_length=16, choices=RecurrenceFrequency.choices, default=RecurrenceFrequency.MONTHLY)
     next_date = models.DateField(db_index=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'next_date'])]
 
     def __str__(self) -> str:
         return f"{self.account.name} {self.type} {self.amount} ({self.frequency}) next {self.next_date}"
 
 
-class RecurringTask(models.Model):
+class RecurringTask(RecurrenceSchedule):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='recurring_tasks', on_delete=models.CASCADE, db_index=False)
     category = models.CharField(max_length=16, choices=TaskCategory.choices)
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    frequency = models.CharField(max_length=8, choices=RecurrenceFrequency.choices, default=RecurrenceFrequency.DAILY)
+    frequency = models.CharField(max_length=16, choices=RecurrenceFrequency.choices, default=RecurrenceFrequency.DAILY)
     next_date = models.DateField(db_index=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'next_date'])]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.category}) {self.frequency} next {self.next_date}"
 
 
-class WaterIntake(models.Model):
+class WaterIntakeFields(models.Model):
 	date = models.DateField(db_index=True)
 	glasses = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		abstract = True
+
+	def __str__(self) -> str:
+		return f"{self.date} - {self.glasses} gelas"
+
+
+class WaterIntake(WaterIntakeFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='water_intakes', on_delete=models.CASCADE, db_index=False)
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 	class Meta:
-		unique_together = ('date', 'created_at')
+		unique_together = ('user', 'date', 'created_at')
 		ordering = ['-date', '-created_at']
 
+
+class JobStatus(models.TextChoices):
+	PENDING = 'PENDING', 'Menunggu'
+	RUNNING = 'RUNNING', 'Berjalan'
+	DONE = 'DONE', 'Selesai'
+	FAILED = 'FAILED', 'Gagal'
+
+
+class Job(models.Model):
+	# Pemilik job (null untuk job sistem, mis. arsip dari cron); antrian tetap global
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='jobs', on_delete=models.CASCADE, null=True, blank=True)
+	kind = models.CharField(max_length=50)
+	status = models.CharField(max_length=8, choices=JobStatus.choices, default=JobStatus.PENDING)
+	payload = models.JSONField(default=dict, blank=True)
+	input_data = models.BinaryField(null=True, blank=True)
+	result = models.JSONField(default=dict, blank=True)
+	output_data = models.BinaryField(null=True, blank=True)
+	# Hasil besar (ekspor analitik) disimpan sebagai file di storage, bukan di baris ini
+	output_file = models.FileField(upload_to='jobs/%Y/%m/', blank=True)
+	output_name = models.CharField(max_length=255, blank=True)
+	progress = models.PositiveIntegerField(default=0)
+	total = models.PositiveIntegerField(default=0)
+	attempts = models.PositiveSmallIntegerField(default=0)
+	max_attempts = models.PositiveSmallIntegerField(default=3)
+	error = models.TextField(blank=True)
+	run_after = models.DateTimeField(default=timezone.now)
+	locked_at = models.DateTimeField(null=True, blank=True)
+	finished_at = models.DateTimeField(null=True, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		ordering = ['-created_at']
+		indexes = [models.Index(fields=['status', 'run_after'])]
+
 	def __str__(self) -> str:
-		return f"{self.date} - {self.glasses} gelas"
+		return f"Job #{self.pk} {self.kind} ({self.status})"
+
+	def report_progress(self, progress: int, total: int = None):
+		# UPDATE langsung supaya tidak menimpa kolom lain yang sedang diubah
+		self.progress = progress
+		if total is not None:
+			self.total = total
+		Job.objects.filter(pk=self.pk).update(progress=self.progress, total=self.total, updated_at=timezone.now())
+
+
+class LiveEventKind(models.TextChoices):
+	TASK = 'task', 'Tugas'
+	WATER = 'water', 'Minum air'
+	TRANSACTION = 'transaction', 'Transaksi'
+	BALANCE = 'balance', 'Saldo'
+
+
+# Perubahan kecil untuk stream live (tracker/live.py). Tabel ini berfungsi sebagai
+# broadcaster antar worker: stream membaca baris dengan id > Last-Event-ID.
+# Baris lama dihapus oleh worker (purge_events).
+
+class LiveEvent(models.Model):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='live_events', on_delete=models.CASCADE, db_index=False)
+	kind = models.CharField(max_length=12, choices=LiveEventKind.choices)
+	payload = models.JSONField(default=dict, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+	class Meta:
+		indexes = [models.Index(fields=['user', 'id'])]
+
+	def __str__(self) -> str:
+		return f"{self.kind} #{self.pk}"
+
+
+# Entri antrean offline yang sudah diputar ulang (tracker/offline.py). client_id
+# dibuat browser per entri, jadi batch yang terkirim dua kali (mis. respons hilang
+# saat koneksi putus lagi) tidak membuat data ganda. Baris lama dihapus oleh worker.
+
+class OfflineSubmission(models.Model):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='offline_submissions', on_delete=models.CASCADE, db_index=False)
+	client_id = models.CharField(max_length=64)
+	action = models.CharField(max_length=200)
+	created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['user', 'client_id'], name='uniq_offlinesubmission_user_client'),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.action} ({self.client_id})"
+
+
+# Profil per request (tracker/profiling.py): cProfile + jejak SQL untuk request yang
+# diminta staf (?_profile=1) atau terpilih sampling. Tabel dibatasi PROFILE_MAX_ROWS.
+
+class RequestProfile(models.Model):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+	method = models.CharField(max_length=8)
+	path = models.CharField(max_length=500)
+	view_name = models.CharField(max_length=200, blank=True, db_index=True)
+	status_code = models.PositiveSmallIntegerField(default=0)
+	sampled = models.BooleanField(default=False, help_text='Dipilih sampling, bukan diminta lewat query flag')
+	duration_ms = models.FloatField(default=0)
+	sql_count = models.PositiveIntegerField(default=0)
+	sql_ms = models.FloatField(default=0)
+	functions = models.JSONField(default=list, blank=True)
+	queries = models.JSONField(default=list, blank=True)
+	stats_data = models.BinaryField(null=True, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+	class Meta:
+		ordering = ['-created_at']
+
+	def __str__(self) -> str:
+		return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+# Arsip: baris lebih tua dari horizon dipindah ke sini oleh tracker/archive.py.
+# created_at disalin apa adanya, jadi bukan auto_now_add.
+
+class ArchiveRun(models.Model):
+	cutoff = models.DateField(db_index=True, help_text='Semua baris dengan tanggal sebelum ini ada di tabel arsip')
+	counts = models.JSONField(default=dict, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['-cutoff']
+
+	def __str__(self) -> str:
+		return f"Arsip s.d. {self.cutoff}"
+
+
+class ArchivedDailyTask(DailyTaskFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, db_index=False)
+	created_at = models.DateTimeField()
+	updated_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+
+class ArchivedTransaction(TransactionFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, db_index=False)
+	account = models.ForeignKey(Account, related_name='archived_transactions', on_delete=models.CASCADE)
+	category_ref = models.ForeignKey(Category, related_name='archived_transactions', on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
+	created_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	is_archived = True
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [
+			models.Index(fields=['user', 'date']), models.Index(fields=['user', 'account', 'fingerprint']),
+			models.Index(fields=['user', 'category_ref', 'date']),
+		]
+
+
+class ArchivedSaving(SavingFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, db_index=False)
+	account = models.ForeignKey(Account, related_name='archived_savings', on_delete=models.CASCADE)
+	goal = models.ForeignKey(SavingsGoal, related_name='archived_savings', on_delete=models.SET_NULL, null=True, blank=True)
+	created_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	is_archived = True
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+
+class ArchivedLearningLog(LearningLogFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, db_index=False)
+	topic_ref = models.ForeignKey(LearningTopic, related_name='archived_logs', on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
+	created_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date']), models.Index(fields=['user', 'topic_ref', 'date'])]
+
+
+class ArchivedHealthLog(HealthLogFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, db_index=False)
+	created_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+
+class ArchivedMindfulnessLog(MindfulnessLogFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, db_index=False)
+	created_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
+
+
+class ArchivedWaterIntake(WaterIntakeFields):
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, db_index=False)
+	created_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['-date', '-created_at']
+		indexes = [models.Index(fields=['user', 'date'])]
@@ -0,0 +1,79 @@
+from calendar import Calendar
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+
+from .archive import archive_cutoff, ranged
+from .models import DailyTask, LearningLog, HealthLog, MindfulnessLog, WaterIntake, Transaction, TransactionType
+from .recurrence import days_in_month
+
+# Kalender bulanan: tiap sumber diringkas dengan satu query GROUP BY date (plus satu
+# untuk tabel arsipnya bila bulan itu sudah diarsipkan) lewat indeks (user, date),
+# lalu digabung per hari di memori. Biaya per bulan tetap 7 query kecil (cutoff arsip
+# + 6 sumber; 13 untuk bulan yang sudah diarsipkan), berapa pun panjang riwayatnya.
+
+SOURCES = (
+	(DailyTask, {'tasks': Count('id'), 'tasks_done': Count('id', filter=Q(is_completed=True))}),
+	(LearningLog, {'learning': Count('id'), 'learning_minutes': Sum('duration_minutes')}),
+	(HealthLog, {'health': Count('id'), 'health_minutes': Sum('minutes')}),
+	(MindfulnessLog, {'journal': Count('id')}),
+	(WaterIntake, {'water': Sum('glasses')}),
+	(Transaction, {
+		'income': Sum('amount', filter=Q(type=TransactionType.INCOME)),
+		'expense': Sum('amount', filter=Q(type=TransactionType.EXPENSE)),
+	}),
+)
+
+EMPTY_DAY = {
+	'tasks': 0, 'tasks_done': 0, 'learning': 0, 'learning_minutes': 0, 'health': 0, 'health_minutes': 0,
+	'journal': 0, 'water': 0, 'income': Decimal('0'), 'expense': Decimal('0'),
+}
+
+
+def month_activity(user, year: int, month: int, cutoff=None) -> dict:
+	"""Ringkasan per tanggal untuk satu bulan: {date: {metrik: nilai}}."""
+	start = date(year, month, 1)
+	end = date(year, month, days_in_month(year, month))
+	if cutoff is None:
+		cutoff = archive_cutoff()
+	days = defaultdict(lambda: dict(EMPTY_DAY))
+	for model, aggregates in SOURCES:
+		for qs in ranged(model, start, end, cutoff, user=user):
+			for row in qs.values('date').annotate(**aggregates).order_by():
+				day = days[row.pop('date')]
+				for key, value in row.items():
+					day[key] += value or 0
+	return days
+
+
+def heat_level(day: dict, water_goal: int = 8) -> int:
+	"""0-5: jumlah kebiasaan yang tercatat hari itu (tugas selesai, belajar, olahraga, jurnal, target minum)."""
+	return sum((
+		day['tasks_done'] > 0,
+		day['learning'] > 0,
+		day['health'] > 0,
+		day['journal'] > 0,
+		day['water'] >= max(water_goal, 1),
+	))
+
+
+def month_grid(user, year: int, month: int, water_goal: int = 8, cutoff=None):
+	"""Minggu-minggu (Senin-Minggu) berisi sel hari; tanggal di luar bulan ikut sebagai pengisi kosong."""
+	days = month_activity(user, year, month, cutoff)
+	weeks = []
+	for week in Calendar(firstweekday=0).monthdatescalendar(year, month):
+		cells = []
+		for day in week:
+			in_month = day.month == month
+			metrics = days.get(day, EMPTY_DAY) if in_month else EMPTY_DAY
+			cells.append({
+				'date': day,
+				'in_month': in_month,
+				'level': heat_level(metrics, water_goal) if in_month else 0,
+				'net': metrics['income'] - metrics['expense'],
+				**metrics,
+			})
+		weeks.append(cells)
+	return weeks, days
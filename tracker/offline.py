@@ -0,0 +1,136 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_not_required
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.templatetags.static import static
+from django.urls import Resolver404, resolve, reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from .models import OfflineSubmission
+from .views import QuickAddView
+
+# Klien offline: service worker (templates/tracker/sw.js) menyimpan static file dan
+# salinan terakhir tiap halaman, sehingga dashboard/saldo tetap terbuka tanpa
+# koneksi. Form tambah cepat (data-offline-queue, lihat base.html) yang dikirim saat
+# offline masuk antrean localStorage per pengguna, lalu dikirim sekaligus ke
+# OfflineReplayView begitu online. Tiap entri dijalankan lewat apply() view aslinya.
+
+SW_VERSION = 1
+MAX_BATCH = 100
+# Halaman yang tidak disimpan service worker (admin, login, job, API)
+SW_SKIP_PREFIXES = ('/admin/', '/accounts/', '/jobs/', '/api/')
+PRECACHE_STATIC = ('css/app.css', 'img/favicon.svg')
+
+
+def _precache() -> list:
+	return [static(path) for path in PRECACHE_STATIC] + [reverse('tracker:offline')]
+
+
+@method_decorator(login_not_required, name='dispatch')
+class ServiceWorkerView(View):
+	def get(self, request):
+		precache = _precache()
+		# Versi berubah bila nama file static (hash manifest) berubah -> cache lama dibuang
+		version = hashlib.sha1(json.dumps([SW_VERSION, precache]).encode()).hexdigest()[:12]
+		context = {
+			'version': version,
+			'precache': json.dumps(precache),
+			'static_prefix': json.dumps(settings.STATIC_URL),
+			'skip_prefixes': json.dumps(SW_SKIP_PREFIXES),
+			'offline_url': json.dumps(reverse('tracker:offline')),
+		}
+		response = render(request, 'tracker/sw.js', context, content_type='application/javascript')
+		# Browser selalu memeriksa versi baru service worker
+		response['Cache-Control'] = 'no-cache'
+		return response
+
+
+@method_decorator(login_not_required, name='dispatch')
+class WebManifestView(View):
+	def get(self, request):
+		manifest = {
+			'name': 'Progres Harian',
+			'short_name': 'Progres',
+			'lang': 'id',
+			'start_url': '/',
+			'scope': '/',
+			'display': 'standalone',
+			'background_color': '#0a0a1a',
+			'theme_color': '#8b5cf6',
+			'icons': [{'src': static('img/favicon.svg'), 'sizes': 'any', 'type': 'image/svg+xml'}],
+		}
+		return JsonResponse(manifest, content_type='application/manifest+json')
+
+
+@method_decorator(login_not_required, name='dispatch')
+class OfflinePageView(View):
+	def get(self, request):
+		return render(request, 'tracker/offline.html')
+
+
+def _view_class(action: str):
+	"""Kelas view tambah cepat untuk path form, atau None bila path bukan form yang boleh diantrekan."""
+	try:
+		match = resolve(action)
+	except Resolver404:
+		return None
+	view_class = getattr(match.func, 'view_class', None)
+	if match.kwargs or view_class is None or not issubclass(view_class, QuickAddView):
+		return None
+	return view_class
+
+
+def replay_item(user, item: dict) -> dict:
+	client_id = str(item.get('id') or '')[:64]
+	action = str(item.get('action') or '')[:200]
+	fields = item.get('fields') if isinstance(item.get('fields'), dict) else {}
+	result = {'id': client_id}
+	view_class = _view_class(action)
+	if not client_id or view_class is None:
+		return {**result, 'status': 'rejected', 'message': 'Form tidak dikenal'}
+	data = {str(key): str(value) for key, value in fields.items() if key != 'csrfmiddlewaretoken'}
+	# Form tanpa input tanggal (mis. +1 gelas) memakai tanggal saat entri diantrekan
+	if item.get('queued_on'):
+		data.setdefault('date', str(item['queued_on']))
+	try:
+		with transaction.atomic():
+			_, created = OfflineSubmission.objects.get_or_create(user=user, client_id=client_id, defaults={'action': action})
+			if not created:
+				return {**result, 'status': 'duplicate'}
+			error = view_class().apply(user, data)
+			if error:
+				transaction.set_rollback(True)
+				return {**result, 'status': 'error', 'message': error}
+	except (ValidationError, ValueError, ArithmeticError):
+		return {**result, 'status': 'error', 'message': 'Isian tidak valid'}
+	except DatabaseError:
+		# Hanya savepoint entri ini yang di-rollback; entri lain dalam batch tetap diproses.
+		# Gangguan database bisa sementara (mis. lock): klien menyimpan entri untuk dikirim ulang
+		return {**result, 'status': 'error', 'message': 'Gagal menyimpan, akan dicoba lagi', 'retry': True}
+	return {**result, 'status': 'ok', 'message': view_class.success_message}
+
+
+class OfflineReplayView(View):
+	def post(self, request):
+		try:
+			items = json.loads(request.body or b'{}').get('items')
+		except (ValueError, AttributeError):
+			items = None
+		if not isinstance(items, list):
+			return JsonResponse({'error': 'Format batch tidak valid'}, status=400)
+		# Sisa antrean di atas MAX_BATCH dikirim klien pada batch berikutnya
+		results = [replay_item(request.user, item) for item in items[:MAX_BATCH] if isinstance(item, dict)]
+		return JsonResponse({'results': results, 'applied': sum(1 for r in results if r['status'] == 'ok')})
+
+
+def purge_replayed(keep: timedelta) -> int:
+	deleted, _ = OfflineSubmission.objects.filter(created_at__lt=timezone.now() - keep).delete()
+	return deleted
@@ -0,0 +1,134 @@
+import cProfile
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .models import RequestProfile
+
+# Profil per request, opt-in. Staf menambahkan ?_profile=1 ke URL mana pun, atau
+# PROFILE_SAMPLE_RATE (0..1) memilih request secara acak. Yang direkam: cProfile
+# (fungsi teratas menurut waktu kumulatif) dan semua query SQL (dikelompokkan per
+# teks SQL). Hasilnya disimpan di RequestProfile dan bisa dilihat di admin.
+
+TOP_FUNCTIONS = 40
+TOP_QUERIES = 30
+MAX_SQL_LENGTH = 2000
+
+# cProfile memakai hook profiler global per interpreter (3.12+) atau per thread:
+# satu profil pada satu waktu, request lain berjalan tanpa profil
+_lock = threading.Lock()
+
+
+def wants_profile(request):
+	"""None (tidak diprofil), 'flag' (diminta staf) atau 'sample'."""
+	if request.GET.get(settings.PROFILE_QUERY_FLAG):
+		user = getattr(request, 'user', None)
+		return 'flag' if user is not None and user.is_staff else None
+	rate = settings.PROFILE_SAMPLE_RATE
+	if rate and not request.path.startswith('/admin/') and random.random() < rate:
+		return 'sample'
+	return None
+
+
+class SQLTrace:
+	"""execute_wrapper: catat durasi tiap query di semua koneksi database."""
+
+	def __init__(self):
+		self.queries = []
+
+	def __call__(self, execute, sql, params, many, context):
+		started = time.perf_counter()
+		try:
+			return execute(sql, params, many, context)
+		finally:
+			self.queries.append((context['connection'].alias, sql, time.perf_counter() - started))
+
+	def summary(self) -> list:
+		grouped = defaultdict(lambda: {'count': 0, 'ms': 0.0})
+		for alias, sql, seconds in self.queries:
+			entry = grouped[(alias, sql[:MAX_SQL_LENGTH])]
+			entry['count'] += 1
+			entry['ms'] += seconds * 1000
+		rows = [{'alias': alias, 'sql': sql, 'count': e['count'], 'ms': round(e['ms'], 2)} for (alias, sql), e in grouped.items()]
+		return sorted(rows, key=lambda row: row['ms'], reverse=True)[:TOP_QUERIES]
+
+
+def _short_path(filename: str) -> str:
+	base = str(settings.BASE_DIR)
+	if filename.startswith(base):
+		return filename[len(base) + 1:]
+	marker = 'site-packages/'
+	return filename[filename.index(marker) + len(marker):] if marker in filename else filename
+
+
+def top_functions(stats: pstats.Stats) -> list:
+	rows = [
+		{
+			'function': f'{_short_path(filename)}:{line}({name})',
+			'calls': total_calls, 'primitive_calls': primitive_calls,
+			'tottime_ms': round(tottime * 1000, 2), 'cumtime_ms': round(cumtime * 1000, 2),
+		}
+		for (filename, line, name), (primitive_calls, total_calls, tottime, cumtime, _) in stats.stats.items()
+	]
+	return sorted(rows, key=lambda row: row['cumtime_ms'], reverse=True)[:TOP_FUNCTIONS]
+
+
+def profile_request(request, get_response, mode):
+	"""Jalankan request di bawah cProfile + jejak SQL, lalu simpan profilnya."""
+	if not _lock.acquire(blocking=False):
+		return get_response(request)
+	try:
+		trace = SQLTrace()
+		profiler = cProfile.Profile()
+		started = time.perf_counter()
+		with ExitStack() as stack:
+			for alias in connections:
+				stack.enter_context(connections[alias].execute_wrapper(trace))
+			profiler.enable()
+			try:
+				response = get_response(request)
+			finally:
+				profiler.disable()
+		duration = time.perf_counter() - started
+	finally:
+		_lock.release()
+	save_profile(request, response, mode, profiler, trace, duration)
+	return response
+
+
+def save_profile(request, response, mode, profiler, trace, duration):
+	stats = pstats.Stats(profiler)
+	match = request.resolver_match
+	view = getattr(match.func, 'view_class', match.func) if match else None
+	user = getattr(request, 'user', None)
+	RequestProfile.objects.create(
+		user=user if user is not None and user.is_authenticated else None,
+		method=request.method,
+		path=request.get_full_path()[:500],
+		view_name=f'{view.__module__}.{view.__qualname__}' if view else '',
+		status_code=response.status_code,
+		sampled=mode == 'sample',
+		duration_ms=round(duration * 1000, 2),
+		sql_count=len(trace.queries),
+		sql_ms=round(sum(seconds for _, _, seconds in trace.queries) * 1000, 2),
+		functions=top_functions(stats),
+		queries=trace.summary(),
+		# Format yang sama dengan pstats.dump_stats: bisa dibuka snakeviz/pstats
+		stats_data=marshal.dumps(stats.stats),
+	)
+	trim_profiles()
+
+
+def trim_profiles(keep: int = None):
+	"""Batasi tabel ke `keep` profil terbaru (default PROFILE_MAX_ROWS)."""
+	keep = settings.PROFILE_MAX_ROWS if keep is None else keep
+	boundary = list(RequestProfile.objects.order_by('-id').values_list('id', flat=True)[keep:keep + 1])
+	if boundary:
+		RequestProfile.objects.filter(id__lte=boundary[0]).delete()
@@ -0,0 +1,95 @@
+import calendar
+from datetime import date, timedelta
+
+from .models import RecurrenceFrequency
+
+# Mesin pengulangan (recurrence) untuk template transaksi & tugas berulang.
+# Semua perhitungan murni di memori: tidak ada query di modul ini.
+
+LAST_WEEK = -1
+
+
+def days_in_month(year: int, month: int) -> int:
+	return calendar.monthrange(year, month)[1]
+
+
+def add_months(year: int, month: int, months: int):
+	index = year * 12 + (month - 1) + months
+	return index // 12, index % 12 + 1
+
+
+def _nth_weekday(year: int, month: int, weekday: int, nth: int) -> date:
+	"""Tanggal hari ke-`nth` (1..5, -1 = terakhir) bertipe `weekday` dalam bulan.
+
+	Jika minggu ke-5 tidak ada di bulan tersebut, dipakai kemunculan terakhir.
+	"""
+	last_day = days_in_month(year, month)
+	if nth == LAST_WEEK:
+		last = date(year, month, last_day)
+		return last - timedelta(days=(last.weekday() - weekday) % 7)
+	first = date(year, month, 1)
+	day = 1 + (weekday - first.weekday()) % 7 + (nth - 1) * 7
+	while day > last_day:
+		day -= 7
+	return date(year, month, day)
+
+
+def week_of_month_for(d: date) -> int:
+	nth = (d.day - 1) // 7 + 1
+	# Minggu ke-5 selalu juga minggu terakhir, simpan sebagai "terakhir"
+	return LAST_WEEK if nth >= 5 else nth
+
+
+class RecurrenceRule:
+	def __init__(self, frequency, interval=1, day_of_month=None, week_of_month=None, weekday=None, end_date=None):
+		self.frequency = frequency
+		self.interval = max(int(interval or 1), 1)
+		self.day_of_month = day_of_month
+		self.week_of_month = week_of_month
+		self.weekday = weekday
+		self.end_date = end_date
+
+	@classmethod
+	def from_template(cls, template):
+		return cls(
+			frequency=template.frequency,
+			interval=template.interval,
+			day_of_month=template.day_of_month,
+			week_of_month=template.week_of_month,
+			weekday=template.next_date.weekday() if template.frequency == RecurrenceFrequency.NTH_WEEKDAY else None,
+			end_date=template.end_date,
+		)
+
+	def advance(self, d: date) -> date:
+		if self.frequency == RecurrenceFrequency.DAILY:
+			return d + timedelta(days=self.interval)
+		if self.frequency == RecurrenceFrequency.WEEKLY:
+			return d + timedelta(weeks=self.interval)
+		if self.frequency == RecurrenceFrequency.YEARLY:
+			return self._add_months_anchored(d, 12 * self.interval)
+		if self.frequency == RecurrenceFrequency.MONTH_END:
+			year, month = add_months(d.year, d.month, self.interval)
+			return date(year, month, days_in_month(year, month))
+		if self.frequency == RecurrenceFrequency.NTH_WEEKDAY:
+			year, month = add_months(d.year, d.month, self.interval)
+			weekday = d.weekday() if self.weekday is None else self.weekday
+			nth = self.week_of_month or week_of_month_for(d)
+			return _nth_weekday(year, month, weekday, nth)
+		# MONTHLY: tanggal jangkar dipertahankan (31 Jan -> 28/29 Feb -> 31 Mar)
+		return self._add_months_anchored(d, self.interval)
+
+	def _add_months_anchored(self, d: date, months: int) -> date:
+		year, month = add_months(d.year, d.month, months)
+		anchor = self.day_of_month or d.day
+		return date(year, month, min(anchor, days_in_month(year, month)))
+
+	def occurrences(self, start: date, until: date):
+		"""Yield semua tanggal kejadian mulai `start` (inklusif) s.d. `until`/`end_date`."""
+		last = until if self.end_date is None else min(until, self.end_date)
+		current = start
+		while current <= last:
+			yield current
+			current = self.advance(current)
+
+	def is_finished(self, next_date: date) -> bool:
+		return self.end_date is not None and next_date > self.end_date
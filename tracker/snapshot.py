@@ -0,0 +1,256 @@
+import base64
+import gzip
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.color import no_style
+from django.core.serializers import sort_dependencies
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import balance_history, user_cache
+
+# Snapshot cadangan: file JSON Lines ter-gzip, satu record per baris.
+#   {"type": "header", ...}                     format, jenis (full/incremental), waktu
+#   {"type": "model", "model", "fields"}        urutan kolom untuk record rows
+#   {"type": "rows", "model", "rows": [[...]]}  potongan baris (chunk)
+#   {"type": "pks", "model", "ranges"}          hanya incremental: seluruh pk yang masih ada
+#   {"type": "end", "counts"}
+# Pembacaan dan penulisan berjalan per chunk, jadi memori tetap kecil untuk riwayat panjang.
+
+SNAPSHOT_FORMAT = 'progresharian-snapshot'
+SNAPSHOT_VERSION = 1
+EXCLUDED_MODELS = {'tracker.job'}
+# Event live dan profil request hanya data diagnostik sementara: tidak pernah dicadangkan
+EPHEMERAL_MODELS = {'tracker.liveevent', 'tracker.requestprofile'}
+# Pemilik data ikut dicadangkan, tetapi hanya di-upsert (tidak dikosongkan/dihapus)
+# supaya tabel auth lain yang merujuknya (log admin, grup) tidak ikut tersentuh.
+UPSERT_MODELS = {settings.AUTH_USER_MODEL.lower()}
+
+
+class SnapshotError(Exception):
+	pass
+
+
+class SnapshotEncoder(DjangoJSONEncoder):
+	def default(self, o):
+		# BinaryField.to_python membaca kembali string base64
+		if isinstance(o, (bytes, memoryview)):
+			return base64.b64encode(bytes(o)).decode('ascii')
+		# Presisi penuh (mikrodetik); DjangoJSONEncoder memotong ke milidetik
+		if isinstance(o, datetime):
+			return o.isoformat()
+		return super().default(o)
+
+
+def snapshot_models(include_jobs: bool = False):
+	models = sort_dependencies([(apps.get_app_config('tracker'), None)], allow_cycles=True)
+	owners = [apps.get_model(label) for label in sorted(UPSERT_MODELS)]
+	models = [m for m in models if m._meta.label_lower not in EPHEMERAL_MODELS]
+	return owners + [m for m in models if include_jobs or m._meta.label_lower not in EXCLUDED_MODELS]
+
+
+def change_field(model):
+	"""Kolom waktu yang dipakai mode incremental untuk mendeteksi baris berubah."""
+	names = {f.name for f in model._meta.concrete_fields}
+	for name in ('updated_at', 'archived_at', 'created_at'):
+		if name in names:
+			return name
+	return None
+
+
+def _attnames(model):
+	return [f.attname for f in model._meta.concrete_fields]
+
+
+def _pk_ranges(values):
+	ranges = []
+	for pk in values:
+		if ranges and pk == ranges[-1][1] + 1:
+			ranges[-1][1] = pk
+		else:
+			ranges.append([pk, pk])
+	return ranges
+
+
+def _chunks(iterable, size):
+	iterator = iter(iterable)
+	while chunk := list(islice(iterator, size)):
+		yield chunk
+
+
+def read_header(path):
+	with gzip.open(path, 'rt', encoding='utf-8') as fh:
+		header = json.loads(fh.readline() or '{}')
+	if header.get('type') != 'header' or header.get('format') != SNAPSHOT_FORMAT:
+		raise SnapshotError(f'{path} bukan file snapshot')
+	if header.get('version') != SNAPSHOT_VERSION:
+		raise SnapshotError(f'Versi snapshot {header.get("version")} tidak didukung')
+	return header
+
+
+def write_snapshot(path, since=None, chunk_size: int = 2000, include_jobs: bool = False, compresslevel: int = 6) -> dict:
+	"""Tulis snapshot penuh, atau incremental bila `since` (datetime) diberikan."""
+	models = snapshot_models(include_jobs)
+	# Dicatat sebelum membaca: baris yang berubah selama proses ikut di snapshot berikutnya
+	taken_at = timezone.now()
+	counts = {}
+
+	with gzip.open(path, 'wt', encoding='utf-8', compresslevel=compresslevel) as fh:
+		def emit(record):
+			fh.write(json.dumps(record, cls=SnapshotEncoder, separators=(',', ':')))
+			fh.write('\n')
+
+		emit({
+			'type': 'header', 'format': SNAPSHOT_FORMAT, 'version': SNAPSHOT_VERSION,
+			'kind': 'incremental' if since else 'full', 'taken_at': taken_at, 'since': since,
+			'models': [m._meta.label_lower for m in models],
+		})
+		# Satu transaksi baca agar seluruh tabel konsisten satu sama lain
+		with transaction.atomic():
+			for model in models:
+				label = model._meta.label_lower
+				fields = _attnames(model)
+				emit({'type': 'model', 'model': label, 'fields': fields})
+				qs = model._base_manager.order_by('pk')
+				if since:
+					field = change_field(model)
+					if field:
+						qs = qs.filter(**{f'{field}__gte': since})
+				count = 0
+				for chunk in _chunks(qs.values_list(*fields).iterator(chunk_size=chunk_size), chunk_size):
+					emit({'type': 'rows', 'model': label, 'rows': chunk})
+					count += len(chunk)
+				if since and label not in UPSERT_MODELS:
+					# Daftar pk yang masih ada, supaya restore bisa menghapus baris yang hilang
+					pks = model._base_manager.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=10000)
+					emit({'type': 'pks', 'model': label, 'ranges': _pk_ranges(pks)})
+				counts[label] = count
+		emit({'type': 'end', 'counts': counts})
+	return {'taken_at': taken_at, 'kind': 'incremental' if since else 'full', 'counts': counts}
+
+
+def _records(path):
+	with gzip.open(path, 'rt', encoding='utf-8') as fh:
+		for line in fh:
+			if line.strip():
+				yield json.loads(line)
+
+
+@contextmanager
+def _preserve_timestamps(model):
+	# bulk_create menjalankan pre_save: matikan auto_now/auto_now_add sementara
+	# agar created_at/updated_at dari snapshot tidak ditimpa waktu sekarang
+	touched = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+	saved = [(f, f.auto_now, f.auto_now_add) for f in touched]
+	for f in touched:
+		f.auto_now = f.auto_now_add = False
+	try:
+		yield
+	finally:
+		for f, auto_now, auto_now_add in saved:
+			f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class _ModelLoader:
+	def __init__(self, model, fields):
+		self.model = model
+		known = {f.attname: f for f in model._meta.concrete_fields}
+		unknown = [name for name in fields if name not in known]
+		if unknown:
+			raise SnapshotError(f'Kolom {", ".join(unknown)} tidak ada di {model._meta.label_lower}')
+		self.fields = [known[name] for name in fields]
+		# Jalur cepat: urutan kolom sama persis dengan model, pakai argumen posisi
+		self.positional = fields == list(known)
+		self.update_fields = [f.name for f in self.fields if not f.primary_key]
+
+	def build(self, rows):
+		decoded = ([field.to_python(value) for field, value in zip(self.fields, row)] for row in rows)
+		if self.positional:
+			return [self.model(*values) for values in decoded]
+		return [self.model(**{f.attname: v for f, v in zip(self.fields, values)}) for values in decoded]
+
+
+def _apply(paths, batch_size, using):
+	counts = {}
+	loaders = {}
+	touched = set()
+	for index, path in enumerate(paths):
+		incremental = index > 0
+		for record in _records(path):
+			kind = record.get('type')
+			if kind == 'model':
+				model = apps.get_model(record['model'])
+				loaders[record['model']] = _ModelLoader(model, record['fields'])
+				touched.add(model)
+			elif kind == 'rows':
+				loader = loaders[record['model']]
+				objs = loader.build(record['rows'])
+				with _preserve_timestamps(loader.model):
+					if incremental or record['model'] in UPSERT_MODELS:
+						loader.model._base_manager.using(using).bulk_create(
+							objs, batch_size=batch_size, update_conflicts=True,
+							unique_fields=[loader.model._meta.pk.name], update_fields=loader.update_fields,
+						)
+					else:
+						loader.model._base_manager.using(using).bulk_create(objs, batch_size=batch_size)
+				counts[record['model']] = counts.get(record['model'], 0) + len(objs)
+			elif kind == 'pks':
+				model = loaders[record['model']].model
+				_delete_missing(model, record['ranges'], using)
+	return counts, touched
+
+
+def _delete_missing(model, ranges, using):
+	keep = set()
+	for start, end in ranges:
+		keep.update(range(start, end + 1))
+	current = model._base_manager.using(using).values_list('pk', flat=True).iterator(chunk_size=10000)
+	missing = [pk for pk in current if pk not in keep]
+	for doomed in _chunks(missing, 1000):
+		# Tanpa collector/sinyal: baris anak yang ikut hilang juga tercatat di snapshot
+		qs = model._base_manager.using(using).filter(pk__in=doomed)
+		qs._raw_delete(using)
+
+
+def _check_chain(paths):
+	headers = [read_header(path) for path in paths]
+	if headers[0]['kind'] != 'full':
+		raise SnapshotError('Snapshot pertama harus snapshot penuh')
+	for previous, header in zip(headers, headers[1:]):
+		if header['kind'] != 'incremental':
+			raise SnapshotError('Snapshot lanjutan harus incremental')
+		if parse_datetime(header['since']) != parse_datetime(previous['taken_at']):
+			raise SnapshotError(f'Snapshot incremental {header["taken_at"]} tidak melanjutkan {previous["taken_at"]}')
+	return headers
+
+
+def restore_snapshot(paths, batch_size: int = 2000, using=None) -> dict:
+	"""Pulihkan snapshot penuh lalu terapkan snapshot incremental berikutnya sesuai urutan.
+
+	Seluruh proses berjalan dalam satu transaksi; pemeriksaan foreign key ditunda sampai
+	semua baris masuk, sehingga urutan insert tidak penting.
+	"""
+	headers = _check_chain(paths)
+	models = [apps.get_model(label) for label in headers[0]['models']]
+	using = using or router.db_for_write(models[0])
+	connection = connections[using]
+	with transaction.atomic(using=using):
+		with connection.constraint_checks_disabled():
+			tables = [m._meta.db_table for m in models if m._meta.label_lower not in UPSERT_MODELS]
+			connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables))
+			counts, touched = _apply(paths, batch_size, using)
+		connection.check_constraints(table_names=[m._meta.db_table for m in touched])
+		# pk dipulihkan apa adanya; sinkronkan sequence (PostgreSQL) dengan nilai terbesar
+		with connection.cursor() as cursor:
+			for sql in connection.ops.sequence_reset_sql(no_style(), models):
+				cursor.execute(sql)
+	user_cache.invalidate()
+	balance_history.invalidate()
+	return counts
@@ -1,3 +1,1182 @@
-from django.test import TestCase
+import http.client
+import importlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, OperationalError, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.views import View
+
+from . import api, balance_history, charts, checks, db_router, jobs, journal_terms, live, profiling, user_cache
+from .archive import archive_before, ranged, sum_over
+from .categories import autocomplete, merge_categories
+from .admin import BoundedCountPaginator
+from .management.commands.loadtest import LoadClient, UnconfirmedWrite
+from .health_metrics import parse_metrics
+from .month_calendar import month_activity
+from .middleware import PIN_COOKIE
+from .views import QuickAddTransactionView, ReplicaReadMixin
+from .importers import PARSERS, ImportParseError, fingerprint_rows
+from .models import (
+	Account, ArchiveRun, ArchivedSaving, ArchivedTransaction, Category, CategoryAlias, DailyTask, ImportProfile, Job, JobStatus, HealthLog, JournalTerm,
+	LearningLog, LearningTopic, LiveEvent, LiveEventKind, MindfulnessLog, OfflineSubmission, RecurrenceFrequency, RecurringTask, RecurringTransaction,
+	RequestProfile, Saving, SavingsGoal, TaskCategory, Transaction, TransactionType, WaterIntake,
+)
+from .recurrence import LAST_WEEK, RecurrenceRule, _nth_weekday, week_of_month_for
+from .snapshot import read_header, restore_snapshot, write_snapshot
+
+# Test berjalan dengan DEBUG=False tanpa collectstatic: halaman yang dirender
+# memakai storage static biasa, bukan manifest
+plain_static = override_settings(STORAGES={**settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})
+
+
+class TempMediaMixin:
+	# File hasil job ditulis ke MEDIA_ROOT sementara, bukan ke direktori proyek
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		media = tempfile.mkdtemp()
+		cls.addClassCleanup(shutil.rmtree, media, ignore_errors=True)
+		cls.enterClassContext(override_settings(MEDIA_ROOT=media))
+
+
+class RecurrenceRuleTests(SimpleTestCase):
+	def test_monthly_keeps_anchor_through_short_months(self):
+		rule = RecurrenceRule(RecurrenceFrequency.MONTHLY, day_of_month=31)
+		self.assertEqual(
+			list(rule.occurrences(date(2025, 1, 31), date(2025, 5, 31))),
+			[date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30), date(2025, 5, 31)],
+		)
+
+	def test_monthly_leap_february(self):
+		rule = RecurrenceRule(RecurrenceFrequency.MONTHLY, day_of_month=30)
+		self.assertEqual(rule.advance(date(2024, 1, 30)), date(2024, 2, 29))
+		self.assertEqual(rule.advance(date(2024, 2, 29)), date(2024, 3, 30))
+
+	def test_month_end(self):
+		rule = RecurrenceRule(RecurrenceFrequency.MONTH_END)
+		self.assertEqual(
+			list(rule.occurrences(date(2024, 1, 31), date(2024, 4, 30))),
+			[date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)],
+		)
+
+	def test_month_end_with_interval_crosses_year(self):
+		rule = RecurrenceRule(RecurrenceFrequency.MONTH_END, interval=3)
+		self.assertEqual(rule.advance(date(2024, 11, 30)), date(2025, 2, 28))
+
+	def test_yearly_leap_day(self):
+		rule = RecurrenceRule(RecurrenceFrequency.YEARLY, day_of_month=29)
+		self.assertEqual(rule.advance(date(2024, 2, 29)), date(2025, 2, 28))
+		self.assertEqual(rule.advance(date(2027, 2, 28)), date(2028, 2, 29))
+
+	def test_nth_weekday(self):
+		# Selasa kedua tiap bulan
+		rule = RecurrenceRule(RecurrenceFrequency.NTH_WEEKDAY, week_of_month=2, weekday=1)
+		self.assertEqual(
+			list(rule.occurrences(date(2025, 1, 14), date(2025, 3, 31))),
+			[date(2025, 1, 14), date(2025, 2, 11), date(2025, 3, 11)],
+		)
+
+	def test_last_weekday_of_month(self):
+		# Jumat terakhir tiap bulan
+		rule = RecurrenceRule(RecurrenceFrequency.NTH_WEEKDAY, week_of_month=LAST_WEEK, weekday=4)
+		self.assertEqual(
+			list(rule.occurrences(date(2025, 1, 31), date(2025, 4, 30))),
+			[date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 28), date(2025, 4, 25)],
+		)
+
+	def test_fifth_weekday_falls_back_to_last(self):
+		self.assertEqual(_nth_weekday(2025, 2, 0, 5), date(2025, 2, 24))
+		self.assertEqual(week_of_month_for(date(2025, 1, 29)), LAST_WEEK)
+		self.assertEqual(week_of_month_for(date(2025, 1, 8)), 2)
+
+	def test_occurrences_stop_at_end_date(self):
+		rule = RecurrenceRule(RecurrenceFrequency.WEEKLY, interval=2, end_date=date(2025, 1, 29))
+		self.assertEqual(
+			list(rule.occurrences(date(2025, 1, 1), date(2025, 12, 31))),
+			[date(2025, 1, 1), date(2025, 1, 15), date(2025, 1, 29)],
+		)
+		self.assertTrue(rule.is_finished(date(2025, 2, 12)))
+
+
+@plain_static
+class BoundedCountPaginatorTests(TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.staff = get_user_model().objects.create_user('staf', password='x', is_staff=True, is_superuser=True)
+		DailyTask.objects.bulk_create(
+			DailyTask(user=cls.staff, date=date(2025, 1, 1), category=TaskCategory.DAILY, title=f'Tugas {i}') for i in range(30)
+		)
+
+	def _paginator(self, page_number):
+		with mock.patch.object(BoundedCountPaginator, 'max_count', 10):
+			return BoundedCountPaginator(DailyTask.objects.order_by('pk'), 5, page_number=page_number)
+
+	def test_count_is_capped_and_flagged(self):
+		paginator = self._paginator(1)
+		self.assertEqual(paginator.count, 10)
+		self.assertTrue(paginator.capped)
+
+	def test_window_follows_requested_page(self):
+		paginator = self._paginator(5)
+		# Batas = 4 halaman sebelumnya + max_count -> 30 baris terhitung semua
+		self.assertEqual(paginator.count, 30)
+		self.assertFalse(paginator.capped)
+		self.assertEqual(len(paginator.page(6).object_list), 5)
+
+	def test_changelist_reaches_pages_past_cap(self):
+		self.client.force_login(self.staff)
+		model_admin = admin.site._registry[DailyTask]
+		with mock.patch.object(BoundedCountPaginator, 'max_count', 10), mock.patch.object(model_admin, 'list_per_page', 5):
+			first = self.client.get('/admin/tracker/dailytask/')
+			self.assertContains(first, '10+')
+			last = self.client.get('/admin/tracker/dailytask/?p=6')
+		self.assertEqual(last.status_code, 200)
+		self.assertEqual(len(last.context['cl'].result_list), 5)
+		self.assertNotContains(last, '30+')
+
+
+def _failing_job(job):
+	raise RuntimeError('boom')
+
+
+def _invalid_job(job):
+	raise jobs.PermanentJobError('input salah')
+
+
+def _ok_job(job):
+	job.result = {'message': 'ok'}
+
+
+@mock.patch.dict(jobs.HANDLERS, {'test_fail': _failing_job, 'test_invalid': _invalid_job, 'test_ok': _ok_job})
+class JobQueueTests(TestCase):
+	def _running(self, kind, attempts, locked_at=None, max_attempts=3):
+		return Job.objects.create(
+			kind=kind, status=JobStatus.RUNNING, attempts=attempts, max_attempts=max_attempts, locked_at=locked_at or timezone.now(),
+		)
+
+	def test_failure_is_retried_with_backoff(self):
+		job = jobs.run_job(self._running('test_fail', attempts=1))
+		job.refresh_from_db()
+		self.assertEqual(job.status, JobStatus.PENDING)
+		self.assertGreater(job.run_after, timezone.now())
+		self.assertIsNone(job.locked_at)
+		self.assertIn('RuntimeError: boom', job.error)
+
+	def test_last_attempt_fails_permanently(self):
+		job = jobs.run_job(self._running('test_fail', attempts=3))
+		job.refresh_from_db()
+		self.assertEqual(job.status, JobStatus.FAILED)
+		self.assertIsNotNone(job.finished_at)
+
+	def test_permanent_error_is_not_retried(self):
+		job = jobs.run_job(self._running('test_invalid', attempts=1))
+		job.refresh_from_db()
+		self.assertEqual(job.status, JobStatus.FAILED)
+
+	def test_success(self):
+		job = jobs.run_job(self._running('test_ok', attempts=1))
+		job.refresh_from_db()
+		self.assertEqual(job.status, JobStatus.DONE)
+		self.assertEqual(job.result, {'message': 'ok'})
+
+	def test_claim_next_takes_due_job_once(self):
+		job = Job.objects.create(kind='test_ok')
+		Job.objects.create(kind='test_ok', run_after=timezone.now() + timedelta(hours=1))
+		claimed = jobs.claim_next()
+		self.assertEqual(claimed.pk, job.pk)
+		self.assertEqual((claimed.status, claimed.attempts), (JobStatus.RUNNING, 1))
+		self.assertIsNone(jobs.claim_next())
+
+	def test_requeue_stale(self):
+		old = timezone.now() - timedelta(hours=2)
+		retry = self._running('test_ok', attempts=1, locked_at=old)
+		exhausted = self._running('test_ok', attempts=3, locked_at=old)
+		fresh = self._running('test_ok', attempts=1)
+		self.assertEqual(jobs.requeue_stale(timedelta(minutes=30)), 1)
+		retry.refresh_from_db()
+		exhausted.refresh_from_db()
+		fresh.refresh_from_db()
+		self.assertEqual((retry.status, retry.locked_at), (JobStatus.PENDING, None))
+		self.assertEqual(exhausted.status, JobStatus.FAILED)
+		self.assertIsNotNone(exhausted.finished_at)
+		self.assertIn('percobaan terakhir', exhausted.error)
+		self.assertEqual(fresh.status, JobStatus.RUNNING)
+
+
+class ExportViewTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.client.force_login(self.user)
+
+	def test_exports_enqueue_only_on_post(self):
+		for url, kind in (
+			('/finance/transaction/export.csv', 'export_transactions_csv'),
+			('/finance/saving/export.csv', 'export_savings_csv'),
+			('/finance/export/analytics', 'export_analytics'),
+		):
+			with self.subTest(url=url):
+				self.assertEqual(self.client.get(url).status_code, 405)
+				self.assertFalse(Job.objects.filter(kind=kind).exists())
+				response = self.client.post(url)
+				job = Job.objects.get(kind=kind)
+				self.assertEqual(job.user, self.user)
+				self.assertRedirects(response, f'/jobs/{job.pk}?next=%2Fsaldo', fetch_redirect_response=False)
+
+
+OFX_SAMPLE = b"""OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250103120000<TRNAMT>-45000.00<FITID>A1<NAME>Warung<MEMO>makan siang
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250105<TRNAMT>1500000<FITID>A2<NAME>Gaji
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class StatementParserTests(SimpleTestCase):
+	def _parse(self, code, data, profile=None):
+		return list(PARSERS[code](profile).parse(data))
+
+	def test_csv_default_columns(self):
+		rows = self._parse('csv', b'date,type,amount,category,note\n2025-01-02,EXPENSE,12.50,Makan,nasi\n2025-01-03,INCOME,100,,\nrusak,EXPENSE,1,,\n')
+		self.assertEqual([(r['date'], r['type'], r['amount'], r['category']) for r in rows], [
+			(date(2025, 1, 2), TransactionType.EXPENSE, Decimal('12.50'), 'Makan'),
+			(date(2025, 1, 3), TransactionType.INCOME, Decimal('100'), ''),
+		])
+
+	def test_csv_profile_debit_credit_decimal_comma(self):
+		profile = ImportProfile(
+			delimiter=';', date_column='Tanggal', date_format='%d/%m/%Y', amount_column='', debit_column='Debit',
+			credit_column='Kredit', note_column='Keterangan', decimal_comma=True,
+		)
+		rows = self._parse('csv', b'Tanggal;Keterangan;Debit;Kredit\n02/01/2025;Listrik;1.250.000,50;\n03/01/2025;Transfer masuk;;2.000,00\n', profile)
+		self.assertEqual([(r['date'], r['type'], r['amount'], r['note']) for r in rows], [
+			(date(2025, 1, 2), TransactionType.EXPENSE, Decimal('1250000.50'), 'Listrik'),
+			(date(2025, 1, 3), TransactionType.INCOME, Decimal('2000.00'), 'Transfer masuk'),
+		])
+
+	def test_ofx_sgml(self):
+		rows = self._parse('ofx', OFX_SAMPLE)
+		self.assertEqual([(r['date'], r['type'], r['amount'], r['note'], r['external_id']) for r in rows], [
+			(date(2025, 1, 3), TransactionType.EXPENSE, Decimal('45000.00'), 'Warung makan siang', 'A1'),
+			(date(2025, 1, 5), TransactionType.INCOME, Decimal('1500000'), 'Gaji', 'A2'),
+		])
+
+	def test_qif(self):
+		rows = self._parse('qif', b'!Type:Bank\nD03/01/2025\nT-20,000.00\nPToko\nLBelanja\n^\nD04/01/2025\nT500\n^\n')
+		self.assertEqual([(r['date'], r['type'], r['amount'], r['category']) for r in rows], [
+			(date(2025, 1, 3), TransactionType.EXPENSE, Decimal('20000.00'), 'Belanja'),
+			(date(2025, 1, 4), TransactionType.INCOME, Decimal('500'), ''),
+		])
+
+	def test_jsonl_rejects_invalid_line(self):
+		rows = self._parse('jsonl', b'{"date": "2025-01-02", "amount": -5, "id": 7}\n')
+		self.assertEqual((rows[0]['type'], rows[0]['amount'], rows[0]['external_id']), (TransactionType.EXPENSE, Decimal('5'), '7'))
+		with self.assertRaises(ImportParseError):
+			self._parse('jsonl', b'{"date": "2025-01-02", "amount": 1}\nbukan json\n')
+
+	def test_fingerprints_stable_and_keep_identical_rows(self):
+		data = b'date,type,amount,note\n2025-01-02,EXPENSE,10,kopi\n2025-01-02,EXPENSE,10,kopi\n'
+		first = [r['fingerprint'] for r in fingerprint_rows(self._parse('csv', data))]
+		second = [r['fingerprint'] for r in fingerprint_rows(self._parse('csv', data))]
+		self.assertEqual(first, second)
+		self.assertEqual(len(set(first)), 2)
+
+
+@override_settings(JOBS_EAGER=True)
+class ImportDedupTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.account = Account.objects.create(user=self.user, name='Bank')
+
+	def _import(self, data, fmt):
+		job = jobs.enqueue('import_transactions', {'account_id': self.account.pk, 'format': fmt}, input_data=data, user=self.user)
+		job.refresh_from_db()
+		self.assertEqual(job.status, JobStatus.DONE, job.error)
+		return job.result
+
+	def test_reimport_does_not_duplicate(self):
+		csv_data = b'date,type,amount,note\n2025-01-02,EXPENSE,10,kopi\n2025-01-02,EXPENSE,10,kopi\n2025-01-03,INCOME,50,\n'
+		self.assertEqual(self._import(csv_data, 'csv')['created'], 3)
+		self.assertEqual(self._import(csv_data, 'csv')['created'], 0)
+		self.assertEqual(self._import(OFX_SAMPLE, 'ofx')['created'], 2)
+		self.assertEqual(self._import(OFX_SAMPLE, 'ofx')['created'], 0)
+		self.assertEqual(Transaction.objects.filter(account=self.account).count(), 5)
+
+	def test_reimport_with_corrected_amount_updates_by_fitid(self):
+		self._import(OFX_SAMPLE, 'ofx')
+		self._import(OFX_SAMPLE.replace(b'-45000.00', b'-47000.00'), 'ofx')
+		self.assertEqual(Transaction.objects.get(account=self.account, note__startswith='Warung').amount, Decimal('47000.00'))
+		self.assertEqual(Transaction.objects.filter(account=self.account).count(), 2)
+
+
+class ArchiveSnapshotTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.account = Account.objects.create(user=self.user, name='Bank', initial_balance=Decimal('100'))
+		self.goal = SavingsGoal.objects.create(user=self.user, name='Laptop', target_amount=Decimal('1000'))
+		self.cutoff = date(2025, 1, 1)
+		for day, kind, amount in [(date(2024, 6, 1), TransactionType.INCOME, '500'), (date(2024, 7, 1), TransactionType.EXPENSE, '80'), (date(2025, 2, 1), TransactionType.EXPENSE, '20')]:
+			Transaction.objects.create(user=self.user, account=self.account, date=day, type=kind, amount=Decimal(amount))
+		Saving.objects.create(user=self.user, account=self.account, goal=self.goal, date=date(2024, 8, 1), amount=Decimal('150'))
+		Saving.objects.create(user=self.user, account=self.account, goal=self.goal, date=date(2025, 3, 1), amount=Decimal('50'))
+		self.tmp = tempfile.mkdtemp()
+
+	def tearDown(self):
+		for name in os.listdir(self.tmp):
+			os.remove(os.path.join(self.tmp, name))
+		os.rmdir(self.tmp)
+
+	def _balance(self):
+		return Account.objects.with_balance().get(pk=self.account.pk).annotated_balance
+
+	def _saved(self):
+		return SavingsGoal.objects.with_saved_amount().get(pk=self.goal.pk).annotated_saved_amount
+
+	def test_archive_keeps_balances_and_ranged_reaches_archive(self):
+		balance, saved = self._balance(), self._saved()
+		counts = archive_before(self.cutoff)
+		self.assertEqual((counts['transaction'], counts['saving']), (2, 1))
+		self.assertEqual(Transaction.objects.count(), 1)
+		self.assertEqual(ArchivedTransaction.objects.count(), 2)
+		self.assertEqual(ArchivedSaving.objects.get().goal_id, self.goal.pk)
+		self.assertEqual((self._balance(), self._saved()), (balance, saved))
+		# Rentang setelah cutoff tidak menyentuh arsip; rentang lama ikut menjumlahkan arsip
+		self.assertEqual(len(ranged(Transaction, start=self.cutoff, user=self.user)), 1)
+		everything = ranged(Transaction, start=date(2024, 1, 1), user=self.user, type=TransactionType.EXPENSE)
+		self.assertEqual(sum_over(everything, 'amount'), Decimal('100'))
+
+	def test_full_and_incremental_snapshot_restore_round_trip(self):
+		archive_before(self.cutoff)
+		full = os.path.join(self.tmp, 'full.jsonl.gz')
+		taken = write_snapshot(full)['taken_at']
+		self.assertEqual(read_header(full)['kind'], 'full')
+		# Perubahan setelah snapshot penuh: satu transaksi baru, satu dihapus, satu diubah
+		Transaction.objects.create(user=self.user, account=self.account, date=date(2025, 4, 1), type=TransactionType.INCOME, amount=Decimal('7'))
+		Saving.objects.filter(date=date(2025, 3, 1)).delete()
+		Account.objects.filter(pk=self.account.pk).update(name='Bank Utama', updated_at=timezone.now())
+		incremental = os.path.join(self.tmp, 'incr.jsonl.gz')
+		write_snapshot(incremental, since=taken)
+		expected = (self._balance(), self._saved(), sorted(Transaction.objects.values_list('pk', 'amount')))
+
+		# Data rusak/hilang setelah snapshot terakhir
+		Transaction.objects.all().delete()
+		ArchivedTransaction.objects.all().delete()
+		Saving.objects.create(user=self.user, account=self.account, date=date(2025, 5, 1), amount=Decimal('999'))
+		Account.objects.filter(pk=self.account.pk).update(archived_net=0)
+
+		restore_snapshot([full, incremental])
+		self.assertEqual((self._balance(), self._saved(), sorted(Transaction.objects.values_list('pk', 'amount'))), expected)
+		self.assertEqual(Account.objects.get(pk=self.account.pk).name, 'Bank Utama')
+		self.assertEqual(ArchivedTransaction.objects.count(), 2)
+		self.assertEqual(Saving.objects.count(), 0)
+		self.assertEqual(ArchivedSaving.objects.count(), 1)
+
+	def test_incremental_snapshot_includes_advanced_recurring_template(self):
+		today = timezone.localdate()
+		template = RecurringTransaction.objects.create(
+			user=self.user, account=self.account, type=TransactionType.EXPENSE, amount=Decimal('15'),
+			frequency=RecurrenceFrequency.MONTHLY, next_date=today,
+		)
+		taken = write_snapshot(os.path.join(self.tmp, 'full.jsonl.gz'))['taken_at']
+		job = jobs.run_job(Job.objects.create(kind='generate_recurring_finance', status=JobStatus.RUNNING, user=self.user, locked_at=timezone.now()))
+		self.assertEqual(job.status, JobStatus.DONE)
+		template.refresh_from_db()
+		self.assertGreater(template.next_date, today)
+		# bulk_update tidak memicu auto_now; template yang maju harus tetap ikut snapshot incremental
+		result = write_snapshot(os.path.join(self.tmp, 'incr.jsonl.gz'), since=taken)
+		self.assertEqual(result['counts']['tracker.recurringtransaction'], 1)
+
+
+class _ReadAliasView(ReplicaReadMixin, View):
+	# Melaporkan alias baca yang dipilih router tanpa menjalankan query
+	def get(self, request):
+		return HttpResponse(router.db_for_read(Account))
+
+
+@plain_static
+class ReplicaRoutingTests(TestCase):
+	replica = {**settings.DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+	def setUp(self):
+		patcher = mock.patch.object(db_router, '_replica_down_until', 0.0)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_reads_inside_block_go_to_replica(self):
+		with mock.patch.dict(settings.DATABASES, {db_router.REPLICA_ALIAS: self.replica}), mock.patch.object(db_router, 'connections') as conns:
+			with db_router.read_from_replica(True) as alias:
+				self.assertEqual(alias, db_router.REPLICA_ALIAS)
+				self.assertEqual(Account.objects.all().db, db_router.REPLICA_ALIAS)
+				# Tulis selalu ke primary walaupun di dalam blok replica
+				self.assertEqual(router.db_for_write(Account), 'default')
+			conns[db_router.REPLICA_ALIAS].ensure_connection.assert_called_once_with()
+		self.assertEqual(Account.objects.all().db, 'default')
+
+	def test_falls_back_to_primary_without_replica(self):
+		self.assertNotIn(db_router.REPLICA_ALIAS, settings.DATABASES)
+		with db_router.read_from_replica(True) as alias:
+			self.assertIsNone(alias)
+			self.assertEqual(Account.objects.all().db, 'default')
+
+	def test_falls_back_to_primary_when_replica_is_down(self):
+		with mock.patch.dict(settings.DATABASES, {db_router.REPLICA_ALIAS: self.replica}), mock.patch.object(db_router, 'connections') as conns:
+			conns[db_router.REPLICA_ALIAS].ensure_connection.side_effect = OperationalError('replica mati')
+			with self.assertLogs('tracker.db_router', 'WARNING'), db_router.read_from_replica(True) as alias:
+				self.assertIsNone(alias)
+				self.assertEqual(Account.objects.all().db, 'default')
+			# Selama jeda RETRY_AFTER_SECONDS replica tidak dicoba lagi
+			with db_router.read_from_replica(True) as alias:
+				self.assertIsNone(alias)
+			self.assertEqual(conns[db_router.REPLICA_ALIAS].ensure_connection.call_count, 1)
+
+	def test_write_pins_next_get_to_primary(self):
+		user = get_user_model().objects.create_user('ani', password='x')
+		account = Account.objects.create(user=user, name='Bank')
+		self.client.force_login(user)
+		factory = RequestFactory()
+		with mock.patch.dict(settings.DATABASES, {db_router.REPLICA_ALIAS: self.replica}), mock.patch.object(db_router, 'replica_available', return_value=True):
+			self.assertEqual(_ReadAliasView.as_view()(factory.get('/reports')).content.decode(), db_router.REPLICA_ALIAS)
+			response = self.client.post('/finance/transaction/add', {'date': '2025-01-02', 'type': 'EXPENSE', 'amount': '5', 'account_id': account.pk})
+			pin = response.cookies[PIN_COOKIE]
+			self.assertEqual(pin['max-age'], settings.READ_YOUR_WRITES_SECONDS)
+			pinned = factory.get('/reports')
+			pinned.COOKIES[PIN_COOKIE] = pin.value
+			self.assertEqual(_ReadAliasView.as_view()(pinned).content.decode(), 'default')
+			# GET tidak memperpanjang pin
+			self.assertNotIn(PIN_COOKIE, self.client.get('/reports').cookies)
+
+
+class ResolvedRefTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.account = Account.objects.create(user=self.user, name='Bank')
+
+	def test_learning_log_topic_change_resolves_new_topic(self):
+		log = LearningLog.objects.create(user=self.user, date=date(2025, 1, 2), topic='Python', duration_minutes=30)
+		self.assertEqual(log.topic_ref.key, 'python')
+		log = LearningLog.objects.get(pk=log.pk)
+		log.topic = 'Public Speaking'
+		log.save(update_fields=['topic'])
+		self.assertEqual(LearningLog.objects.get(pk=log.pk).topic_ref.name, 'Public Speaking')
+		# Simpan ulang tanpa mengubah teks tidak menimpa topik yang dipilih manual
+		manual = LearningTopic.objects.create(user=self.user, name='Retorika')
+		log.topic_ref = manual
+		log.save()
+		self.assertEqual(LearningLog.objects.get(pk=log.pk).topic_ref, manual)
+
+	def test_update_fields_without_text_leaves_ref(self):
+		log = LearningLog.objects.create(user=self.user, date=date(2025, 1, 2), topic='Python')
+		ref = log.topic_ref
+		log.topic = 'Go'
+		log.save(update_fields=['duration_minutes'])
+		self.assertEqual(LearningLog.objects.get(pk=log.pk).topic_ref, ref)
+
+	def test_transaction_category_change_resolves_new_category(self):
+		tx = Transaction.objects.create(user=self.user, account=self.account, date=date(2025, 1, 2), type=TransactionType.EXPENSE, amount=Decimal('5'), category='Makan')
+		tx = Transaction.objects.get(pk=tx.pk)
+		tx.category = 'Transport'
+		tx.save()
+		self.assertEqual(Transaction.objects.get(pk=tx.pk).category_ref.name, 'Transport')
+
+
+class HealthMetricsTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.client.force_login(self.user)
+
+	def _add(self, **fields):
+		return self.client.post('/logs/health/add', {'date': '2025-01-02', 'activity': 'Lari', **fields})
+
+	def test_parse_metrics_drops_values_beyond_columns(self):
+		self.assertEqual(parse_metrics('5,2 km 30 menit'), {'distance_km': Decimal('5.20'), 'minutes': 30})
+		self.assertEqual(parse_metrics('123456 km'), {})
+		self.assertEqual(parse_metrics('40000 set'), {})
+
+	def test_form_metrics_override_parsed_text(self):
+		self.assertEqual(self._add(duration_or_sets='3x12', reps='10', distance_km='2,5').status_code, 302)
+		log = HealthLog.objects.get()
+		self.assertEqual((log.sets, log.reps, log.distance_km), (3, 10, Decimal('2.50')))
+
+	def test_out_of_range_or_non_finite_metrics_are_rejected(self):
+		for fields in ({'minutes': '99999999999999999999'}, {'distance_km': 'Infinity'}, {'distance_km': 'NaN'}, {'distance_km': '100000'}, {'sets': '-1'}):
+			with self.subTest(fields=fields):
+				self.assertEqual(self._add(**fields).status_code, 302)
+		self.assertFalse(HealthLog.objects.exists())
+
+
+class JournalTermTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+
+	def _counts(self):
+		return dict(JournalTerm.objects.filter(field='gratitude').values_list('term', 'count'))
+
+	def test_index_follows_edit_and_delete(self):
+		entry = MindfulnessLog.objects.create(user=self.user, date=date(2025, 1, 2), gratitude='Kopi pagi dan kopi sore')
+		MindfulnessLog.objects.create(user=self.user, date=date(2025, 1, 9), gratitude='kopi')
+		self.assertEqual(self._counts(), {'kopi': 3, 'pagi': 1, 'sore': 1})
+		entry.gratitude = 'Teh pagi'
+		entry.save()
+		self.assertEqual(self._counts(), {'kopi': 1, 'pagi': 1, 'teh': 1})
+		entry.delete()
+		self.assertEqual(self._counts(), {'kopi': 1})
+
+	def test_insert_conflict_is_retried(self):
+		bulk_create = JournalTerm.objects.bulk_create
+		calls = []
+
+		def racing_bulk_create(objs, *args, **kwargs):
+			calls.append(len(objs))
+			if len(calls) == 1:
+				raise IntegrityError('UNIQUE constraint failed: uniq_journal_term')
+			return bulk_create(objs, *args, **kwargs)
+
+		with mock.patch.object(JournalTerm.objects, 'bulk_create', side_effect=racing_bulk_create):
+			MindfulnessLog.objects.create(user=self.user, date=date(2025, 1, 2), gratitude='kopi')
+		self.assertEqual(len(calls), 2)
+		self.assertEqual(self._counts(), {'kopi': 1})
+
+	def test_gives_up_after_repeated_conflicts(self):
+		with mock.patch.object(JournalTerm.objects, 'bulk_create', side_effect=IntegrityError('uniq_journal_term')) as bulk_create:
+			with self.assertRaises(IntegrityError):
+				journal_terms.apply_delta({(self.user.pk, date(2025, 1, 1), 'gratitude', 'kopi'): 1})
+		self.assertEqual(bulk_create.call_count, journal_terms.APPLY_ATTEMPTS)
+
+
+@plain_static
+@override_settings(JOBS_EAGER=True)
+class UserIsolationTests(TempMediaMixin, TestCase):
+	# Semua data budi memuat kata "rahasia"; tidak boleh muncul di halaman mana pun milik ani
+	def setUp(self):
+		# Token versi user_cache ada di cache bersama dan invalidasinya menunggu commit,
+		# yang tidak pernah terjadi di TestCase: mulai tiap test dengan cache kosong
+		cache.clear()
+		User = get_user_model()
+		self.ani = User.objects.create_user('ani', password='x')
+		self.budi = User.objects.create_user('budi', password='x')
+		today = timezone.localdate()
+		budi = self.budi
+		self.account = Account.objects.create(user=budi, name='Rahasia Budi', initial_balance=Decimal('1000'))
+		goal = SavingsGoal.objects.create(user=budi, name='Rahasia Motor', target_amount=Decimal('5000'))
+		self.tx = Transaction.objects.create(user=budi, account=self.account, date=today, type=TransactionType.INCOME, amount=Decimal('777'), category='Rahasiagaji', note='rahasia')
+		self.saving = Saving.objects.create(user=budi, account=self.account, goal=goal, date=today, amount=Decimal('55'), note='rahasia')
+		self.task = DailyTask.objects.create(user=budi, date=today, category=TaskCategory.DAILY, title='Rahasia tugas')
+		LearningLog.objects.create(user=budi, date=today, topic='Rahasia topik', duration_minutes=45)
+		HealthLog.objects.create(user=budi, date=today, activity='Rahasia lari', duration_or_sets='5 km')
+		MindfulnessLog.objects.create(user=budi, date=today, gratitude='rahasia')
+		WaterIntake.objects.create(user=budi, date=today, glasses=3)
+		self.recurring = RecurringTransaction.objects.create(user=budi, account=self.account, type=TransactionType.EXPENSE, amount=Decimal('10'), category='Rahasiasewa', note='rahasia', next_date=today)
+		RecurringTask.objects.create(user=budi, category=TaskCategory.DAILY, title='Rahasia rutin', next_date=today)
+		self.job = Job.objects.create(user=budi, kind='export_transactions_csv', status=JobStatus.DONE, output_data=b'rahasia', output_name='rahasia.csv')
+		LiveEvent.objects.create(user=budi, kind=LiveEventKind.TASK, payload={'title': 'Rahasia tugas'})
+		self.client.force_login(self.ani)
+
+	def assertPrivate(self, response):
+		self.assertEqual(response.status_code, 200)
+		body = b''.join(response.streaming_content) if response.streaming else response.content
+		if body.startswith(b'PK'):
+			with zipfile.ZipFile(io.BytesIO(body)) as archive:
+				body = b''.join(archive.read(name) for name in archive.namelist())
+		self.assertNotIn('rahasia', body.decode().lower())
+
+	def test_pages_and_api_show_only_own_data(self):
+		for url in (
+			'/', '/saldo', f'/saldo?account_id={self.account.pk}', '/reports', '/reports/learning', '/reports/themes',
+			'/calendar', '/finance/forecast', '/finance/categories/autocomplete?q=rah',
+			'/api/dashboard', '/api/saldo', f'/api/saldo?account_id={self.account.pk}', '/api/reports', '/live/events?after=0',
+		):
+			with self.subTest(url=url):
+				self.assertPrivate(self.client.get(url))
+		self.assertEqual(live.poll(self.ani.pk, 0), (0, []))
+
+	def test_other_users_objects_are_not_found(self):
+		for url in (f'/jobs/{self.job.pk}', f'/jobs/{self.job.pk}/status', f'/jobs/{self.job.pk}/download'):
+			with self.subTest(url=url):
+				self.assertEqual(self.client.get(url).status_code, 404)
+		self.assertEqual(self.client.post(f'/tasks/{self.task.pk}/toggle').status_code, 404)
+		self.client.post(f'/finance/transaction/{self.tx.pk}/edit', {'amount': '1', 'note': 'diubah'})
+		self.client.post(f'/finance/saving/{self.saving.pk}/edit', {'amount': '1'})
+		self.client.post(f'/finance/recurring/{self.recurring.pk}/edit', {'amount': '1'})
+		self.client.post(f'/finance/transaction/{self.tx.pk}/delete')
+		self.client.post(f'/finance/recurring/{self.recurring.pk}/delete')
+		self.task.refresh_from_db()
+		self.tx.refresh_from_db()
+		self.saving.refresh_from_db()
+		self.recurring.refresh_from_db()
+		self.assertFalse(self.task.is_completed)
+		self.assertEqual((self.tx.amount, self.tx.note), (Decimal('777'), 'rahasia'))
+		self.assertEqual(self.saving.amount, Decimal('55'))
+		self.assertEqual((self.recurring.amount, self.recurring.is_active), (Decimal('10'), True))
+
+	def test_writes_with_other_users_account_use_own_account(self):
+		self.client.post('/finance/transaction/add', {'date': '2025-01-02', 'type': 'EXPENSE', 'amount': '5', 'account_id': self.account.pk})
+		self.client.post('/finance/saving/add', {'date': '2025-01-02', 'amount': '5', 'account_id': self.account.pk})
+		self.client.post('/finance/recurring/create', {'type': 'EXPENSE', 'amount': '5', 'next_date': '2025-01-02', 'frequency': 'MONTHLY', 'account_id': self.account.pk})
+		self.assertEqual(Transaction.objects.filter(account=self.account).count(), 1)
+		self.assertEqual(Saving.objects.filter(account=self.account).count(), 1)
+		self.assertEqual(RecurringTransaction.objects.filter(account=self.account).count(), 1)
+		self.assertEqual(Transaction.objects.get(user=self.ani).account.user, self.ani)
+		self.assertEqual(Saving.objects.get(user=self.ani).account.user, self.ani)
+
+	def test_exports_contain_only_own_rows(self):
+		for url in ('/finance/transaction/export.csv', '/finance/saving/export.csv', '/finance/export/analytics'):
+			with self.subTest(url=url):
+				self.client.post(url, {'account_id': self.account.pk})
+				job = Job.objects.filter(user=self.ani).latest('pk')
+				self.assertEqual(job.status, JobStatus.DONE, job.error)
+				self.assertPrivate(self.client.get(f'/jobs/{job.pk}/download'))
+
+
+@plain_static
+class CalendarTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.client.force_login(self.user)
+
+	def test_out_of_range_month_falls_back_to_current_month(self):
+		current = timezone.localdate().strftime('%Y-%m')
+		for value in ('9999-12', '0001-01', '2025-13', '10000-01', 'abc'):
+			with self.subTest(month=value):
+				response = self.client.get('/calendar', {'month': value})
+				self.assertEqual(response.status_code, 200)
+				self.assertEqual(response.context['month'].strftime('%Y-%m'), current)
+		self.assertEqual(self.client.get('/calendar', {'month': '2025-02'}).context['month'], date(2025, 2, 1))
+
+	def test_query_count_per_month(self):
+		with self.assertNumQueries(7):
+			month_activity(self.user, 2025, 2)
+		ArchiveRun.objects.create(cutoff=date(2025, 6, 1))
+		with self.assertNumQueries(13):
+			month_activity(self.user, 2025, 2)
+
+
+# TestCase membungkus tiap test dalam transaksi, dan user_cache sengaja tidak
+# menyimpan apa pun selama blok atomic terbuka: pakai TransactionTestCase
+class UserCacheTests(TransactionTestCase):
+	def setUp(self):
+		cache.clear()
+		user_cache._local.clear()
+		self.addCleanup(user_cache._local.clear)
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.account = Account.objects.create(user=self.user, name='Bank')
+		self.goal = SavingsGoal.objects.create(user=self.user, name='Laptop', target_amount=Decimal('1000'))
+
+	def test_warm_hit_runs_no_queries(self):
+		# Panggilan pertama membuat preferensi, dan pembuatan itu sendiri menaikkan versi
+		user_cache.preferences(self.user)
+		user_cache.preferences(self.user)
+		user_cache.accounts(self.user)
+		user_cache.goals(self.user)
+		user_cache.preferences(self.user)
+		with self.assertNumQueries(0):
+			self.assertEqual([a.name for a in user_cache.accounts(self.user)], ['Bank'])
+			self.assertEqual([g.name for g in user_cache.goals(self.user)], ['Laptop'])
+			self.assertEqual(user_cache.preferences(self.user).user_id, self.user.pk)
+
+	def test_commit_bumps_version_and_next_read_refetches(self):
+		user_cache.accounts(self.user)
+		before = user_cache._version(self.user.pk)
+		with transaction.atomic():
+			Account.objects.create(user=self.user, name='Tunai')
+			# Belum di-commit: versi belum berubah untuk worker lain
+			self.assertEqual(user_cache._version(self.user.pk), before)
+		self.assertNotEqual(user_cache._version(self.user.pk), before)
+		with self.assertNumQueries(1):
+			self.assertEqual([a.name for a in user_cache.accounts(self.user)], ['Bank', 'Tunai'])
+
+	def test_bypassed_inside_atomic_block(self):
+		with transaction.atomic():
+			Account.objects.create(user=self.user, name='Tunai')
+			for _ in range(2):
+				with self.assertNumQueries(1):
+					self.assertEqual(len(user_cache.accounts(self.user)), 2)
+			self.assertNotIn((self.user.pk, 'accounts'), user_cache._local)
+			transaction.set_rollback(True)
+		# Akun dari transaksi yang di-rollback tidak tertinggal di cache
+		self.assertEqual([a.name for a in user_cache.accounts(self.user)], ['Bank'])
+
+	@override_settings(JOBS_EAGER=True)
+	def test_bulk_and_queryset_update_paths_invalidate(self):
+		self.assertEqual(user_cache.goals(self.user)[0].annotated_saved_amount, 0)
+		# Impor tabungan memakai bulk_create (tanpa sinyal post_save)
+		jobs.enqueue('import_savings_csv', {'account_id': self.account.pk}, input_data=b'date,amount,goal\n2024-06-01,150,Laptop\n', user=self.user)
+		self.assertEqual(user_cache.goals(self.user)[0].annotated_saved_amount, Decimal('150'))
+		self.assertEqual(user_cache.accounts(self.user)[0].archived_net, 0)
+		# Arsip memindahkan saldo lewat QuerySet.update()
+		archive_before(date(2025, 1, 1))
+		self.assertEqual(user_cache.accounts(self.user)[0].archived_net, Decimal('-150'))
+		self.assertEqual(user_cache.goals(self.user)[0].annotated_saved_amount, Decimal('150'))
+
+
+class BalanceHistoryCacheTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.account = Account.objects.create(user=self.user, name='Bank', initial_balance=Decimal('100'))
+
+	def _add(self, day, amount):
+		with self.captureOnCommitCallbacks(execute=True):
+			Transaction.objects.create(user=self.user, account=self.account, date=day, type=TransactionType.INCOME, amount=Decimal(amount))
+
+	def _balances(self):
+		return [(day, balance) for day, _, balance in balance_history.history(self.account)]
+
+	def test_cache_is_truncated_from_changed_date(self):
+		self._add(date(2025, 1, 1), '10')
+		self._add(date(2025, 1, 5), '20')
+		self.assertEqual(self._balances(), [(date(2025, 1, 1), Decimal('110')), (date(2025, 1, 5), Decimal('130'))])
+		self._add(date(2025, 1, 3), '5')
+		self.assertEqual(self._balances(), [(date(2025, 1, 1), Decimal('110')), (date(2025, 1, 3), Decimal('115')), (date(2025, 1, 5), Decimal('135'))])
+		# Cache hit: hanya hari setelah tanggal terakhir di cache yang dibaca
+		with self.assertNumQueries(1):
+			self._balances()
+
+	def test_invalidation_during_read_is_not_overwritten(self):
+		self._add(date(2025, 1, 1), '10')
+		self._balances()
+		read_flows = balance_history._daily_flows
+
+		def racing_flows(account_id, since=None):
+			rows = list(read_flows(account_id, since))
+			# Transaksi lain di-commit setelah arus kas dibaca, sebelum hasilnya disimpan
+			self._add(date(2025, 1, 2), '7')
+			return iter(rows)
+
+		self._add(date(2025, 1, 1), '1')
+		with mock.patch.object(balance_history, '_daily_flows', side_effect=racing_flows):
+			stale = self._balances()
+		self.assertEqual(stale, [(date(2025, 1, 1), Decimal('111'))])
+		self.assertEqual(self._balances(), [(date(2025, 1, 1), Decimal('111')), (date(2025, 1, 2), Decimal('118'))])
+
+
+@override_settings(LIVE_WSGI_RETRY_SECONDS=15)
+class LiveEventsTests(TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.client.force_login(self.user)
+		self.events = [LiveEvent.objects.create(user=self.user, kind=LiveEventKind.WATER, payload={'date': '2025-01-02', 'glasses': n}) for n in (1, 2)]
+
+	def test_wsgi_answers_once_with_retry_interval(self):
+		response = self.client.get('/live/events', {'after': 0})
+		self.assertFalse(response.streaming)
+		self.assertEqual(response['Content-Type'], 'text/event-stream')
+		body = response.content.decode()
+		self.assertTrue(body.startswith('retry: 15000\n\n'))
+		self.assertEqual(body.count('event: water'), 2)
+
+	def test_reconnect_resumes_after_last_event_id(self):
+		body = self.client.get('/live/events', headers={'Last-Event-ID': str(self.events[0].pk)}).content.decode()
+		self.assertIn(f'id: {self.events[1].pk}\n', body)
+		self.assertEqual(body.count('event: water'), 1)
+		# Halaman baru tanpa kursor mulai dari event terakhir; kursor di luar rentang diabaikan
+		for params in ({}, {'after': '9' * 30}):
+			with self.subTest(params=params):
+				self.assertEqual(self.client.get('/live/events', params).content.decode(), 'retry: 15000\n\n')
+
+
+class LoadClientTests(SimpleTestCase):
+	def _client(self, *responses):
+		conn = mock.Mock()
+		conn.getresponse.side_effect = responses
+		client = LoadClient(8765, 1, 'sesi', [])
+		return client, conn
+
+	def test_dropped_keepalive_get_is_retried(self):
+		ok = mock.Mock(status=200, **{'read.return_value': b'ok'})
+		client, conn = self._client(http.client.RemoteDisconnected('tutup'), ok)
+		with mock.patch('http.client.HTTPConnection', return_value=conn):
+			self.assertEqual(client.request('GET', '/'), (200, b'ok'))
+		self.assertEqual(conn.request.call_count, 2)
+
+	def test_sent_post_is_not_retried(self):
+		client, conn = self._client(http.client.RemoteDisconnected('tutup'))
+		with mock.patch('http.client.HTTPConnection', return_value=conn):
+			with self.assertRaises(UnconfirmedWrite):
+				client.request('POST', '/water/add')
+		self.assertEqual(conn.request.call_count, 1)
+		self.assertEqual(len(client.csrf), 32)
+
+
+@plain_static
+@override_settings(PROFILE_SAMPLE_RATE=0)
+class ProfilingTests(TestCase):
+	def setUp(self):
+		self.staff = get_user_model().objects.create_user('staf', password='x', is_staff=True)
+		self.user = get_user_model().objects.create_user('ani', password='x')
+
+	def test_flag_is_honored_only_for_staff(self):
+		self.assertEqual(self.client.get('/saldo?_profile=1').status_code, 302)
+		self.client.force_login(self.user)
+		self.assertEqual(self.client.get('/saldo?_profile=1').status_code, 200)
+		self.assertFalse(RequestProfile.objects.exists())
+
+		self.client.force_login(self.staff)
+		self.assertEqual(self.client.get('/saldo?_profile=1').status_code, 200)
+		profile = RequestProfile.objects.get()
+		self.assertEqual((profile.user, profile.method, profile.path, profile.sampled), (self.staff, 'GET', '/saldo?_profile=1', False))
+		self.assertEqual(profile.view_name, 'tracker.views.SaldoView')
+		self.assertGreater(profile.sql_count, 0)
+		self.assertTrue(profile.queries)
+		self.assertTrue(any(row['function'].startswith('tracker/views.py:') for row in profile.functions))
+
+	def test_trim_keeps_exactly_max_rows(self):
+		RequestProfile.objects.bulk_create(RequestProfile(method='GET', path=f'/p/{i}') for i in range(7))
+		newest = list(RequestProfile.objects.order_by('-id').values_list('id', flat=True)[:3])
+		with override_settings(PROFILE_MAX_ROWS=3):
+			profiling.trim_profiles()
+		self.assertEqual(sorted(RequestProfile.objects.values_list('id', flat=True)), sorted(newest))
+		profiling.trim_profiles(keep=3)
+		self.assertEqual(RequestProfile.objects.count(), 3)
+
+	def test_concurrent_request_passes_through_unprofiled(self):
+		self.client.force_login(self.staff)
+		# Profil lain sedang berjalan: request tetap dilayani, hanya tanpa profil
+		self.assertTrue(profiling._lock.acquire(blocking=False))
+		try:
+			self.assertEqual(self.client.get('/saldo?_profile=1').status_code, 200)
+		finally:
+			profiling._lock.release()
+		self.assertFalse(RequestProfile.objects.exists())
+
+
+# Pengaturan yang dibaca tracker.checks.performance_checks
+CHECKED_SETTINGS = ('ENVIRONMENT', 'DEBUG', 'PERF_CHECK_STRICT', 'TEMPLATES', 'SESSION_ENGINE', 'MESSAGE_STORAGE', 'CACHES', 'STORAGES', 'PROFILE_SAMPLE_RATE')
+
+
+def _production_settings(**env):
+	# Dimuat ulang tersendiri: production.py mengubah TEMPLATES/DATABASES milik base.py di tempat
+	package = sys.modules['dailyprogress.settings']
+	environ = {'DATABASE_URL': 'sqlite:///db.sqlite3', 'DEBUG': 'false', 'PROFILE_SAMPLE_RATE': '0', 'PERF_CHECK_STRICT': 'true', 'REDIS_URL': '', **env}
+	with mock.patch.dict(sys.modules), mock.patch.dict(package.__dict__), mock.patch.dict(os.environ, environ):
+		for name in ('dailyprogress.settings.base', 'dailyprogress.settings.production'):
+			sys.modules.pop(name, None)
+		module = importlib.import_module('dailyprogress.settings.production')
+	return {name: getattr(module, name) for name in CHECKED_SETTINGS}, module.DATABASES['default']
+
+
+class PerformanceChecksTests(SimpleTestCase):
+	def _issues(self, env=None, database=None, **overrides):
+		profile, default_db = _production_settings(**(env or {}))
+		with override_settings(**{**profile, **overrides}), mock.patch.dict(settings.DATABASES, {'default': database or default_db}):
+			return checks.performance_checks()
+
+	def test_production_profile_is_silent(self):
+		self.assertEqual(self._issues(), [])
+		self.assertEqual(self._issues(env={'DATABASE_URL': 'postgres://u:p@db.example:5432/progres'}), [])
+		self.assertEqual(self._issues(env={'DATABASE_URL': 'postgres://u:p@db.example:5432/progres', 'DB_POOL': 'false'}), [])
+
+	def test_only_production_is_checked(self):
+		self.assertEqual(self._issues(ENVIRONMENT='development', DEBUG=True, SESSION_ENGINE='django.contrib.sessions.backends.db'), [])
+
+	def test_each_misconfiguration_reports_its_id(self):
+		uncached = [{'BACKEND': 'django.template.backends.django.DjangoTemplates', 'DIRS': [], 'APP_DIRS': False, 'OPTIONS': {
+			'loaders': ['django.template.loaders.app_directories.Loader'],
+		}}]
+		cases = [
+			('tracker.E001', {'DEBUG': True, 'PERF_CHECK_STRICT': False}),
+			('tracker.W001', {'TEMPLATES': uncached}),
+			('tracker.W002', {'SESSION_ENGINE': 'django.contrib.sessions.backends.db'}),
+			('tracker.W003', {'MESSAGE_STORAGE': 'django.contrib.messages.storage.session.SessionStorage'}),
+			('tracker.W004', {'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}}),
+			('tracker.W005', {'database': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'db.sqlite3'}}),
+			('tracker.W006', {'database': {'ENGINE': 'django.db.backends.postgresql', 'NAME': 'progres', 'CONN_MAX_AGE': 0, 'OPTIONS': {}}}),
+			('tracker.W007', {'PROFILE_SAMPLE_RATE': 0.5}),
+			('tracker.W008', {'STORAGES': {**settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}}}),
+		]
+		for check_id, overrides in cases:
+			with self.subTest(check_id):
+				issues = self._issues(**overrides)
+				self.assertEqual([issue.id for issue in issues], [check_id])
+				self.assertFalse(issues[0].is_serious())
+
+	def test_strict_debug_is_an_error_and_blocks_startup(self):
+		profile, default_db = _production_settings()
+		with override_settings(**{**profile, 'DEBUG': True}), mock.patch.dict(settings.DATABASES, {'default': default_db}):
+			issues = checks.performance_checks()
+			self.assertEqual([(issue.id, issue.is_serious()) for issue in issues], [('tracker.E001', True)])
+			with self.assertLogs('tracker.checks', 'ERROR'), self.assertRaisesMessage(ImproperlyConfigured, 'tracker.E001'):
+				checks.enforce_on_startup()
+		# Tanpa PERF_CHECK_STRICT hanya peringatan di log, boot tetap berjalan
+		with override_settings(**{**profile, 'DEBUG': True, 'PERF_CHECK_STRICT': False}), mock.patch.dict(settings.DATABASES, {'default': default_db}):
+			with self.assertLogs('tracker.checks', 'WARNING'):
+				checks.enforce_on_startup()
+
+
+# TransactionTestCase: indeks autocomplete hanya disimpan di luar blok atomic (lihat UserCacheTests)
+class CategoryTests(TransactionTestCase):
+	def setUp(self):
+		cache.clear()
+		user_cache._local.clear()
+		self.addCleanup(user_cache._local.clear)
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.account = Account.objects.create(user=self.user, name='Bank')
+		self.lunch = Category.objects.create(user=self.user, name='Makan Siang')
+		self.snack = Category.objects.create(user=self.user, name='Makanan Ringan')
+		Category.objects.create(user=self.user, name='Transport')
+		CategoryAlias.objects.create(user=self.user, category=self.snack, key='jajan')
+
+	def _names(self, prefix):
+		return [item['name'] for item in autocomplete(self.user, prefix)]
+
+	def test_prefix_and_alias_matching(self):
+		self.assertEqual(self._names('MAK '), ['Makan Siang', 'Makanan Ringan'])
+		self.assertEqual(self._names('makanan'), ['Makanan Ringan'])
+		# Cocok di awal kata berikutnya dan lewat alias
+		self.assertEqual(self._names('sia'), ['Makan Siang'])
+		self.assertEqual(self._names('jaj'), ['Makanan Ringan'])
+		self.assertEqual(self._names('  '), [])
+		other = get_user_model().objects.create_user('budi', password='x')
+		self.assertEqual([item['name'] for item in autocomplete(other, 'mak')], [])
+		self.client.force_login(self.user)
+		response = self.client.get('/finance/categories/autocomplete', {'q': 'tra'})
+		self.assertEqual(response.json()['results'], [{'id': Category.objects.get(key='transport').pk, 'name': 'Transport'}])
+
+	def test_merge_repoints_rows_and_removes_source(self):
+		tx = Transaction.objects.create(user=self.user, account=self.account, date=date(2025, 2, 1), type=TransactionType.EXPENSE, amount=Decimal('10'), category='Mkn')
+		source = tx.category_ref
+		archived = ArchivedTransaction.objects.create(
+			user=self.user, account=self.account, date=date(2024, 2, 1), type=TransactionType.EXPENSE, amount=Decimal('5'),
+			category='mkn', category_ref=source, created_at=timezone.now(),
+		)
+		recurring = RecurringTransaction.objects.create(
+			user=self.user, account=self.account, type=TransactionType.EXPENSE, amount=Decimal('3'), category='MKN', next_date=date(2025, 3, 1),
+		)
+		CategoryAlias.objects.create(user=self.user, category=source, key='mkan')
+		self.assertEqual(recurring.category_ref, source)
+
+		result = merge_categories(self.lunch, ['Mkn', 'Makan Siang'])
+		self.assertEqual(result, {'moved': 3, 'aliases': 1})
+		self.assertFalse(Category.objects.filter(pk=source.pk).exists())
+		for model, pk in [(Transaction, tx.pk), (ArchivedTransaction, archived.pk), (RecurringTransaction, recurring.pk)]:
+			self.assertEqual(model.objects.get(pk=pk).category_ref_id, self.lunch.pk)
+		self.assertEqual(dict(CategoryAlias.objects.filter(category=self.lunch).values_list('key', 'category_id')), {'mkn': self.lunch.pk, 'mkan': self.lunch.pk})
+		# Teks lama berikutnya langsung jatuh ke target lewat alias
+		self.assertEqual(Category.objects.resolve(self.user.pk, ' MKN'), self.lunch)
+
+	def test_index_refreshes_after_rename_and_merge(self):
+		self.assertEqual(self._names('mak'), ['Makan Siang', 'Makanan Ringan'])
+		with self.assertNumQueries(0):
+			self.assertEqual(self._names('mak'), ['Makan Siang', 'Makanan Ringan'])
+		self.lunch.name = 'Makan Siang Kantor'
+		self.lunch.save()
+		self.assertEqual(self._names('mak'), ['Makan Siang Kantor', 'Makanan Ringan'])
+		merge_categories(self.lunch, ['Makanan Ringan'])
+		self.assertEqual(self._names('mak'), ['Makan Siang Kantor'])
+		# Alias milik kategori sumber ikut pindah ke target
+		self.assertEqual(self._names('jaj'), ['Makan Siang Kantor'])
+
+
+class ChartTests(SimpleTestCase):
+	def setUp(self):
+		cache.clear()
+
+	def test_empty_pie_shows_placeholder(self):
+		for values in ([], [0, 0], [-5]):
+			with self.subTest(values=values):
+				svg = charts.pie_chart(['A', 'B'][:len(values)], values)
+				self.assertIn('Belum ada data', svg)
+				self.assertNotIn('<path', svg)
+
+	def test_single_slice_is_full_circle(self):
+		svg = charts.pie_chart(['Makan', 'Transport'], [Decimal('250'), 0])
+		# Busur 360 derajat tidak bisa digambar dengan satu path arc: lingkaran penuh
+		self.assertNotIn('<path', svg)
+		self.assertEqual(svg.count('<circle'), 1)
+		self.assertIn('Makan (100%)', svg)
+		self.assertNotIn('Transport', svg)
+
+	def test_negative_values_keep_zero_in_scale(self):
+		for values in ([-30, 50], [-5, -20], [3, 7]):
+			with self.subTest(values=values):
+				low, high, step = charts._scale(values)
+				self.assertLessEqual(low, min(0, *values))
+				self.assertGreaterEqual(high, max(0, *values))
+		svg = charts.line_chart(['Jan', 'Feb'], [('Saldo', [-120, -40], '#fff')])
+		self.assertIn('text-anchor="end">0</text>', svg)
+		self.assertIn('text-anchor="end">-150</text>', svg)
+
+	def test_labels_are_escaped(self):
+		evil = '<script>x</script>'
+		outputs = [
+			charts.bar_chart([evil], [('A&B', [1], '#fff'), ('C', [2], '#000')]),
+			charts.hbar_chart([evil], [1], ['#fff']),
+			charts.pie_chart([evil], [1]),
+			charts.line_chart([evil, 'b'], [('A&B', [1, 2], '#fff'), ('C', [2, 3], '#000')], label=evil),
+		]
+		for svg in outputs:
+			with self.subTest(svg=svg[:40]):
+				self.assertNotIn('<script>', svg)
+				self.assertIn('&lt;script&gt;', svg)
+		self.assertIn('A&amp;B', outputs[0])
+
+	def test_identical_data_hits_cache(self):
+		with mock.patch.object(charts, '_svg', wraps=charts._svg) as render:
+			first = charts.bar_chart(['Jan'], [('Masuk', [Decimal('10.00')], '#fff')])
+			# Decimal dan float bernilai sama menghasilkan kunci yang sama
+			second = charts.bar_chart(['Jan'], [('Masuk', [10.0], '#fff')])
+			self.assertEqual(render.call_count, 1)
+			self.assertEqual(first, second)
+			charts.bar_chart(['Jan'], [('Masuk', [11], '#fff')])
+			self.assertEqual(render.call_count, 2)
+
+
+class ReadAPITests(TestCase):
+	urls = ('/api/dashboard', '/api/saldo', '/api/reports')
+
+	def setUp(self):
+		self.ani = get_user_model().objects.create_user('ani', password='x')
+		self.budi = get_user_model().objects.create_user('budi', password='x')
+		self.account = Account.objects.create(user=self.ani, name='Bank', initial_balance=Decimal('100'))
+		self.other = Account.objects.create(user=self.budi, name='Rahasia', initial_balance=Decimal('9999'))
+		for day, kind, amount in [(date(2024, 6, 1), TransactionType.INCOME, '500'), (date(2025, 2, 1), TransactionType.EXPENSE, '20.5'), (date(2025, 2, 3), TransactionType.EXPENSE, '4')]:
+			Transaction.objects.create(user=self.ani, account=self.account, date=day, type=kind, amount=Decimal(amount), category='Makan')
+		Transaction.objects.create(user=self.budi, account=self.other, date=date(2025, 2, 2), type=TransactionType.EXPENSE, amount=Decimal('777'), category='Makan')
+		archive_before(date(2025, 1, 1))
+		self.client.force_login(self.ani)
+
+	def test_anonymous_gets_json_401(self):
+		self.client.logout()
+		for url in self.urls:
+			with self.subTest(url):
+				response = self.client.get(url)
+				self.assertEqual(response.status_code, 401)
+				self.assertEqual(response['Content-Type'], 'application/json')
+				self.assertNotIn('Location', response)
+				self.assertIn('error', response.json())
+
+	def test_scoped_to_requesting_user(self):
+		dashboard = self.client.get('/api/dashboard').json()
+		self.assertEqual([a['name'] for a in dashboard['accounts']], ['Bank'])
+		saldo = self.client.get('/api/saldo', {'start': '2024-01-01'}).json()
+		self.assertEqual([a['name'] for a in saldo['accounts']], ['Bank'])
+		self.assertNotIn('777.00', [t['amount'] for t in saldo['transactions']])
+		self.assertEqual(len(saldo['transactions']), 3)
+		# Akun milik pengguna lain lewat account_id tidak membocorkan baris
+		self.assertEqual(self.client.get('/api/saldo', {'account_id': self.other.pk}).json()['transactions'], [])
+		reports = self.client.get('/api/reports', {'start': '2025-02-01', 'end': '2025-02-28'}).json()
+		self.assertEqual(reports['expense_total'], '24.50')
+
+	def test_limit_is_clamped(self):
+		def count(limit):
+			return len(self.client.get('/api/saldo', {'limit': limit}).json()['transactions'])
+
+		self.assertEqual(count('1'), 1)
+		self.assertEqual(count('0'), 1)
+		self.assertEqual(count('-5'), 1)
+		self.assertEqual(count('abc'), 2)
+		with mock.patch.object(api, 'MAX_LIST_LIMIT', 1):
+			self.assertEqual(count('1000'), 1)
+
+	def test_archive_included_only_when_start_reaches_cutoff(self):
+		cases = [({}, False, 2), ({'start': '2025-01-01'}, False, 2), ({'start': '2024-12-31'}, True, 2), ({'start': '2024-06-01'}, True, 3)]
+		for params, included, rows in cases:
+			with self.subTest(params=params):
+				saldo = self.client.get('/api/saldo', params).json()
+				self.assertIs(saldo['includes_archive'], included)
+				self.assertEqual(len(saldo['transactions']), rows)
+		reports = self.client.get('/api/reports', {'start': '2025-01-01', 'end': '2025-12-31'}).json()
+		self.assertEqual((reports['includes_archive'], reports['income_total']), (False, '0.00'))
+		reports = self.client.get('/api/reports', {'start': '2024-01-01', 'end': '2025-12-31'}).json()
+		self.assertEqual((reports['includes_archive'], reports['income_total']), (True, '500.00'))
+
+	def test_money_has_two_decimals(self):
+		dashboard = self.client.get('/api/dashboard').json()
+		self.assertEqual(dashboard['accounts'][0]['balance'], '575.50')
+		self.assertEqual(dashboard['total_balance'], '575.50')
+		self.assertEqual([t['amount'] for t in dashboard['recent_transactions']], ['4.00', '20.50'])
+		reports = self.client.get('/api/reports', {'start': '2025-02-01', 'end': '2025-02-28'}).json()
+		self.assertEqual(reports['by_category'], [{'category_id': Category.objects.get(user=self.ani, key='makan').pk, 'category': 'Makan', 'total': '24.50'}])
+
+
+@override_settings(JOBS_EAGER=True)
+class AnalyticsExportJobTests(TempMediaMixin, TestCase):
+	def setUp(self):
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		account = Account.objects.create(user=self.user, name='Bank')
+		Transaction.objects.create(user=self.user, account=account, date=date(2025, 1, 2), type=TransactionType.EXPENSE, amount=Decimal('12.50'), note='kopi')
+		self.client.force_login(self.user)
+
+	def test_archive_is_stored_as_file_and_streamed(self):
+		self.client.post('/finance/export/analytics', {'format': 'ndjson'})
+		job = Job.objects.get(user=self.user)
+		self.assertEqual(job.status, JobStatus.DONE, job.error)
+		self.assertIsNone(job.output_data)
+		self.assertTrue(job.output_file.name.endswith('.zip'))
+		path = job.output_file.path
+		response = self.client.get(f'/jobs/{job.pk}/download')
+		self.assertTrue(response.streaming)
+		self.assertIn(f'filename="{job.output_name}"', response['Content-Disposition'])
+		with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as archive:
+			rows = archive.read('transactions.ndjson').decode().splitlines()
+		self.assertEqual(len(rows), 1)
+		self.assertIn('"note": "kopi"', rows[0])
+		response.close()
+		job.delete()
+		self.assertFalse(os.path.exists(path))
+
+
+class OfflineReplayTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.user = get_user_model().objects.create_user('ani', password='x')
+		self.client.force_login(self.user)
+
+	def _replay(self, *items):
+		response = self.client.post('/offline/replay', {'items': list(items)}, content_type='application/json')
+		self.assertEqual(response.status_code, 200)
+		return response.json()
+
+	def _tx(self, client_id, amount='5000'):
+		return {'id': client_id, 'action': '/finance/transaction/add', 'fields': {'date': '2025-01-02', 'type': 'EXPENSE', 'amount': amount, 'csrfmiddlewaretoken': 'lama'}}
+
+	def test_replay_applies_once(self):
+		water = {'id': 'w1', 'action': '/water/add', 'fields': {}, 'queued_on': '2025-01-02'}
+		data = self._replay(self._tx('t1'), water)
+		self.assertEqual([r['status'] for r in data['results']], ['ok', 'ok'])
+		self.assertEqual(data['applied'], 2)
+		self.assertEqual(WaterIntake.objects.get(user=self.user).date, date(2025, 1, 2))
+		# Kiriman ulang (mis. jawaban sebelumnya tidak sampai) tidak menggandakan data
+		data = self._replay(self._tx('t1'), water)
+		self.assertEqual([r['status'] for r in data['results']], ['duplicate', 'duplicate'])
+		self.assertEqual(Transaction.objects.filter(user=self.user).count(), 1)
+
+	def test_errors_roll_back_only_their_entry(self):
+		data = self._replay(
+			{'id': 'x', 'action': '/admin/', 'fields': {}},
+			{'id': 't1', 'action': '/finance/transaction/add', 'fields': {'type': 'EXPENSE', 'amount': '1'}},
+			self._tx('t2', amount='bukan angka'),
+			self._tx('t3'),
+		)
+		self.assertEqual([r['status'] for r in data['results']], ['rejected', 'error', 'error', 'ok'])
+		self.assertEqual(set(OfflineSubmission.objects.values_list('client_id', flat=True)), {'t3'})
+		# Entri yang ditolak boleh dikirim lagi dengan id yang sama setelah diperbaiki
+		self.assertEqual(self._replay(self._tx('t2'))['results'][0]['status'], 'ok')
+
+	def test_database_error_is_reported_per_item(self):
+		apply = QuickAddTransactionView.apply
+
+		def flaky_apply(view, user, data):
+			if data['amount'] == '13':
+				raise OperationalError('database is locked')
+			return apply(view, user, data)
+
+		with mock.patch.object(QuickAddTransactionView, 'apply', flaky_apply):
+			data = self._replay(self._tx('t1', amount='13'), self._tx('t2'))
+		self.assertEqual(data['results'][0], {'id': 't1', 'status': 'error', 'message': 'Gagal menyimpan, akan dicoba lagi', 'retry': True})
+		self.assertEqual(data['results'][1]['status'], 'ok')
+		self.assertFalse(OfflineSubmission.objects.filter(client_id='t1').exists())
+		self.assertEqual(self._replay(self._tx('t1', amount='13'))['results'][0]['status'], 'ok')
@@ -0,0 +1,66 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .archive import ranged
+from .models import LearningLog, ArchivedLearningLog, LearningTopic, LearningTopicAlias, normalize_topic
+
+
+def merge_topics(target: LearningTopic, names) -> dict:
+	"""Gabungkan topik/ejaan `names` ke `target`.
+
+	Log milik topik sumber dipindah ke target, kunci sumber dicatat sebagai alias
+	(supaya input berikutnya langsung terpetakan) lalu topik sumber dihapus. Hanya
+	topik milik pengguna yang sama dengan `target` yang disentuh.
+	"""
+	moved = 0
+	aliases = 0
+	with transaction.atomic():
+		for name in names:
+			key = normalize_topic(name)
+			if not key or key == target.key:
+				continue
+			source = LearningTopic.objects.filter(user_id=target.user_id, key=key).exclude(pk=target.pk).first()
+			if source is not None:
+				moved += LearningLog.objects.filter(topic_ref=source).update(topic_ref=target, updated_at=timezone.now())
+				moved += ArchivedLearningLog.objects.filter(topic_ref=source).update(topic_ref=target)
+				LearningTopicAlias.objects.filter(topic=source).update(topic=target)
+				source.delete()
+			_, created = LearningTopicAlias.objects.update_or_create(user_id=target.user_id, key=key, defaults={'topic': target})
+			aliases += int(created)
+	return {'moved': moved, 'aliases': aliases}
+
+
+def backfill_topics(batch_size: int = 500) -> int:
+	"""Isi topic_ref untuk log lama: satu UPDATE per teks topik yang berbeda."""
+	updated = 0
+	for model in (LearningLog, ArchivedLearningLog):
+		texts = model.objects.filter(topic_ref__isnull=True).values_list('user_id', 'topic').distinct().order_by()
+		extra = {'updated_at': timezone.now()} if model is LearningLog else {}
+		for user_id, text in texts.iterator(chunk_size=batch_size):
+			topic = LearningTopic.objects.resolve(user_id, text)
+			if topic is not None:
+				updated += model.objects.filter(user_id=user_id, topic_ref__isnull=True, topic=text).update(topic_ref=topic, **extra)
+	return updated
+
+
+def minutes_by_topic(user, start, end, topic_id=None):
+	"""Total menit & sesi per topic_ref dalam rentang, dijumlahkan dari tabel aktif dan arsip."""
+	totals = defaultdict(lambda: {'minutes': 0, 'sessions': 0})
+	filters = {'topic_ref_id': topic_id} if topic_id else {}
+	for qs in ranged(LearningLog, start, end, user=user, **filters):
+		for row in qs.values('topic_ref_id').annotate(minutes=Sum('duration_minutes'), sessions=Count('id')).order_by():
+			totals[row['topic_ref_id']]['minutes'] += row['minutes'] or 0
+			totals[row['topic_ref_id']]['sessions'] += row['sessions']
+	return totals
+
+
+def monthly_minutes(user, topic_id, start, end):
+	months = defaultdict(int)
+	for qs in ranged(LearningLog, start, end, user=user, topic_ref_id=topic_id):
+		for row in qs.annotate(month=TruncMonth('date')).values('month').annotate(minutes=Sum('duration_minutes')).order_by():
+			months[row['month']] += row['minutes'] or 0
+	return sorted(months.items())
@@ -1,5 +1,7 @@
 from django.urls import path
-from .views import DashboardView, QuickAddTaskView, ToggleTaskDoneView, QuickAddTransactionView, QuickAddSavingView, WaterAddView, ReportsView, SuggestTasksAIView, AddLearningLogView, AddHealthLogView, AddMindfulnessLogView, DeleteTransactionView, SaldoView, CreateAccountView, EditTransactionView, EditSavingView, ExportTransactionsCSVView, ExportSavingsCSVView, ImportTransactionsCSVView, ImportSavingsCSVView, GenerateRecurringFinanceView, GenerateRecurringTasksView, RecurringTransactionCreateView, RecurringTransactionEditView, RecurringTransactionDeleteView
+from .api import DashboardSummaryAPI, ReportTotalsAPI, SaldoAPI
+from .offline import OfflinePageView, OfflineReplayView, ServiceWorkerView, WebManifestView
+from .views import DashboardView, QuickAddTaskView, ToggleTaskDoneView, QuickAddTransactionView, CategoryAutocompleteView, QuickAddSavingView, WaterAddView, ReportsView, LearningTopicReportView, JournalThemesView, CalendarView, SuggestTasksAIView, AddLearningLogView, AddHealthLogView, AddMindfulnessLogView, DeleteTransactionView, SaldoView, CreateAccountView, EditTransactionView, EditSavingView, ExportTransactionsCSVView, ExportSavingsCSVView, ExportAnalyticsView, ImportTransactionsCSVView, ImportSavingsCSVView, GenerateRecurringFinanceView, GenerateRecurringTasksView, RecurringTransactionCreateView, RecurringTransactionEditView, RecurringTransactionDeleteView, CashflowForecastView, JobDetailView, JobStatusView, JobDownloadView, LiveEventsView
 
 app_name = 'tracker'
 
@@ -18,15 +20,33 @@ urlpatterns = [
     path('finance/transaction/<int:transaction_id>/edit', EditTransactionView.as_view(), name='transaction-edit'),
     path('finance/transaction/export.csv', ExportTransactionsCSVView.as_view(), name='transaction-export'),
     path('finance/transaction/import', ImportTransactionsCSVView.as_view(), name='transaction-import'),
+    path('finance/categories/autocomplete', CategoryAutocompleteView.as_view(), name='category-autocomplete'),
 	path('finance/saving/add', QuickAddSavingView.as_view(), name='saving-add'),
     path('finance/saving/<int:saving_id>/edit', EditSavingView.as_view(), name='saving-edit'),
     path('finance/saving/export.csv', ExportSavingsCSVView.as_view(), name='saving-export'),
+    path('finance/export/analytics', ExportAnalyticsView.as_view(), name='analytics-export'),
     path('finance/saving/import', ImportSavingsCSVView.as_view(), name='saving-import'),
     path('finance/recurring/create', RecurringTransactionCreateView.as_view(), name='recurring-finance-create'),
     path('finance/recurring/<int:rt_id>/edit', RecurringTransactionEditView.as_view(), name='recurring-finance-edit'),
     path('finance/recurring/<int:rt_id>/delete', RecurringTransactionDeleteView.as_view(), name='recurring-finance-delete'),
+    path('finance/forecast', CashflowForecastView.as_view(), name='cashflow-forecast'),
 	path('water/add', WaterAddView.as_view(), name='water-add'),
     path('finance/recurring/generate', GenerateRecurringFinanceView.as_view(), name='recurring-finance-generate'),
 	path('reports', ReportsView.as_view(), name='reports'),
+	path('reports/learning', LearningTopicReportView.as_view(), name='learning-topics'),
+	path('reports/themes', JournalThemesView.as_view(), name='journal-themes'),
+	path('calendar', CalendarView.as_view(), name='calendar'),
     path('tasks/recurring/generate', GenerateRecurringTasksView.as_view(), name='recurring-tasks-generate'),
+    path('jobs/<int:job_id>', JobDetailView.as_view(), name='job-detail'),
+    path('jobs/<int:job_id>/status', JobStatusView.as_view(), name='job-status'),
+    path('jobs/<int:job_id>/download', JobDownloadView.as_view(), name='job-download'),
+	path('live/events', LiveEventsView.as_view(), name='live-events'),
+	path('api/dashboard', DashboardSummaryAPI.as_view(), name='api-dashboard'),
+	path('api/saldo', SaldoAPI.as_view(), name='api-saldo'),
+	path('api/reports', ReportTotalsAPI.as_view(), name='api-reports'),
+	# Service worker harus dilayani dari root supaya scope-nya seluruh situs
+	path('sw.js', ServiceWorkerView.as_view(), name='service-worker'),
+	path('manifest.webmanifest', WebManifestView.as_view(), name='web-manifest'),
+	path('offline', OfflinePageView.as_view(), name='offline'),
+	path('offline/replay', OfflineReplayView.as_view(), name='offline-replay'),
 ] 
\ No newline at end of file
@@ -0,0 +1,116 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Account, Category, CategoryAlias, Saving, SavingsGoal, UserPreferences
+
+# Cache per proses untuk objek milik pengguna yang jarang berubah (akun default,
+# preferensi, daftar akun, tujuan tabungan, indeks kategori transaksi). Nilai
+# disimpan di memori worker bersama token versi; token itu sendiri ada di cache
+# bersama (settings.CACHES), jadi perubahan di satu worker gunicorn membuat worker
+# lain memuat ulang.
+# Pada hit tidak ada query database sama sekali.
+
+MAX_ENTRIES = 2048
+GLOBAL_KEY = 'tracker:user-cache:global'
+
+_local = OrderedDict()
+_lock = threading.Lock()
+
+
+def _user_key(user_id) -> str:
+	return f'tracker:user-cache:user:{user_id}'
+
+
+def _version(user_id) -> tuple:
+	keys = [GLOBAL_KEY, _user_key(user_id)]
+	found = cache.get_many(keys)
+	for key in keys:
+		if key not in found:
+			# Versi belum ada (cache baru/di-evict): tetapkan, lalu baca nilai pemenangnya
+			cache.add(key, time.time_ns(), timeout=None)
+			found[key] = cache.get(key)
+	return tuple(found[key] for key in keys)
+
+
+def invalidate(user_id=None):
+	"""Naikkan versi milik satu pengguna, atau semua pengguna bila `user_id` None."""
+	key = GLOBAL_KEY if user_id is None else _user_key(user_id)
+	# Setelah commit: worker lain yang memuat sebelum commit tetap memegang versi lama
+	transaction.on_commit(lambda: cache.set(key, time.time_ns(), timeout=None))
+
+
+def _cached(user_id, name, load):
+	key = (user_id, name)
+	# Versi dibaca sebelum memuat: perubahan selama memuat memicu muat ulang berikutnya
+	version = _version(user_id)
+	with _lock:
+		hit = _local.get(key)
+		if hit is not None and hit[0] == version:
+			_local.move_to_end(key)
+			return hit[1]
+	value = load()
+	if transaction.get_connection(router.db_for_write(Account)).in_atomic_block:
+		# Dimuat (mungkin dibuat) di dalam transaksi yang belum di-commit, mis. savepoint
+		# replay offline: bila di-rollback, invalidasi on_commit-nya ikut hilang
+		return value
+	with _lock:
+		_local[key] = (version, value)
+		_local.move_to_end(key)
+		while len(_local) > MAX_ENTRIES:
+			_local.popitem(last=False)
+	return value
+
+
+def _primary(model):
+	# Selalu dari database utama: replica yang tertinggal tidak boleh ikut tersimpan di cache
+	return model.objects.using(router.db_for_write(model))
+
+
+def default_account(user) -> Account:
+	account = _cached(user.pk, 'default_account', lambda: _primary(Account).get_or_create(user=user, name='Dompet Utama', defaults={'initial_balance': 0})[0])
+	return copy.copy(account)
+
+
+def preferences(user) -> UserPreferences:
+	prefs = _cached(user.pk, 'preferences', lambda: _primary(UserPreferences).get_or_create(user=user)[0])
+	return copy.copy(prefs)
+
+
+def accounts(user) -> list:
+	return [copy.copy(a) for a in _cached(user.pk, 'accounts', lambda: list(_primary(Account).filter(user=user).order_by('name')))]
+
+
+def goals(user) -> list:
+	# Terkumpul ikut dihitung (annotated); Saving baru ikut menaikkan versi
+	return [copy.copy(g) for g in _cached(user.pk, 'goals', lambda: list(_primary(SavingsGoal).filter(user=user).with_saved_amount().order_by('-created_at')))]
+
+
+def category_index(user) -> tuple:
+	# Indeks prefiks autocomplete kategori (tracker/categories.py); tuple tak berubah, aman dibagi antar thread
+	from .categories import build_index
+	return _cached(user.pk, 'category_index', lambda: build_index(
+		list(_primary(Category).filter(user=user).values_list('id', 'name', 'key')),
+		list(_primary(CategoryAlias).filter(user=user).values_list('category_id', 'key')),
+	))
+
+
+def find_by_id(objects, object_id):
+	return next((obj for obj in objects if str(obj.pk) == str(object_id)), None) if object_id else None
+
+
+@receiver([post_save, post_delete], sender=Account)
+@receiver([post_save, post_delete], sender=SavingsGoal)
+@receiver([post_save, post_delete], sender=UserPreferences)
+@receiver([post_save, post_delete], sender=Saving)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=CategoryAlias)
+def _invalidate_owner(sender, instance, raw=False, **kwargs):
+	if not raw:
+		invalidate(instance.user_id)
@@ -1,22 +1,55 @@
-from django.shortcuts import render, redirect
-from django.http import HttpResponse
-import csv
+import mimetypes
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import FileResponse, HttpResponse, JsonResponse, Http404, StreamingHttpResponse
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme
+from urllib.parse import urlencode
 from django.views import View
 from django.utils import timezone
 from django.contrib import messages
-from django.db.models import Sum, Count
-from datetime import timedelta
-from .models import DailyTask, TaskCategory, Account, Transaction, TransactionType, Saving, UserPreferences, LearningLog, HealthLog, MindfulnessLog, WaterIntake, SavingsGoal, RecurringTransaction, RecurringTask, RecurrenceFrequency
+from django.db.models import Sum, Count, Q
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from .models import DailyTask, TaskCategory, Account, Transaction, TransactionType, Category, Saving, UserPreferences, LearningLog, HealthLog, MindfulnessLog, JournalField, WaterIntake, LearningTopic, RecurringTransaction, RecurrenceFrequency, Job, JobStatus, ImportProfile, ArchivedTransaction, ArchivedSaving
+from .archive import archive_cutoff, count_over, ranged, reaches_archive, sum_over
+from .forecast import project_balances
+from .recurrence import add_months
+from .importers import PARSERS, detect_format
+from .jobs import enqueue
+from .topics import minutes_by_topic, monthly_minutes
+from .categories import autocomplete
+from .health_metrics import parse_metrics, training_volume
+from .forms import HealthMetricsForm
+from .journal_terms import top_terms
+from .month_calendar import month_grid
+from .balance_history import daily_series
+from . import charts, live, user_cache
+from .db_router import read_from_replica
+from .middleware import pinned_to_primary
 
 
-def _get_or_create_default_account() -> Account:
-	account, _ = Account.objects.get_or_create(name='Dompet Utama', defaults={'initial_balance': 0})
-	return account
+# Akun default, preferensi, daftar akun dan tujuan tabungan berasal dari cache per
+# proses (tracker/user_cache.py): tanpa query selama datanya tidak berubah.
 
+def _get_or_create_default_account(user) -> Account:
+	return user_cache.default_account(user)
 
-def _get_or_create_preferences() -> UserPreferences:
-	prefs, _ = UserPreferences.objects.get_or_create(id=1)
-	return prefs
+
+def _get_or_create_preferences(user) -> UserPreferences:
+	return user_cache.preferences(user)
+
+
+def _account_or_default(user, account_id) -> Account:
+	return user_cache.find_by_id(user_cache.accounts(user), account_id) or _get_or_create_default_account(user)
+
+
+def _user_goal(user, goal_id):
+	return user_cache.find_by_id(user_cache.goals(user), goal_id)
 
 
 def _quote_of_the_day(date):
@@ -30,28 +63,32 @@ def _quote_of_the_day(date):
 	return quotes[date.toordinal() % len(quotes)]
 
 
-def _suggest_tasks_for_today(prefs: UserPreferences, today):
+def _suggest_tasks_for_today(user, prefs: UserPreferences, today):
+	tasks = DailyTask.objects.filter(user=user, date=today)
 	# Akademik
-	if not DailyTask.objects.filter(date=today, category=TaskCategory.ACADEMIC).exists():
+	if not tasks.filter(category=TaskCategory.ACADEMIC).exists():
 		focus = prefs.preferred_academic_focus or 'topik favoritmu'
 		DailyTask.objects.create(
+			user=user,
 			date=today,
 			category=TaskCategory.ACADEMIC,
 			title=f"Belajar: {focus} (45 menit)",
 			description=f"Fokus pada 1 sub-topik {focus}. Catat 3 poin penting.",
 		)
 	# Kesehatan
-	if not DailyTask.objects.filter(date=today, category=TaskCategory.HEALTH).exists():
+	if not tasks.filter(category=TaskCategory.HEALTH).exists():
 		health = prefs.preferred_health_focus or 'jalan cepat'
 		DailyTask.objects.create(
+			user=user,
 			date=today,
 			category=TaskCategory.HEALTH,
 			title=f"Olahraga: {health}",
 			description="Minimal 25-30 menit. Lakukan pemanasan & pendinginan.",
 		)
 	# Harian/Mindfulness
-	if not DailyTask.objects.filter(date=today, category=TaskCategory.DAILY).exists():
+	if not tasks.filter(category=TaskCategory.DAILY).exists():
 		DailyTask.objects.create(
+			user=user,
 			date=today,
 			category=TaskCategory.DAILY,
 			title="Mindfulness: Tulis 3 hal yang disyukuri",
@@ -64,8 +101,9 @@ class DashboardView(View):
 		today = timezone.localdate()
 		week_start = today - timedelta(days=today.weekday())
 		week_end = week_start + timedelta(days=6)
+		user = request.user
 
-		tasks_today = DailyTask.objects.filter(date=today).order_by('category', 'created_at')
+		tasks_today = DailyTask.objects.filter(user=user, date=today).order_by('category', 'created_at')
 		# Fokus hari ini: pick satu per kategori jika ada
 		focus = {
 			'academic': tasks_today.filter(category=TaskCategory.ACADEMIC).first(),
@@ -73,36 +111,43 @@ class DashboardView(View):
 			'daily': tasks_today.filter(category=TaskCategory.DAILY).first(),
 		}
 
-		account = _get_or_create_default_account()
-		recent_transactions = Transaction.objects.select_related('account').order_by('-date', '-id')[:5]
-		recent_savings = Saving.objects.select_related('account').order_by('-date', '-id')[:5]
+		account = _get_or_create_default_account(user)
+		recent_transactions = Transaction.objects.filter(user=user).select_related('account').order_by('-date', '-id')[:5]
+		recent_savings = Saving.objects.filter(user=user).select_related('account').order_by('-date', '-id')[:5]
 
-		# Weekly progress chart data: completed counts per day
-		weekly_counts = []
-		for i in range(7):
-			day = week_start + timedelta(days=i)
-			completed = DailyTask.objects.filter(date=day, is_completed=True).count()
-			total = DailyTask.objects.filter(date=day).count()
-			weekly_counts.append({'date': day.isoformat(), 'completed': completed, 'total': total})
+		# Grafik progres mingguan: jumlah tugas selesai/total per hari (satu query GROUP BY)
+		per_day = {
+			row['date']: row for row in DailyTask.objects.filter(user=user, date__range=(week_start, week_end))
+			.values('date').annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True))).order_by()
+		}
+		week_days = [week_start + timedelta(days=i) for i in range(7)]
+		weekly_chart = charts.bar_chart(
+			[day.strftime('%m-%d') for day in week_days],
+			[
+				('Selesai', [per_day.get(day, {}).get('completed', 0) for day in week_days], 'rgba(139,92,246,0.8)'),
+				('Total', [per_day.get(day, {}).get('total', 0) for day in week_days], 'rgba(236,72,153,0.45)'),
+			],
+			label='Progres mingguan',
+		)
 
 		# Water tracker
-		prefs = _get_or_create_preferences()
-		water_today, _ = WaterIntake.objects.get_or_create(date=today, defaults={'glasses': 0})
+		prefs = _get_or_create_preferences(user)
+		water_today, _ = WaterIntake.objects.get_or_create(user=user, date=today, defaults={'glasses': 0})
 
 		# Savings goals
-		goals = SavingsGoal.objects.all().order_by('-created_at')[:5]
+		goals = user_cache.goals(user)[:5]
 
 		# Recent logs
-		learning_recent = LearningLog.objects.order_by('-date', '-id')[:5]
-		health_recent = HealthLog.objects.order_by('-date', '-id')[:5]
-		mind_recent = MindfulnessLog.objects.order_by('-date', '-id')[:5]
+		learning_recent = LearningLog.objects.filter(user=user).order_by('-date', '-id')[:5]
+		health_recent = HealthLog.objects.filter(user=user).order_by('-date', '-id')[:5]
+		mind_recent = MindfulnessLog.objects.filter(user=user).order_by('-date', '-id')[:5]
 
 		# Streaks up to today
 		def _calc_streak(model_cls):
 			streak = 0
 			day = today
 			while True:
-				exists = model_cls.objects.filter(date=day).exists()
+				exists = model_cls.objects.filter(user=user, date=day).exists()
 				if not exists:
 					break
 				streak += 1
@@ -112,6 +157,17 @@ class DashboardView(View):
 		learning_streak = _calc_streak(LearningLog)
 		health_streak = _calc_streak(HealthLog)
 
+		# Volume latihan 8 minggu terakhir (satu query GROUP BY minggu)
+		training_weeks = training_volume(user, week_start - timedelta(weeks=7), today, 'week')
+		training_chart = charts.bar_chart(
+			[row['period'].strftime('%m-%d') for row in training_weeks],
+			[
+				('Menit', [row['minutes'] for row in training_weeks], 'rgba(16,185,129,0.8)'),
+				('Repetisi', [row['reps'] for row in training_weeks], 'rgba(59,130,246,0.45)'),
+			],
+			label='Volume latihan',
+		)
+
 		context = {
 			'today': today,
 			'tasks': tasks_today,
@@ -122,7 +178,7 @@ class DashboardView(View):
 			'recent_savings': recent_savings,
 			'focus': focus,
 			'quote': _quote_of_the_day(today),
-			'weekly_counts': weekly_counts,
+			'weekly_chart': weekly_chart,
 			'prefs': prefs,
 			'water_today': water_today,
 			'goals': goals,
@@ -131,48 +187,68 @@ class DashboardView(View):
 			'mind_recent': mind_recent,
 			'learning_streak': learning_streak,
 			'health_streak': health_streak,
+			'training_chart': training_chart,
+			'task_categories': dict(TaskCategory.choices),
+			# Stream live dimulai dari event terakhir saat halaman dirender
+			'live_after': live.latest_id(user),
 		}
 		return render(request, 'tracker/dashboard.html', context)
 
 
-class QuickAddTaskView(View):
+class QuickAddView(View):
+	# Form tambah cepat di dashboard/saldo. Logikanya di apply(user, data) supaya
+	# replay antrean offline (tracker/offline.py) memakai validasi yang sama;
+	# apply() mengembalikan pesan error atau None.
+	success_message = ''
+
+	def apply(self, user, data):
+		raise NotImplementedError
+
 	def post(self, request):
-		date_str = request.POST.get('date')
-		category = request.POST.get('category')
-		title = request.POST.get('title')
-		description = request.POST.get('description', '')
-		if not (date_str and category and title):
-			messages.error(request, 'Tanggal, kategori, dan judul wajib diisi')
-			return redirect('tracker:dashboard')
-		DailyTask.objects.create(date=date_str, category=category, title=title, description=description)
-		messages.success(request, 'Tugas ditambahkan')
+		error = self.apply(request.user, request.POST)
+		if error:
+			messages.error(request, error)
+		elif self.success_message:
+			messages.success(request, self.success_message)
 		return redirect('tracker:dashboard')
 
 
+class QuickAddTaskView(QuickAddView):
+	success_message = 'Tugas ditambahkan'
+
+	def apply(self, user, data):
+		date_str = data.get('date')
+		category = data.get('category')
+		title = data.get('title')
+		description = data.get('description', '')
+		if not (date_str and category and title):
+			return 'Tanggal, kategori, dan judul wajib diisi'
+		DailyTask.objects.create(user=user, date=date_str, category=category, title=title, description=description)
+
+
 class ToggleTaskDoneView(View):
 	def post(self, request, task_id: int):
-		task = DailyTask.objects.get(id=task_id)
+		task = get_object_or_404(DailyTask, id=task_id, user=request.user)
 		task.is_completed = not task.is_completed
-		task.save(update_fields=['is_completed'])
+		task.save(update_fields=['is_completed', 'updated_at'])
 		return redirect('tracker:dashboard')
 
 
-class QuickAddTransactionView(View):
-	def post(self, request):
-		account_id = request.POST.get('account_id')
-		if account_id:
-			account = Account.objects.filter(id=account_id).first() or _get_or_create_default_account()
-		else:
-			account = _get_or_create_default_account()
-		date_str = request.POST.get('date')
-		type_ = request.POST.get('type')
-		amount = request.POST.get('amount')
-		category = request.POST.get('category', '')
-		note = request.POST.get('note', '')
+class QuickAddTransactionView(QuickAddView):
+	success_message = 'Transaksi dicatat'
+
+	def apply(self, user, data):
+		account_id = data.get('account_id')
+		account = _account_or_default(user, account_id)
+		date_str = data.get('date')
+		type_ = data.get('type')
+		amount = data.get('amount')
+		category = data.get('category', '')
+		note = data.get('note', '')
 		if not (date_str and type_ and amount):
-			messages.error(request, 'Tanggal, jenis, dan nominal wajib diisi')
-			return redirect('tracker:dashboard')
+			return 'Tanggal, jenis, dan nominal wajib diisi'
 		Transaction.objects.create(
+			user=user,
 			account=account,
 			date=date_str,
 			type=type_,
@@ -180,14 +256,12 @@ class QuickAddTransactionView(View):
 			category=category,
 			note=note,
 		)
-		messages.success(request, 'Transaksi dicatat')
-		return redirect('tracker:dashboard')
 
 
 class DeleteTransactionView(View):
 	def post(self, request, transaction_id: int):
 		try:
-			tr = Transaction.objects.get(id=transaction_id)
+			tr = Transaction.objects.get(id=transaction_id, user=request.user)
 			tr.delete()
 			messages.success(request, 'Transaksi dihapus')
 		except Transaction.DoesNotExist:
@@ -197,7 +271,7 @@ class DeleteTransactionView(View):
 
 class EditTransactionView(View):
 	def post(self, request, transaction_id: int):
-		tr = Transaction.objects.filter(id=transaction_id).first()
+		tr = Transaction.objects.filter(id=transaction_id, user=request.user).first()
 		if not tr:
 			messages.error(request, 'Transaksi tidak ditemukan')
 			return redirect('tracker:saldo')
@@ -216,23 +290,28 @@ class EditTransactionView(View):
 		return redirect('tracker:saldo')
 
 
-class QuickAddSavingView(View):
-	def post(self, request):
-		account_id = request.POST.get('account_id')
-		if account_id:
-			account = Account.objects.filter(id=account_id).first() or _get_or_create_default_account()
-		else:
-			account = _get_or_create_default_account()
-		date_str = request.POST.get('date')
-		amount = request.POST.get('amount')
-		goal_id = request.POST.get('goal_id')
-		goal_name = request.POST.get('goal_name', '')
-		note = request.POST.get('note', '')
+class CategoryAutocompleteView(View):
+	def get(self, request):
+		# Dilayani dari indeks prefiks di memori proses (user_cache.category_index)
+		return JsonResponse({'results': autocomplete(request.user, request.GET.get('q', ''))})
+
+
+class QuickAddSavingView(QuickAddView):
+	success_message = 'Tabungan ditambahkan'
+
+	def apply(self, user, data):
+		account_id = data.get('account_id')
+		account = _account_or_default(user, account_id)
+		date_str = data.get('date')
+		amount = data.get('amount')
+		goal_id = data.get('goal_id')
+		goal_name = data.get('goal_name', '')
+		note = data.get('note', '')
 		if not (date_str and amount):
-			messages.error(request, 'Tanggal dan nominal nabung wajib diisi')
-			return redirect('tracker:dashboard')
-		goal = SavingsGoal.objects.filter(id=goal_id).first() if goal_id else None
+			return 'Tanggal dan nominal nabung wajib diisi'
+		goal = _user_goal(user, goal_id)
 		Saving.objects.create(
+			user=user,
 			account=account,
 			date=date_str,
 			amount=amount,
@@ -240,13 +319,11 @@ class QuickAddSavingView(View):
 			goal_name=goal_name,
 			note=note,
 		)
-		messages.success(request, 'Tabungan ditambahkan')
-		return redirect('tracker:dashboard')
 
 
 class EditSavingView(View):
 	def post(self, request, saving_id: int):
-		sv = Saving.objects.filter(id=saving_id).first()
+		sv = Saving.objects.filter(id=saving_id, user=request.user).first()
 		if not sv:
 			messages.error(request, 'Tabungan tidak ditemukan')
 			return redirect('tracker:saldo')
@@ -255,7 +332,7 @@ class EditSavingView(View):
 		goal_name = request.POST.get('goal_name', sv.goal_name)
 		note = request.POST.get('note', sv.note)
 		goal_id = request.POST.get('goal_id')
-		goal = SavingsGoal.objects.filter(id=goal_id).first() if goal_id else None
+		goal = _user_goal(request.user, goal_id)
 		sv.date = date_str
 		sv.amount = amount
 		sv.goal = goal
@@ -266,130 +343,261 @@ class EditSavingView(View):
 		return redirect('tracker:saldo')
 
 
-class WaterAddView(View):
-	def post(self, request):
+class WaterAddView(QuickAddView):
+	def apply(self, user, data):
 		today = timezone.localdate()
-		water, _ = WaterIntake.objects.get_or_create(date=today, defaults={'glasses': 0})
+		# Form tidak mengirim tanggal; replay offline mengirim tanggal saat tombol ditekan
+		day = min(_parse_date(data.get('date')) or today, today)
+		water, _ = WaterIntake.objects.get_or_create(user=user, date=day, defaults={'glasses': 0})
 		water.glasses += 1
-		water.save(update_fields=['glasses'])
-		return redirect('tracker:dashboard')
+		water.save(update_fields=['glasses', 'updated_at'])
 
 
 class SuggestTasksAIView(View):
 	def post(self, request):
 		today = timezone.localdate()
-		prefs = _get_or_create_preferences()
-		_suggest_tasks_for_today(prefs, today)
+		prefs = _get_or_create_preferences(request.user)
+		_suggest_tasks_for_today(request.user, prefs, today)
 		messages.success(request, 'Saran tugas untuk hari ini telah ditambahkan.')
 		return redirect('tracker:dashboard')
 
 
-class AddLearningLogView(View):
-	def post(self, request):
-		date = request.POST.get('date')
-		topic = request.POST.get('topic')
-		duration = int(request.POST.get('duration') or 0)
-		key = request.POST.get('key_takeaways', '')
-		src = request.POST.get('source_url', '')
+class AddLearningLogView(QuickAddView):
+	success_message = 'Log pembelajaran ditambahkan'
+
+	def apply(self, user, data):
+		date = data.get('date')
+		topic = data.get('topic')
+		duration = int(data.get('duration') or 0)
+		key = data.get('key_takeaways', '')
+		src = data.get('source_url', '')
 		if not (date and topic):
-			messages.error(request, 'Tanggal dan topik wajib diisi')
-			return redirect('tracker:dashboard')
-		LearningLog.objects.create(date=date, topic=topic, duration_minutes=duration, key_takeaways=key, source_url=src)
-		messages.success(request, 'Log pembelajaran ditambahkan')
-		return redirect('tracker:dashboard')
+			return 'Tanggal dan topik wajib diisi'
+		LearningLog.objects.create(user=user, date=date, topic=topic, duration_minutes=duration, key_takeaways=key, source_url=src)
 
 
-class AddHealthLogView(View):
-	def post(self, request):
-		date = request.POST.get('date')
-		activity = request.POST.get('activity')
-		duration_sets = request.POST.get('duration_or_sets', '')
-		note = request.POST.get('note', '')
+class AddHealthLogView(QuickAddView):
+	success_message = 'Log kesehatan ditambahkan'
+
+	def apply(self, user, data):
+		date = data.get('date')
+		activity = data.get('activity')
+		duration_sets = data.get('duration_or_sets', '')
+		note = data.get('note', '')
 		if not (date and activity):
-			messages.error(request, 'Tanggal dan jenis olahraga wajib diisi')
-			return redirect('tracker:dashboard')
-		HealthLog.objects.create(date=date, activity=activity, duration_or_sets=duration_sets, note=note)
-		messages.success(request, 'Log kesehatan ditambahkan')
-		return redirect('tracker:dashboard')
+			return 'Tanggal dan jenis olahraga wajib diisi'
+		form = HealthMetricsForm(data)
+		if not form.is_valid():
+			return 'Menit, set, repetisi, dan jarak harus angka dalam batas wajar'
+		# Metrik yang tidak diisi di form di-parse dari teks Durasi/Set/Repetisi
+		parsed = parse_metrics(duration_sets)
+		metrics = {field: parsed.get(field) if value is None else value for field, value in form.cleaned_data.items()}
+		HealthLog.objects.create(user=user, date=date, activity=activity, duration_or_sets=duration_sets, note=note, **metrics)
+
+
+class AddMindfulnessLogView(QuickAddView):
+	success_message = 'Jurnal harian ditambahkan'
+
+	def apply(self, user, data):
+		date = data.get('date')
+		achievement = data.get('achievement', '')
+		challenge = data.get('challenge', '')
+		solution = data.get('solution', '')
+		gratitude = data.get('gratitude', '')
+		if not date:
+			return 'Tanggal wajib diisi'
+		MindfulnessLog.objects.create(user=user, date=date, achievement=achievement, challenge=challenge, solution=solution, gratitude=gratitude)
 
 
-class AddMindfulnessLogView(View):
-	def post(self, request):
-		date = request.POST.get('date')
-		achievement = request.POST.get('achievement', '')
-		challenge = request.POST.get('challenge', '')
-		solution = request.POST.get('solution', '')
-		gratitude = request.POST.get('gratitude', '')
-		if not date:
-			messages.error(request, 'Tanggal wajib diisi')
-			return redirect('tracker:dashboard')
-		MindfulnessLog.objects.create(date=date, achievement=achievement, challenge=challenge, solution=solution, gratitude=gratitude)
-		messages.success(request, 'Jurnal harian ditambahkan')
-		return redirect('tracker:dashboard')
+class ReplicaReadMixin:
+	# GET halaman analitik dibaca dari replica (bila ada), kecuali pengguna baru saja menulis
+	def dispatch(self, request, *args, **kwargs):
+		with read_from_replica(request.method in ('GET', 'HEAD') and not pinned_to_primary(request)):
+			return super().dispatch(request, *args, **kwargs)
 
 
-class ReportsView(View):
+class ReportsView(ReplicaReadMixin, View):
 	def get(self, request):
 		today = timezone.localdate()
 		month_start = today.replace(day=1)
-		transactions = Transaction.objects.filter(date__gte=month_start, date__lte=today)
-		by_category = transactions.filter(type=TransactionType.EXPENSE).values('category').annotate(total=Sum('amount')).order_by('-total')
-		income_total = transactions.filter(type=TransactionType.INCOME).aggregate(Sum('amount'))['amount__sum'] or 0
-		expense_total = transactions.filter(type=TransactionType.EXPENSE).aggregate(Sum('amount'))['amount__sum'] or 0
-		learning_minutes = LearningLog.objects.filter(date__gte=month_start, date__lte=today).aggregate(Sum('duration_minutes'))['duration_minutes__sum'] or 0
-		health_count = HealthLog.objects.filter(date__gte=month_start, date__lte=today).count()
+		start = _parse_date(request.GET.get('start')) or month_start
+		end = _parse_date(request.GET.get('end')) or today
+		user = request.user
+		# Tabel arsip hanya ikut di-query bila periode mencapai cutoff arsip
+		cutoff = archive_cutoff()
+		transactions = ranged(Transaction, start, end, cutoff, user=user)
+		by_category = defaultdict(Decimal)
+		# Dikelompokkan per id kategori ternormalisasi, nama diambil sekali sesudahnya
+		for qs in transactions:
+			for row in qs.filter(type=TransactionType.EXPENSE).values('category_ref_id').annotate(total=Sum('amount')).order_by():
+				by_category[row['category_ref_id']] += row['total']
+		category_names = dict(Category.objects.filter(user=user, pk__in=[pk for pk in by_category if pk]).values_list('pk', 'name'))
+		income_total = sum_over([qs.filter(type=TransactionType.INCOME) for qs in transactions], 'amount')
+		expense_total = sum_over([qs.filter(type=TransactionType.EXPENSE) for qs in transactions], 'amount')
+		learning_minutes = sum_over(ranged(LearningLog, start, end, cutoff, user=user), 'duration_minutes')
+		health_count = count_over(ranged(HealthLog, start, end, cutoff, user=user))
+		volume_period = 'week' if (end - start).days <= 92 else 'month'
+		training = training_volume(user, start, end, volume_period)
+		categories = sorted(by_category.items(), key=lambda item: -item[1])
 		context = {
 			'today': today,
-			'month_start': month_start,
-			'by_category': list(by_category),
+			'month_start': start,
+			'end': end,
+			'category_chart': charts.pie_chart([category_names.get(pk) or 'Lainnya' for pk, _ in categories], [total for _, total in categories], label='Pengeluaran per kategori'),
+			'income_chart': charts.hbar_chart(['Pemasukan', 'Pengeluaran'], [income_total, expense_total], ['#42a5f5', '#ef5350'], label='Pemasukan vs pengeluaran'),
 			'income_total': income_total,
 			'expense_total': expense_total,
 			'learning_minutes': learning_minutes,
 			'health_count': health_count,
+			'training_minutes': sum(row['minutes'] for row in training),
+			'training_reps': sum(row['reps'] for row in training),
+			'training_distance': sum((row['distance_km'] for row in training), Decimal('0')),
+			'training_period': volume_period,
+			'training_chart': charts.bar_chart(
+				[row['period'].isoformat() for row in training],
+				[
+					('Menit', [row['minutes'] for row in training], '#66bb6a'),
+					('Repetisi', [row['reps'] for row in training], '#42a5f5'),
+					('Jarak (km)', [row['distance_km'] for row in training], '#ffa726'),
+				],
+				label='Volume latihan',
+			),
+			'includes_archive': len(transactions) > 1,
 		}
 		return render(request, 'tracker/reports.html', context)
 
 
-class SaldoView(View):
+class LearningTopicReportView(ReplicaReadMixin, View):
+	def get(self, request):
+		today = timezone.localdate()
+		start = _parse_date(request.GET.get('start')) or today.replace(month=((today.month - 1) // 3) * 3 + 1, day=1)
+		end = _parse_date(request.GET.get('end')) or today
+		topics = LearningTopic.objects.filter(user=request.user)
+		topic = None
+		if (request.GET.get('topic') or '').isdigit():
+			topic = topics.filter(id=request.GET['topic']).first()
+		# Agregasi per kunci integer (topic_ref) memakai indeks (user, topic_ref, date)
+		totals = minutes_by_topic(request.user, start, end, topic.id if topic else None)
+		names = topics.in_bulk([topic_id for topic_id in totals if topic_id])
+		rows = sorted(
+			({'topic': names.get(topic_id), 'minutes': t['minutes'], 'hours': round(t['minutes'] / 60, 1), 'sessions': t['sessions']} for topic_id, t in totals.items()),
+			key=lambda row: -row['minutes'],
+		)
+		context = {
+			'today': today,
+			'start': start,
+			'end': end,
+			'topic': topic,
+			'topics': topics,
+			'rows': rows,
+			'total_minutes': sum(row['minutes'] for row in rows),
+			'monthly': monthly_minutes(request.user, topic.id, start, end) if topic else [],
+		}
+		return render(request, 'tracker/learning_topics.html', context)
+
+
+class JournalThemesView(ReplicaReadMixin, View):
 	def get(self, request):
 		today = timezone.localdate()
+		try:
+			months = min(max(int(request.GET.get('months') or 6), 1), 24)
+		except ValueError:
+			months = 6
+		field = request.GET.get('field') if request.GET.get('field') in JournalField.values else None
+		end_month = today.replace(day=1)
+		start_month = date(*add_months(end_month.year, end_month.month, -(months - 1)), 1)
+		# Dibaca dari indeks JournalTerm, tanpa memproses ulang teks jurnal
+		grouped = {}
+		for row in top_terms(request.user, start_month, end_month, limit=10, field=field):
+			grouped.setdefault(row['month'], {}).setdefault(row['field'], []).append(row)
+		labels = dict(JournalField.choices)
+		context = {
+			'today': today,
+			'months': months,
+			'field': field or '',
+			'fields': JournalField.choices,
+			'themes': [
+				{'month': month, 'fields': [{'label': labels[f], 'terms': grouped[month][f]} for f in JournalField.values if f in grouped[month]]}
+				for month in sorted(grouped, reverse=True)
+			],
+		}
+		return render(request, 'tracker/themes.html', context)
+
+
+class CalendarView(ReplicaReadMixin, View):
+	def get(self, request):
+		today = timezone.localdate()
+		try:
+			year, month = (int(part) for part in (request.GET.get('month') or '').split('-'))
+			# Tahun pertama/terakhir tidak punya bulan sebelum/sesudahnya untuk navigasi
+			if not date.min.year < year < date.max.year:
+				raise ValueError(year)
+			first = date(year, month, 1)
+		except ValueError:
+			first = today.replace(day=1)
+		prefs = _get_or_create_preferences(request.user)
+		weeks, days = month_grid(request.user, first.year, first.month, prefs.daily_water_goal_glasses)
+		totals = {key: sum(day[key] for day in days.values()) for key in ('tasks', 'tasks_done', 'learning_minutes', 'health', 'journal', 'water', 'income', 'expense')}
+		context = {
+			'today': today,
+			'month': first,
+			'prev_month': '%04d-%02d' % add_months(first.year, first.month, -1),
+			'next_month': '%04d-%02d' % add_months(first.year, first.month, 1),
+			'weekdays': ['Sen', 'Sel', 'Rab', 'Kam', 'Jum', 'Sab', 'Min'],
+			'weeks': weeks,
+			'totals': totals,
+			'net_total': totals['income'] - totals['expense'],
+			'active_days': sum(1 for week in weeks for cell in week if cell['level']),
+		}
+		return render(request, 'tracker/calendar.html', context)
+
+
+class SaldoView(ReplicaReadMixin, View):
+	def get(self, request):
+		today = timezone.localdate()
+		user = request.user
 		# Accounts
-		accounts = Account.objects.all().order_by('name')
-		selected_id = request.GET.get('account_id')
-		account = None
-		if selected_id:
-			account = Account.objects.filter(id=selected_id).first()
-		if not account:
-			account = _get_or_create_default_account()
+		accounts = user_cache.accounts(user)
+		account = _account_or_default(user, request.GET.get('account_id'))
 		# Filters
 		start = request.GET.get('start')
 		end = request.GET.get('end')
 		q = request.GET.get('q', '').strip()
 		ttype = request.GET.get('type', '').strip()  # INCOME / EXPENSE
-
-		tr_qs = Transaction.objects.select_related('account').order_by('-date', '-id')
-		if start:
-			tr_qs = tr_qs.filter(date__gte=start)
-		if end:
-			tr_qs = tr_qs.filter(date__lte=end)
-		if ttype in (TransactionType.INCOME, TransactionType.EXPENSE):
-			tr_qs = tr_qs.filter(type=ttype)
-		if q:
-			from django.db.models import Q
-			tr_qs = tr_qs.filter(Q(category__icontains=q) | Q(note__icontains=q))
-		recent_transactions = tr_qs[:50]
-
-		sv_qs = Saving.objects.select_related('account').order_by('-date', '-id')
-		if start:
-			sv_qs = sv_qs.filter(date__gte=start)
-		if end:
-			sv_qs = sv_qs.filter(date__lte=end)
-		if q:
-			from django.db.models import Q
-			sv_qs = sv_qs.filter(Q(goal_name__icontains=q) | Q(note__icontains=q))
-		recent_savings = sv_qs[:50]
-		recurring_tr = RecurringTransaction.objects.filter(account=account).order_by('next_date', 'id')
-		goals = SavingsGoal.objects.all().order_by('-created_at')
+		start_date = _parse_date(start)
+		end_date = _parse_date(end)
+		# Arsip ikut dicari hanya jika rentang "Dari" melewati cutoff, atau pencarian kata kunci tanpa batas awal
+		include_archive = bool(start_date or q) and reaches_archive(start_date, archive_cutoff())
+
+		def _filter_transactions(qs):
+			if start_date:
+				qs = qs.filter(date__gte=start_date)
+			if end_date:
+				qs = qs.filter(date__lte=end_date)
+			if ttype in (TransactionType.INCOME, TransactionType.EXPENSE):
+				qs = qs.filter(type=ttype)
+			if q:
+				qs = qs.filter(Q(category__icontains=q) | Q(note__icontains=q))
+			return qs.select_related('account').order_by('-date', '-id')[:50]
+
+		def _filter_savings(qs):
+			if start_date:
+				qs = qs.filter(date__gte=start_date)
+			if end_date:
+				qs = qs.filter(date__lte=end_date)
+			if q:
+				qs = qs.filter(Q(goal_name__icontains=q) | Q(note__icontains=q))
+			return qs.select_related('account', 'goal').order_by('-date', '-id')[:50]
+
+		recent_transactions = list(_filter_transactions(Transaction.objects.filter(user=user)))
+		recent_savings = list(_filter_savings(Saving.objects.filter(user=user)))
+		if include_archive:
+			recent_transactions = _newest_first(recent_transactions + list(_filter_transactions(ArchivedTransaction.objects.filter(user=user))))[:50]
+			recent_savings = _newest_first(recent_savings + list(_filter_savings(ArchivedSaving.objects.filter(user=user))))[:50]
+		recurring_tr = RecurringTransaction.objects.filter(user=user, account=account).order_by('next_date', 'id')
+		goals = user_cache.goals(user)
+		# Riwayat saldo harian (cache + perpanjangan inkremental, lihat tracker/balance_history.py)
+		history = daily_series(account, days=180, end=today)
 		context = {
 			'today': today,
 			'account': account,
@@ -397,6 +605,9 @@ class SaldoView(View):
 			'recent_transactions': recent_transactions,
 			'recent_savings': recent_savings,
 			'recurring_transactions': recurring_tr,
+			'frequencies': RecurrenceFrequency.choices,
+			'import_formats': sorted(PARSERS),
+			'import_profiles': ImportProfile.objects.filter(user=user).order_by('name'),
 			'goals': goals,
 			'accounts': accounts,
 			'selected_account_id': str(account.id),
@@ -405,7 +616,9 @@ class SaldoView(View):
 				'end': end or '',
 				'q': q,
 				'type': ttype,
-			}
+			},
+			'includes_archive': include_archive,
+			'balance_chart': charts.line_chart([day.strftime('%m-%d') for day, _ in history], [('Saldo', [balance for _, balance in history], '#a78bfa')], height=160, stepped=True, label='Riwayat saldo'),
 		}
 		return render(request, 'tracker/saldo.html', context)
 
@@ -423,7 +636,7 @@ class CreateAccountView(View):
         except ValueError:
             messages.error(request, 'Saldo awal tidak valid')
             return redirect('tracker:saldo')
-        acc, created = Account.objects.get_or_create(name=name, defaults={'initial_balance': initial, 'description': description})
+        acc, created = Account.objects.get_or_create(user=request.user, name=name, defaults={'initial_balance': initial, 'description': description})
         if not created:
             messages.info(request, 'Akun sudah ada, gunakan yang lama')
         else:
@@ -431,44 +644,81 @@ class CreateAccountView(View):
         return redirect(f"/saldo?account_id={acc.id}")
 
 
-def _advance_date(date_obj, frequency: str):
-	if frequency == RecurrenceFrequency.DAILY:
-		return date_obj + timedelta(days=1)
-	if frequency == RecurrenceFrequency.WEEKLY:
-		return date_obj + timedelta(weeks=1)
-	# MONTHLY default: naive month add
-	month = date_obj.month + 1
-	year = date_obj.year + (month - 1) // 12
-	month = (month - 1) % 12 + 1
-	day = min(date_obj.day, 28)
-	return date_obj.replace(year=year, month=month, day=day)
+class CashflowForecastView(ReplicaReadMixin, View):
+	def get(self, request):
+		today = timezone.localdate()
+		try:
+			months = min(max(int(request.GET.get('months') or 3), 1), 24)
+		except ValueError:
+			months = 3
+		accounts = list(Account.objects.filter(user=request.user).with_balance().order_by('name'))
+		templates = RecurringTransaction.objects.filter(user=request.user, is_active=True).only(
+			'account_id', 'type', 'amount', 'frequency', 'next_date', 'interval', 'day_of_month', 'week_of_month', 'end_date'
+		)
+		projection = project_balances(accounts, templates, today, months)
+		totals = []
+		for i in range(months):
+			rows = [p['rows'][i] for p in projection]
+			totals.append({
+				'month': rows[0]['month'] if rows else None,
+				'net': sum((r['net'] for r in rows), 0),
+				'balance': sum((r['balance'] for r in rows), 0),
+			})
+		chart = charts.line_chart(
+			[t['month'].strftime('%Y-%m') for t in totals if t['month']],
+			[(p['account'].name, [r['balance'] for r in p['rows']], charts.PALETTE[i % len(charts.PALETTE)]) for i, p in enumerate(projection)],
+			label='Saldo proyeksi',
+		)
+		context = {
+			'today': today,
+			'months': months,
+			'projection': projection,
+			'totals': totals,
+			'chart': chart,
+		}
+		return render(request, 'tracker/forecast.html', context)
 
 
-class GenerateRecurringFinanceView(View):
-	def post(self, request):
-		today = timezone.localdate()
-		generated = 0
-		recurs = RecurringTransaction.objects.filter(is_active=True, next_date__lte=today)
-		for r in recurs:
-			Transaction.objects.create(
-				account=r.account,
-				date=r.next_date,
-				type=r.type,
-				amount=r.amount,
-				category=r.category,
-				note=r.note,
-			)
-			generated += 1
-			r.next_date = _advance_date(r.next_date, r.frequency)
-			r.save(update_fields=['next_date'])
-		messages.success(request, f'Recurring transaksi digenerate: {generated}')
-		return redirect('tracker:saldo')
+def _newest_first(rows):
+	return sorted(rows, key=lambda row: (row.date, row.created_at), reverse=True)
+
+
+def _parse_date(value):
+	if not value:
+		return None
+	try:
+		return date.fromisoformat(value)
+	except ValueError:
+		return None
+
+
+def _parse_id(value):
+	# pk BigAutoField: di luar rentang dianggap tidak ada (bukan OverflowError saat query)
+	try:
+		value = int(value)
+	except (TypeError, ValueError):
+		return None
+	return value if 0 <= value < 2 ** 63 else None
+
+
+def _recurrence_fields_from_post(post, current=None) -> dict:
+	fields = {}
+	try:
+		fields['interval'] = max(int(post.get('interval') or (current.interval if current else 1)), 1)
+	except ValueError:
+		fields['interval'] = current.interval if current else 1
+	if 'end_date' in post or current is None:
+		fields['end_date'] = _parse_date(post.get('end_date'))
+	if 'week_of_month' in post:
+		week = post.get('week_of_month')
+		fields['week_of_month'] = int(week) if week in ('1', '2', '3', '4', '-1') else None
+	return fields
 
 
 class RecurringTransactionCreateView(View):
 	def post(self, request):
 		account_id = request.POST.get('account_id')
-		account = Account.objects.filter(id=account_id).first() or _get_or_create_default_account()
+		account = _account_or_default(request.user, account_id)
 		type_ = request.POST.get('type')
 		amount = request.POST.get('amount')
 		category = request.POST.get('category', '')
@@ -478,14 +728,14 @@ class RecurringTransactionCreateView(View):
 		if not (type_ and amount and next_date):
 			messages.error(request, 'Jenis, nominal, dan tanggal berikutnya wajib diisi')
 			return redirect(f"/saldo?account_id={account.id}")
-		RecurringTransaction.objects.create(account=account, type=type_, amount=amount, category=category, note=note, frequency=frequency, next_date=next_date)
+		RecurringTransaction.objects.create(user=request.user, account=account, type=type_, amount=amount, category=category, note=note, frequency=frequency, next_date=next_date, **_recurrence_fields_from_post(request.POST))
 		messages.success(request, 'Template transaksi berulang dibuat')
 		return redirect(f"/saldo?account_id={account.id}")
 
 
 class RecurringTransactionEditView(View):
 	def post(self, request, rt_id: int):
-		rt = RecurringTransaction.objects.filter(id=rt_id).first()
+		rt = RecurringTransaction.objects.filter(id=rt_id, user=request.user).first()
 		if not rt:
 			messages.error(request, 'Template tidak ditemukan')
 			return redirect('tracker:saldo')
@@ -493,8 +743,16 @@ class RecurringTransactionEditView(View):
 		rt.amount = request.POST.get('amount', rt.amount)
 		rt.category = request.POST.get('category', rt.category)
 		rt.note = request.POST.get('note', rt.note)
-		rt.frequency = request.POST.get('frequency', rt.frequency)
-		rt.next_date = request.POST.get('next_date', rt.next_date)
+		frequency = request.POST.get('frequency', rt.frequency)
+		next_date = _parse_date(request.POST.get('next_date')) or rt.next_date
+		if frequency != rt.frequency or next_date != rt.next_date:
+			# Jadwal berubah: tanggal/minggu jangkar diturunkan ulang dari next_date baru
+			rt.day_of_month = None
+			rt.week_of_month = None
+		rt.frequency = frequency
+		rt.next_date = next_date
+		for field, value in _recurrence_fields_from_post(request.POST, rt).items():
+			setattr(rt, field, value)
 		rt.is_active = (request.POST.get('is_active') == 'on') if 'is_active' in request.POST else rt.is_active
 		rt.save()
 		messages.success(request, 'Template transaksi berulang diperbarui')
@@ -503,7 +761,7 @@ class RecurringTransactionEditView(View):
 
 class RecurringTransactionDeleteView(View):
 	def post(self, request, rt_id: int):
-		rt = RecurringTransaction.objects.filter(id=rt_id).first()
+		rt = RecurringTransaction.objects.filter(id=rt_id, user=request.user).first()
 		if not rt:
 			messages.error(request, 'Template tidak ditemukan')
 			return redirect('tracker:saldo')
@@ -513,105 +771,130 @@ class RecurringTransactionDeleteView(View):
 		return redirect(f"/saldo?account_id={acc_id}")
 
 
+def _redirect_to_job(request, job, next_url):
+	messages.info(request, f'Job #{job.pk} diproses di latar belakang')
+	return redirect(f"{reverse('tracker:job-detail', args=[job.pk])}?{urlencode({'next': next_url})}")
+
+
+class GenerateRecurringFinanceView(View):
+	def post(self, request):
+		job = enqueue('generate_recurring_finance', user=request.user)
+		return _redirect_to_job(request, job, reverse('tracker:saldo'))
+
+
 class GenerateRecurringTasksView(View):
 	def post(self, request):
-		today = timezone.localdate()
-		generated = 0
-		recurs = RecurringTask.objects.filter(is_active=True, next_date__lte=today)
-		for r in recurs:
-			DailyTask.objects.create(
-				date=r.next_date,
-				category=r.category,
-				title=r.title,
-				description=r.description,
-			)
-			generated += 1
-			r.next_date = _advance_date(r.next_date, r.frequency)
-			r.save(update_fields=['next_date'])
-		messages.success(request, f'Recurring tugas digenerate: {generated}')
-		return redirect('tracker:dashboard')
+		job = enqueue('generate_recurring_tasks', user=request.user)
+		return _redirect_to_job(request, job, reverse('tracker:dashboard'))
 
 
 class ExportTransactionsCSVView(View):
-    def get(self, request):
-        account_id = request.GET.get('account_id')
-        qs = Transaction.objects.select_related('account').order_by('date', 'id')
-        if account_id:
-            qs = qs.filter(account_id=account_id)
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['date', 'account', 'type', 'amount', 'category', 'note'])
-        for tr in qs:
-            writer.writerow([tr.date.isoformat(), tr.account.name, tr.type, tr.amount, tr.category, tr.note])
-        return response
+	def post(self, request):
+		job = enqueue('export_transactions_csv', {'account_id': request.POST.get('account_id') or None, 'primary': pinned_to_primary(request)}, user=request.user)
+		return _redirect_to_job(request, job, reverse('tracker:saldo'))
 
 
 class ExportSavingsCSVView(View):
-    def get(self, request):
-        account_id = request.GET.get('account_id')
-        qs = Saving.objects.select_related('account', 'goal').order_by('date', 'id')
-        if account_id:
-            qs = qs.filter(account_id=account_id)
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="savings.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['date', 'account', 'amount', 'goal', 'goal_name', 'note'])
-        for sv in qs:
-            writer.writerow([sv.date.isoformat(), sv.account.name, sv.amount, sv.goal.name if sv.goal else '', sv.goal_name, sv.note])
-        return response
+	def post(self, request):
+		job = enqueue('export_savings_csv', {'account_id': request.POST.get('account_id') or None, 'primary': pinned_to_primary(request)}, user=request.user)
+		return _redirect_to_job(request, job, reverse('tracker:saldo'))
+
+
+class ExportAnalyticsView(View):
+	def post(self, request):
+		job = enqueue('export_analytics', {'format': request.POST.get('format') or 'auto', 'primary': pinned_to_primary(request)}, user=request.user)
+		return _redirect_to_job(request, job, reverse('tracker:saldo'))
 
 
 class ImportTransactionsCSVView(View):
-    def post(self, request):
-        file = request.FILES.get('file')
-        account_id = request.POST.get('account_id')
-        account = Account.objects.filter(id=account_id).first() if account_id else _get_or_create_default_account()
-        if not file:
-            messages.error(request, 'File CSV tidak ditemukan')
-            return redirect('tracker:saldo')
-        decoded = file.read().decode('utf-8').splitlines()
-        reader = csv.DictReader(decoded)
-        created = 0
-        for row in reader:
-            try:
-                date = row.get('date')
-                type_ = row.get('type')
-                amount = row.get('amount')
-                category = row.get('category', '')
-                note = row.get('note', '')
-                if date and type_ and amount:
-                    Transaction.objects.create(account=account, date=date, type=type_, amount=amount, category=category, note=note)
-                    created += 1
-            except Exception:
-                continue
-        messages.success(request, f'Impor transaksi: {created} baris ditambahkan')
-        return redirect(f"/saldo?account_id={account.id}")
+	def post(self, request):
+		file = request.FILES.get('file')
+		account_id = request.POST.get('account_id')
+		account = _account_or_default(request.user, account_id)
+		if not file:
+			messages.error(request, 'File CSV tidak ditemukan')
+			return redirect('tracker:saldo')
+		format_ = request.POST.get('format') or detect_format(file.name)
+		if format_ not in PARSERS:
+			messages.error(request, 'Format file tidak didukung')
+			return redirect(f"/saldo?account_id={account.id}")
+		payload = {'account_id': account.id, 'format': format_, 'profile_id': request.POST.get('profile_id') or None}
+		job = enqueue('import_transactions', payload, input_data=file.read(), user=request.user)
+		return _redirect_to_job(request, job, f"/saldo?account_id={account.id}")
 
 
 class ImportSavingsCSVView(View):
-    def post(self, request):
-        file = request.FILES.get('file')
-        account_id = request.POST.get('account_id')
-        account = Account.objects.filter(id=account_id).first() if account_id else _get_or_create_default_account()
-        if not file:
-            messages.error(request, 'File CSV tidak ditemukan')
-            return redirect('tracker:saldo')
-        decoded = file.read().decode('utf-8').splitlines()
-        reader = csv.DictReader(decoded)
-        created = 0
-        for row in reader:
-            try:
-                date = row.get('date')
-                amount = row.get('amount')
-                goal_name = row.get('goal_name', '')
-                note = row.get('note', '')
-                goal_title = row.get('goal', '')
-                goal = SavingsGoal.objects.filter(name=goal_title).first() if goal_title else None
-                if date and amount:
-                    Saving.objects.create(account=account, date=date, amount=amount, goal=goal, goal_name=goal_name, note=note)
-                    created += 1
-            except Exception:
-                continue
-        messages.success(request, f'Impor tabungan: {created} baris ditambahkan')
-        return redirect(f"/saldo?account_id={account.id}")
\ No newline at end of file
+	def post(self, request):
+		file = request.FILES.get('file')
+		account_id = request.POST.get('account_id')
+		account = _account_or_default(request.user, account_id)
+		if not file:
+			messages.error(request, 'File CSV tidak ditemukan')
+			return redirect('tracker:saldo')
+		job = enqueue('import_savings_csv', {'account_id': account.id}, input_data=file.read(), user=request.user)
+		return _redirect_to_job(request, job, f"/saldo?account_id={account.id}")
+
+
+def _job_status(job: Job) -> dict:
+	return {
+		'id': job.pk,
+		'kind': job.kind,
+		'status': job.status,
+		'progress': job.progress,
+		'total': job.total,
+		'attempts': job.attempts,
+		'max_attempts': job.max_attempts,
+		'message': job.result.get('message', ''),
+		'error': job.error.strip().splitlines()[-1] if job.error.strip() else '',
+		'download_url': reverse('tracker:job-download', args=[job.pk]) if job.status == JobStatus.DONE and job.output_name else None,
+	}
+
+
+class JobDetailView(View):
+	def get(self, request, job_id: int):
+		job = get_object_or_404(Job.objects.defer('input_data', 'output_data'), id=job_id, user=request.user)
+		next_url = request.GET.get('next', '')
+		if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+			next_url = ''
+		return render(request, 'tracker/job.html', {'job': job, 'status': _job_status(job), 'next_url': next_url or '/'})
+
+
+class JobStatusView(View):
+	def get(self, request, job_id: int):
+		job = get_object_or_404(Job.objects.defer('input_data', 'output_data'), id=job_id, user=request.user)
+		return JsonResponse(_job_status(job))
+
+
+class JobDownloadView(View):
+	def get(self, request, job_id: int):
+		job = get_object_or_404(Job, id=job_id, user=request.user, status=JobStatus.DONE)
+		if not job.output_name:
+			raise Http404('Job ini tidak menghasilkan file')
+		content_type, _ = mimetypes.guess_type(job.output_name)
+		content_type = content_type or 'application/octet-stream'
+		if job.output_file:
+			# Dialirkan per blok dari storage
+			return FileResponse(job.output_file.open('rb'), as_attachment=True, filename=job.output_name, content_type=content_type)
+		response = HttpResponse(bytes(job.output_data or b''), content_type=content_type)
+		response['Content-Disposition'] = f'attachment; filename="{job.output_name}"'
+		return response
+
+
+class LiveEventsView(View):
+	# Server-sent events (tracker/live.py). Di ASGI stream async tidak memakai thread
+	# selama menunggu; di WSGI tiap request dijawab sekali lalu ditutup, dan EventSource
+	# menyambung ulang dengan Last-Event-ID setelah LIVE_WSGI_RETRY_SECONDS.
+	async def get(self, request):
+		user = await request.auser()
+		after_id = _parse_id(request.headers.get('Last-Event-ID') or request.GET.get('after'))
+		if after_id is None:
+			after_id = await sync_to_async(live.latest_id)(user)
+		if isinstance(request, ASGIRequest):
+			response = StreamingHttpResponse(live.stream(user.pk, after_id, settings.LIVE_STREAM_SECONDS), content_type='text/event-stream')
+		else:
+			body = await sync_to_async(live.poll_once)(user.pk, after_id, settings.LIVE_WSGI_RETRY_SECONDS)
+			response = HttpResponse(body, content_type='text/event-stream')
+		response['Cache-Control'] = 'no-cache'
+		# Nonaktifkan buffering proxy (nginx) supaya event langsung terkirim
+		response['X-Accel-Buffering'] = 'no'
+		return response